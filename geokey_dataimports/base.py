@@ -4,4 +4,17 @@ from model_utils import Choices
 
 
 STATUS = Choices('active', 'invalid', 'deleted')
-FORMAT = Choices('GeoJSON', 'KML', 'CSV')
+FORMAT = Choices(
+    'GeoJSON', 'GeoJSONSeq', 'KML', 'CSV', 'GPKG', 'SHP', 'XLSX'
+)
+
+UNSUPPORTED_FILE_MSG = (
+    'The file type does not seem to be compatible with this extension just '
+    'yet. Only GeoJSON (also newline-delimited), KML, CSV or XLSX with WKT '
+    'formatted geometries, GeoPackage and zipped Shapefile formats are '
+    'supported (also compressed as gzip, zip or KMZ).'
+)
+
+# Increment whenever data fields or data features get parsed differently, so
+# parse results of earlier versions are not reused for identical files
+PARSER_VERSION = 3
@@ -28,3 +28,31 @@ class FileParseError(Exception):
             html += '</ul>'
 
         return mark_safe(html)
+
+
+class UploadChecksumError(Exception):
+    """Throw upload checksum error, when a chunk does not match."""
+
+    def __init__(self):
+        """Initialise error message."""
+        self.message = (
+            'Checksum of the chunk does not match, the upload needs to '
+            'start again.'
+        )
+
+    def __str__(self):
+        """Return error message."""
+        return self.message
+
+
+class UploadOffsetError(Exception):
+    """Throw upload offset error, when a chunk does not continue upload."""
+
+    def __init__(self, offset):
+        """Initialise error with the offset upload continues from."""
+        self.offset = offset
+        self.message = 'Upload continues from offset %s.' % offset
+
+    def __str__(self):
+        """Return error message."""
+        return self.message
@@ -1,10 +1,11 @@
 """All forms for the extension."""
 
-from django.forms import ModelForm
+from django.forms import ModelForm, ValidationError
 
 from geokey.categories.models import Category
 
 from .models import DataImport
+from .helpers.crs_helpers import get_spatial_reference
 
 
 class CategoryForm(ModelForm):
@@ -24,4 +25,16 @@ class DataImportForm(ModelForm):
         """Form meta."""
 
         model = DataImport
-        fields = ('name', 'description', 'file')
+        fields = ('name', 'description', 'file', 'srid', 'sheet')
+
+    def clean_srid(self):
+        """Validate the coordinate reference system is known."""
+        srid = self.cleaned_data.get('srid')
+
+        if srid:
+            try:
+                get_spatial_reference(srid)
+            except ValueError as error:
+                raise ValidationError(str(error))
+
+        return srid
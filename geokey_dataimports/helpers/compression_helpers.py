@@ -0,0 +1,220 @@
+"""All helpers for compressed files (gzip, zip, KMZ)."""
+
+import io
+import os
+import gzip
+import zipfile
+
+from six import PY3
+
+from ..base import FORMAT, UNSUPPORTED_FILE_MSG
+
+
+GZIP = 'gzip'
+ZIP = 'zip'
+
+MAGIC_NUMBERS = (
+    (b'\x1f\x8b', GZIP),
+    (b'PK\x03\x04', ZIP),
+)
+EXTENSIONS = {
+    '.csv': FORMAT.CSV,
+    '.json': FORMAT.GeoJSON,
+    '.geojson': FORMAT.GeoJSON,
+    '.geojsonl': FORMAT.GeoJSONSeq,
+    '.geojsons': FORMAT.GeoJSONSeq,
+    '.geojsonseq': FORMAT.GeoJSONSeq,
+    '.ndjson': FORMAT.GeoJSONSeq,
+    '.kml': FORMAT.KML,
+    '.gpkg': FORMAT.GPKG,
+    '.shp': FORMAT.SHP,
+}
+
+
+def get_compression(file_obj):
+    """
+    Get the compression of a file by its magic number.
+
+    Parameters
+    ----------
+    file_obj : file
+        The file, read from the start and rewound.
+
+    Returns
+    -------
+    str
+        `gzip` or `zip`, `None` when the file is not compressed.
+    """
+    file_obj.seek(0)
+    header = file_obj.read(4)
+    file_obj.seek(0)
+
+    for magic_number, compression in MAGIC_NUMBERS:
+        if header.startswith(magic_number):
+            return compression
+
+    return None
+
+
+def get_dataformat_by_name(name):
+    """
+    Get the data format of a file by its extension.
+
+    Parameters
+    ----------
+    name : str
+        Name of the file.
+
+    Returns
+    -------
+    str
+        Data format, `None` when the extension is not supported.
+    """
+    return EXTENSIONS.get(os.path.splitext(name or '')[1].lower())
+
+
+# Excel workbooks are zip archives themselves, recognised by this member
+XLSX_MEMBER = 'xl/workbook.xml'
+
+
+def find_member(archive):
+    """
+    Find the first supported file within a zip archive (e.g. `doc.kml`
+    within a KMZ).
+
+    Parameters
+    ----------
+    archive : zipfile.ZipFile
+        The archive.
+
+    Returns
+    -------
+    tuple
+        Name and data format of the member, `(None, None)` when there is
+        no supported file.
+    """
+    for name in archive.namelist():
+        dataformat = get_dataformat_by_name(name)
+        if dataformat and not name.endswith('/'):
+            return name, dataformat
+
+    return None, None
+
+
+def get_compressed_dataformat(file_obj, filename):
+    """
+    Get the data format of a compressed file.
+
+    Gzip files are named after the file compressed (e.g. `data.csv.gz`),
+    zip archives (and KMZ) are looked into (central directory only).
+    Shapefiles are only read from zip archives, with their other files.
+    Excel workbooks are zip archives, they are not compressed files then.
+
+    Parameters
+    ----------
+    file_obj : file
+        The compressed file.
+    filename : str
+        Name of the compressed file.
+
+    Returns
+    -------
+    str
+        Data format, `None` when the file is not compressed or no supported
+        file is compressed.
+    """
+    compression = get_compression(file_obj)
+
+    if compression == GZIP:
+        dataformat = get_dataformat_by_name(
+            os.path.splitext(filename or '')[0]
+        )
+        return dataformat if dataformat != FORMAT.SHP else None
+
+    if compression == ZIP:
+        try:
+            with zipfile.ZipFile(file_obj) as archive:
+                if XLSX_MEMBER in archive.namelist():
+                    return FORMAT.XLSX
+                return find_member(archive)[1]
+        except zipfile.BadZipfile:
+            return None
+        finally:
+            file_obj.seek(0)
+
+    return None
+
+
+def get_ogr_path(path):
+    """
+    Get the path OGR reads a file from, decompressing it as a stream
+    through the GDAL virtual file systems (`/vsigzip/`, `/vsizip/`).
+
+    Parameters
+    ----------
+    path : str
+        Path of the file.
+
+    Returns
+    -------
+    str
+        Path for OGR.
+    """
+    with open(path, 'rb') as file_obj:
+        compression = get_compression(file_obj)
+
+    if compression == GZIP:
+        return '/vsigzip/%s' % path
+
+    if compression == ZIP:
+        with zipfile.ZipFile(path) as archive:
+            member = find_member(archive)[0]
+        if member:
+            return '/vsizip/%s/%s' % (path, member)
+
+    return path
+
+
+def open_file(path, binary=False):
+    """
+    Open a file for reading as a stream, decompressing it on the fly.
+
+    Only a block of the file is decompressed at a time, so memory stays
+    bounded whatever the size of the uncompressed file is.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file.
+    binary : bool
+        Whether to open the file as bytes (e.g. to track byte offsets).
+
+    Returns
+    -------
+    file
+        Text stream (or UTF-8 encoded bytes on Python 2), bytes stream when
+        opened as binary.
+
+    Raises
+    ------
+    ValueError
+        When a zip archive has no supported file.
+    """
+    with open(path, 'rb') as file_obj:
+        compression = get_compression(file_obj)
+
+    if compression == GZIP:
+        stream = gzip.open(path, 'rb')
+    elif compression == ZIP:
+        archive = zipfile.ZipFile(path)
+        member = find_member(archive)[0]
+        if not member:
+            archive.close()
+            raise ValueError(UNSUPPORTED_FILE_MSG)
+        stream = archive.open(member)
+    elif binary:
+        return open(path, 'rb')
+    else:
+        return open(path, 'r' if PY3 else 'rU')
+
+    return io.TextIOWrapper(stream) if PY3 and not binary else stream
@@ -0,0 +1,245 @@
+"""All helpers for coordinate reference systems of data import files."""
+
+import re
+import json
+import math
+
+from osgeo import ogr, osr
+
+
+WGS84 = 4326
+
+EPSG_PATTERN = re.compile(
+    r'^(?:urn:ogc:def:crs:)?EPSG:(?:[0-9.]*:)?(\d+)$',
+    re.I
+)
+CRS84_PATTERN = re.compile(r'^urn:ogc:def:crs:OGC:[0-9.]*:CRS84$', re.I)
+
+
+def get_spatial_reference(srid):
+    """
+    Get a spatial reference (with longitude, latitude order of axes).
+
+    Parameters
+    ----------
+    srid : int
+        EPSG code of the coordinate reference system.
+
+    Returns
+    -------
+    osgeo.osr.SpatialReference
+        The spatial reference.
+
+    Raises
+    ------
+    ValueError
+        When the EPSG code is not known.
+    """
+    reference = osr.SpatialReference()
+
+    try:
+        if reference.ImportFromEPSG(int(srid)) != 0:
+            raise ValueError
+    except (RuntimeError, TypeError, ValueError):
+        raise ValueError('Coordinate reference system EPSG:%s is not '
+                         'known.' % srid)
+
+    # GDAL 3 follows the order of axes of the authority (latitude first)
+    if hasattr(osr, 'OAMS_TRADITIONAL_GIS_ORDER'):
+        reference.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+
+    return reference
+
+
+def get_geojson_srid(document):
+    """
+    Get the coordinate reference system of a GeoJSON document, from its
+    `crs` member (GeoJSON 2008 specification).
+
+    Parameters
+    ----------
+    document : dict
+        The GeoJSON document.
+
+    Returns
+    -------
+    int
+        EPSG code, `None` when not set (coordinates are WGS84 then).
+
+    Raises
+    ------
+    ValueError
+        When the coordinate reference system is not recognised.
+    """
+    crs = document.get('crs')
+    if not crs:
+        return None
+
+    properties = crs.get('properties') or {}
+
+    if crs.get('type') == 'EPSG':
+        name = 'EPSG:%s' % properties.get('code')
+    else:
+        name = str(properties.get('name', '')).strip()
+
+    if CRS84_PATTERN.match(name):
+        return WGS84
+
+    match = EPSG_PATTERN.match(name)
+    if match:
+        return int(match.group(1))
+
+    raise ValueError('Coordinate reference system %s is not '
+                     'recognised.' % name)
+
+
+def get_layer_srid(layer):
+    """
+    Get the coordinate reference system of an OGR layer.
+
+    Parameters
+    ----------
+    layer : osgeo.ogr.Layer
+        The layer.
+
+    Returns
+    -------
+    int
+        EPSG code, `None` when not set or not recognised.
+    """
+    reference = layer.GetSpatialRef()
+    if reference is None:
+        return None
+
+    try:
+        reference.AutoIdentifyEPSG()
+    except RuntimeError:
+        pass  # Code might still be set by the authority
+
+    code = reference.GetAuthorityCode(None)
+    return int(code) if code else None
+
+
+def get_transformation(srid):
+    """
+    Get the transformation of coordinates to WGS84.
+
+    It is meant to be created once per file and reused for all geometries.
+
+    Parameters
+    ----------
+    srid : int
+        EPSG code of the coordinate reference system transformed from.
+
+    Returns
+    -------
+    osgeo.osr.CoordinateTransformation
+        The transformation, `None` when coordinates are WGS84 already.
+
+    Raises
+    ------
+    ValueError
+        When the EPSG code is not known.
+    """
+    if not srid or int(srid) == WGS84:
+        return None
+
+    return osr.CoordinateTransformation(
+        get_spatial_reference(srid),
+        get_spatial_reference(WGS84)
+    )
+
+
+def transform_points(points, transformation):
+    """
+    Transform coordinates of points to WGS84, all in one call.
+
+    Parameters
+    ----------
+    points : list
+        Coordinates of points (2 or 3 dimensions).
+    transformation : osgeo.osr.CoordinateTransformation
+        The transformation to apply to all points.
+
+    Returns
+    -------
+    list
+        Transformed coordinates, with the dimensions of the points.
+
+    Raises
+    ------
+    ValueError
+        When a point cannot be transformed.
+    """
+    if not points:
+        return []
+
+    try:
+        transformed = transformation.TransformPoints([
+            (point[0], point[1], point[2] if len(point) > 2 else 0.0)
+            for point in points
+        ])
+    except (RuntimeError, TypeError):
+        raise ValueError('Geometry cannot be transformed.')
+
+    coordinates = []
+
+    for point, values in zip(points, transformed):
+        if any(
+            math.isinf(value) or math.isnan(value) for value in values[:2]
+        ):
+            raise ValueError('Geometry cannot be transformed.')
+        coordinates.append(list(values[:min(len(point), 3)]))
+
+    return coordinates
+
+
+def transform_geometries(geometries, transformation):
+    """
+    Transform GeoJSON geometries to WGS84.
+
+    Points get transformed all at once, other geometries one by one.
+
+    Parameters
+    ----------
+    geometries : list
+        GeoJSON geometries (as dicts).
+    transformation : osgeo.osr.CoordinateTransformation
+        The transformation to apply to all geometries.
+
+    Returns
+    -------
+    list
+        Transformed GeoJSON geometries.
+
+    Raises
+    ------
+    ValueError
+        When a geometry cannot be transformed.
+    """
+    transformed = list(geometries)
+    points = []
+
+    for index, geometry in enumerate(geometries):
+        if geometry.get('type') == 'Point' and geometry.get('coordinates'):
+            points.append(index)
+            continue
+
+        try:
+            ogr_geometry = ogr.CreateGeometryFromJson(json.dumps(geometry))
+            if ogr_geometry is None or \
+                    ogr_geometry.Transform(transformation) != 0:
+                raise ValueError
+        except (RuntimeError, ValueError):
+            raise ValueError('Geometry cannot be transformed.')
+
+        transformed[index] = json.loads(ogr_geometry.ExportToJson())
+
+    coordinates = transform_points(
+        [geometries[index]['coordinates'] for index in points],
+        transformation
+    )
+    for index, point in zip(points, coordinates):
+        transformed[index] = {'type': 'Point', 'coordinates': point}
+
+    return transformed
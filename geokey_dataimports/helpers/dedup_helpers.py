@@ -0,0 +1,87 @@
+"""All helpers for the reuse of parse results of identical files."""
+
+from django.db import connection
+
+from ..base import STATUS, PARSER_VERSION
+
+
+def find_parsed(dataimport):
+    """
+    Find a data import parsed from an identical file.
+
+    Only data imports parsed by the current parser version (with the same
+    coordinate reference system and sheet set by the uploader) are considered,
+    and only those with no data fields converted to GeoKey fields yet (that
+    renames keys of data feature properties). Deleted data imports are never
+    considered, their data features are about to be purged.
+
+    Parameters
+    ----------
+    dataimport : geokey_dataimports.models.DataImport
+        The data import to find an identical one for.
+
+    Returns
+    -------
+    geokey_dataimports.models.DataImport
+        The data import parsed most recently, `None` when there is none.
+    """
+    if not dataimport.checksum:
+        return None
+
+    return type(dataimport)._base_manager.filter(
+        checksum=dataimport.checksum,
+        dataformat=dataimport.dataformat,
+        srid=dataimport.srid,
+        sheet=dataimport.sheet,
+        parser_version=PARSER_VERSION
+    ).exclude(
+        pk=dataimport.pk
+    ).exclude(
+        status=STATUS.deleted
+    ).exclude(
+        datafields__key__isnull=False
+    ).order_by('-created').first()
+
+
+def clone_parsed(source, dataimport):
+    """
+    Clone data fields and data features of a data import, with set-based
+    `INSERT ... SELECT` queries.
+
+    Parameters
+    ----------
+    source : geokey_dataimports.models.DataImport
+        The data import to clone from.
+    dataimport : geokey_dataimports.models.DataImport
+        The data import to clone to.
+
+    Returns
+    -------
+    int
+        Number of data features cloned.
+    """
+    datafields = source.datafields.model._meta.db_table
+    datafeatures = source.datafeatures.model._meta.db_table
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'INSERT INTO %s (created, modified, name, key, types,'
+            '  dataimport_id) '
+            'SELECT now(), now(), name, NULL, types, %%s FROM %s'
+            '  WHERE dataimport_id = %%s ORDER BY id' % (
+                datafields,
+                datafields
+            ),
+            [dataimport.id, source.id]
+        )
+        cursor.execute(
+            'INSERT INTO %s (created, modified, imported, geometry,'
+            '  properties, dataimport_id) '
+            'SELECT now(), now(), false, geometry, properties, %%s FROM %s'
+            '  WHERE dataimport_id = %%s ORDER BY id' % (
+                datafeatures,
+                datafeatures
+            ),
+            [dataimport.id, source.id]
+        )
+        return cursor.rowcount
@@ -0,0 +1,638 @@
+"""All helpers for the data features."""
+
+import json
+import math
+import hashlib
+
+from numbers import Number
+
+from six import string_types
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Func, TextField
+from django.contrib.gis.geos import Polygon
+
+
+DEFAULT_LIMIT = 1000
+MAX_LIMIT = 5000
+MAX_ZOOM = 22
+CLUSTER_MAX_ZOOM = 15
+CLUSTER_SIZE = 64
+# Values cached stay well below the 1 MB limit of memcached
+CACHE_MAX_SIZE = 512 * 1024
+
+WHERE_OPERATORS = ('eq', 'gt', 'gte', 'lt', 'lte', 'exists')
+RANGE_OPERATORS = {'gt': '>', 'gte': '>=', 'lt': '<', 'lte': '<='}
+NUMERIC_PATTERN = r'^\s*-?[0-9]+(\.[0-9]+)?([eE][-+]?[0-9]+)?\s*$'
+
+
+def parse_bbox(value):
+    """
+    Parse a bounding box.
+
+    Parameters
+    ----------
+    value : str
+        Bounding box as `west,south,east,north` (WGS84).
+
+    Returns
+    -------
+    django.contrib.gis.geos.Polygon
+        Bounding box polygon, `None` when no value is provided.
+
+    Raises
+    ------
+    ValueError
+        When the value is not a valid bounding box.
+    """
+    if not value:
+        return None
+
+    coordinates = [float(coordinate) for coordinate in value.split(',')]
+    if len(coordinates) != 4:
+        raise ValueError('Bounding box must have four coordinates.')
+
+    west, south, east, north = coordinates
+    if west > east or south > north:
+        raise ValueError('Bounding box is not valid.')
+
+    bbox = Polygon.from_bbox(coordinates)
+    bbox.srid = 4326
+    return bbox
+
+
+def parse_limit(value):
+    """
+    Parse a page size.
+
+    Parameters
+    ----------
+    value : str
+        Page size requested.
+
+    Returns
+    -------
+    int
+        Page size, capped at the maximum.
+
+    Raises
+    ------
+    ValueError
+        When the value is not a positive number.
+    """
+    if not value:
+        return DEFAULT_LIMIT
+
+    limit = int(value)
+    if limit < 1:
+        raise ValueError('Limit must be a positive number.')
+
+    return min(limit, MAX_LIMIT)
+
+
+def parse_where(value):
+    """
+    Parse a filter of data features by their properties.
+
+    A filter is a JSON object with names of properties as keys and, as
+    values, either a value the property must be equal to, or an object of
+    operators:
+
+    - `eq`: the property is equal to the value;
+    - `gt`, `gte`, `lt`, `lte`: the property is within the range (compared
+      as numbers when the bound is a number, as text otherwise);
+    - `exists`: the property is set (`true`) or not (`false`).
+
+    All predicates must be met, e.g. `{"status": "active", "count":
+    {"gte": 10}}`.
+
+    Parameters
+    ----------
+    value : str
+        Filter as JSON, or already loaded as a dict.
+
+    Returns
+    -------
+    dict
+        Filter, with predicates of each property as a dict of operators.
+        `None` when no value is provided.
+
+    Raises
+    ------
+    ValueError
+        When the filter is not valid.
+    """
+    if not value:
+        return None
+
+    where = json.loads(value) if isinstance(value, string_types) else value
+    if not isinstance(where, dict):
+        raise ValueError('Filter must be an object.')
+
+    predicates = {}
+    for key, predicate in where.items():
+        if not isinstance(predicate, dict):
+            predicate = {'eq': predicate}
+
+        if not predicate or set(predicate) - set(WHERE_OPERATORS):
+            raise ValueError('Filter of %s has unknown operators.' % key)
+        if not isinstance(predicate.get('exists', True), bool):
+            raise ValueError('Filter of %s must exist or not.' % key)
+        for operator in RANGE_OPERATORS:
+            bound = predicate.get(operator, '')
+            if bound is None or isinstance(bound, (bool, dict, list)):
+                raise ValueError(
+                    'Filter of %s must be bound by a number or text.' % key
+                )
+
+        predicates[key] = predicate
+
+    return predicates
+
+
+def filter_by_where(datafeatures, where):
+    """
+    Filter data features by their properties.
+
+    Equality is tested by a single containment (`@>`) of all values, so it
+    uses the GIN index on properties of data features.
+
+    Parameters
+    ----------
+    datafeatures : django.db.models.Queryset
+        Data features to filter.
+    where : dict
+        Filter, as parsed by `parse_where`.
+
+    Returns
+    -------
+    django.db.models.Queryset
+        Filtered data features.
+    """
+    properties = '%s.properties' % datafeatures.model._meta.db_table
+    contains = {}
+
+    for key, predicate in where.items():
+        if 'eq' in predicate:
+            contains[key] = predicate['eq']
+
+        if predicate.get('exists') is True:
+            datafeatures = datafeatures.filter(properties__has_key=key)
+        elif predicate.get('exists') is False:
+            datafeatures = datafeatures.exclude(properties__has_key=key)
+
+        for operator, sql_operator in RANGE_OPERATORS.items():
+            if operator not in predicate:
+                continue
+
+            bound = predicate[operator]
+            if isinstance(bound, Number):
+                # Properties not being numbers are never within the range
+                condition = (
+                    'CASE WHEN (%s ->> %%s) ~ %%s '
+                    'THEN (%s ->> %%s)::numeric END %s %%s' % (
+                        properties,
+                        properties,
+                        sql_operator
+                    )
+                )
+                params = [key, NUMERIC_PATTERN, key, bound]
+            else:
+                condition = '(%s ->> %%s) %s %%s' % (properties, sql_operator)
+                params = [key, '%s' % bound]
+
+            datafeatures = datafeatures.extra(where=[condition], params=params)
+
+    if contains:
+        datafeatures = datafeatures.filter(properties__contains=contains)
+
+    return datafeatures
+
+
+def get_where_key(where):
+    """
+    Get a key identifying a filter of data features (e.g. for caching).
+
+    Parameters
+    ----------
+    where : dict
+        Filter, as parsed by `parse_where`.
+
+    Returns
+    -------
+    str
+        Filter as JSON with sorted keys, `None` when there is no filter.
+    """
+    return json.dumps(where, sort_keys=True) if where else None
+
+
+def filter_datafeatures(datafeatures, bbox=None, after=None, where=None):
+    """
+    Filter data features by a bounding box, a cursor and their properties.
+
+    Parameters
+    ----------
+    datafeatures : django.db.models.Queryset
+        Data features to filter.
+    bbox : django.contrib.gis.geos.Polygon
+        Only data features overlapping the bounding box are returned.
+    after : int
+        Only data features with a greater ID are returned.
+    where : dict
+        Only data features with properties meeting the filter (as parsed by
+        `parse_where`) are returned.
+
+    Returns
+    -------
+    django.db.models.Queryset
+        Filtered data features, ordered by ID.
+    """
+    if where:
+        datafeatures = filter_by_where(datafeatures, where)
+
+    if bbox is not None:
+        datafeatures = datafeatures.filter(geometry__bboverlaps=bbox)
+
+    if after is not None:
+        datafeatures = datafeatures.filter(id__gt=after)
+
+    return datafeatures.order_by('id')
+
+
+def parse_zoom(zoom=None, tolerance=None):
+    """
+    Parse a zoom level used to simplify geometries.
+
+    A tolerance (in degrees) is snapped to the zoom level where it is the
+    closest to a pixel, so any tolerance falls within one of a few buckets.
+
+    Parameters
+    ----------
+    zoom : str
+        Zoom level requested.
+    tolerance : str
+        Tolerance requested, used when zoom level is not provided.
+
+    Returns
+    -------
+    int
+        Zoom level, `None` when neither zoom level nor tolerance is provided.
+
+    Raises
+    ------
+    ValueError
+        When the zoom level or tolerance is not valid.
+    """
+    if zoom:
+        zoom = int(zoom)
+    elif tolerance:
+        tolerance = float(tolerance)
+        if tolerance <= 0:
+            raise ValueError('Tolerance must be a positive number.')
+        zoom = int(round(math.log(360.0 / 256 / tolerance, 2)))
+    else:
+        return None
+
+    return min(max(zoom, 0), MAX_ZOOM)
+
+
+def snap_bbox(bbox, zoom):
+    """
+    Snap a bounding box outwards to the tiles of a zoom level, so map views
+    close to each other request the same bounding box.
+
+    Parameters
+    ----------
+    bbox : django.contrib.gis.geos.Polygon
+        Bounding box polygon.
+    zoom : int
+        Zoom level.
+
+    Returns
+    -------
+    django.contrib.gis.geos.Polygon
+        Bounding box polygon, aligned to the tiles.
+    """
+    size = 360.0 / 2 ** zoom
+    west, south, east, north = bbox.extent
+
+    snapped = Polygon.from_bbox((
+        max(math.floor(west / size) * size, -180),
+        max(math.floor(south / size) * size, -90),
+        min(math.ceil(east / size) * size, 180),
+        min(math.ceil(north / size) * size, 90)
+    ))
+    snapped.srid = 4326
+    return snapped
+
+
+def get_tolerance(zoom):
+    """
+    Get the tolerance (in degrees) of one pixel at a zoom level.
+
+    Parameters
+    ----------
+    zoom : int
+        Zoom level.
+
+    Returns
+    -------
+    float
+        Tolerance.
+    """
+    return 360.0 / 256 / 2 ** zoom
+
+
+class AsGeoJSON(Func):
+    """
+    Serialise geography as GeoJSON within the database.
+
+    Geometry is simplified preserving topology when tolerance is provided.
+    """
+
+    function = 'ST_AsGeoJSON'
+
+    def __init__(self, expression, tolerance=None, **extra):
+        """Initialise function with tolerance (in degrees)."""
+        self.tolerance = None if tolerance is None else float(tolerance)
+        super(AsGeoJSON, self).__init__(
+            expression,
+            output_field=TextField(),
+            **extra
+        )
+
+    def as_sql(self, compiler, connection, **extra_context):
+        """Simplify geometry when tolerance is provided."""
+        if self.tolerance is None:
+            return super(AsGeoJSON, self).as_sql(
+                compiler,
+                connection,
+                **extra_context
+            )
+
+        sql, params = super(AsGeoJSON, self).as_sql(
+            compiler,
+            connection,
+            template=(
+                '%(function)s(ST_SimplifyPreserveTopology('
+                '%(expressions)s::geometry, %%s))'
+            ),
+            **extra_context
+        )
+        return sql, tuple(params) + (self.tolerance,)
+
+
+def iter_collection(rows, limit):
+    """
+    Iterate over a page of rows serialised as a GeoJSON feature collection.
+
+    Parameters
+    ----------
+    rows : iterable
+        Tuples of the ID and the geometry (serialised as GeoJSON) of data
+        features, ordered by ID.
+    limit : int
+        Page size.
+
+    Yields
+    ------
+    str
+        Parts of the feature collection, with the cursor of the next page as
+        `next`.
+    """
+    yield '{"type": "FeatureCollection", "features": ['
+
+    count = 0
+    last_id = next_after = None
+    for id, geometry in rows:
+        if count == limit:
+            next_after = last_id
+            break
+
+        yield '%s{"type": "Feature", "id": %d, "geometry": %s}' % (
+            ', ' if count else '',
+            id,
+            geometry
+        )
+        last_id = id
+        count += 1
+
+    yield '], "next": %s}' % json.dumps(next_after)
+
+
+def iter_feature_collection(datafeatures, limit, zoom=None):
+    """
+    Iterate over a page of data features serialised as a GeoJSON feature
+    collection.
+
+    Geometries are serialised by the database and rows are read through a
+    server-side cursor, so the page is never held in memory.
+
+    Parameters
+    ----------
+    datafeatures : django.db.models.Queryset
+        Data features, filtered and ordered.
+    limit : int
+        Page size.
+    zoom : int
+        Zoom level geometries are simplified for, not simplified when `None`.
+
+    Yields
+    ------
+    str
+        Parts of the feature collection, with the cursor of the next page as
+        `next`.
+    """
+    tolerance = None if zoom is None else get_tolerance(zoom)
+    rows = datafeatures.annotate(
+        geojson=AsGeoJSON('geometry', tolerance)
+    ).values_list('id', 'geojson')[:limit + 1].iterator()
+
+    for part in iter_collection(rows, limit):
+        yield part
+
+
+def get_extent(dataimport):
+    """
+    Get the extent of data features (not imported yet) of a data import.
+
+    Parameters
+    ----------
+    dataimport : geokey_dataimports.models.DataImport
+        The data import to get the extent for.
+
+    Returns
+    -------
+    list
+        West, south, east and north bounds, `None` when there are no data
+        features.
+    """
+    table = dataimport.datafeatures.model._meta.db_table
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT ST_XMin(extent), ST_YMin(extent),'
+            '  ST_XMax(extent), ST_YMax(extent) FROM ('
+            '  SELECT ST_Extent(geometry::geometry) AS extent'
+            '  FROM %s'
+            '  WHERE dataimport_id = %%s AND NOT imported'
+            ') AS extents' % table,
+            [dataimport.id]
+        )
+        extent = cursor.fetchone()
+
+    return None if extent[0] is None else list(extent)
+
+
+def get_clusters(dataimport, zoom, where=None):
+    """
+    Cluster data features (not imported yet) of a data import.
+
+    Centroids of data features are snapped to a grid of cells (sized in
+    pixels at a zoom level) and grouped by the cell they fall within.
+
+    Parameters
+    ----------
+    dataimport : geokey_dataimports.models.DataImport
+        The data import to cluster data features for.
+    zoom : int
+        Zoom level.
+    where : dict
+        Only data features with properties meeting the filter (as parsed by
+        `parse_where`) are clustered.
+
+    Returns
+    -------
+    list
+        Tuples of the number of data features, longitude and latitude of the
+        centroid of each cluster.
+    """
+    table = dataimport.datafeatures.model._meta.db_table
+    condition = ''
+    params = [dataimport.id]
+
+    if where:
+        sql, where_params = filter_by_where(
+            dataimport.datafeatures.filter(imported=False),
+            where
+        ).order_by().values('id').query.sql_with_params()
+        condition = ' AND id IN (%s)' % sql
+        params.extend(where_params)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT total, ST_X(centroid), ST_Y(centroid) FROM ('
+            '  SELECT count(*) AS total,'
+            '  ST_Centroid(ST_Collect(point)) AS centroid'
+            '  FROM ('
+            '    SELECT ST_Centroid(geometry::geometry) AS point'
+            '    FROM %s'
+            '    WHERE dataimport_id = %%s AND NOT imported%s'
+            '  ) AS points'
+            '  GROUP BY ST_SnapToGrid(point, %%s)'
+            ') AS clusters' % (table, condition),
+            params + [get_tolerance(zoom) * CLUSTER_SIZE]
+        )
+        return [tuple(row) for row in cursor.fetchall()]
+
+
+def get_cache_key(dataimport, name, *args):
+    """
+    Get a cache key for a data import.
+
+    Keys include the time the data import was last modified, so cached
+    values are not used after its data features get imported.
+
+    Parameters
+    ----------
+    dataimport : geokey_dataimports.models.DataImport
+        The data import the value is cached for.
+    name : str
+        Name of the cached value.
+    *args
+        Anything else identifying the cached value.
+
+    Returns
+    -------
+    str
+        Cache key.
+    """
+    return 'dataimports:%s:%s:%s:%s' % (
+        dataimport.id,
+        dataimport.modified.strftime('%Y%m%d%H%M%S%f'),
+        name,
+        hashlib.md5(repr(args).encode('utf-8')).hexdigest()
+    )
+
+
+def get_cache_timeout():
+    """
+    Get the timeout of cached values.
+
+    Returns
+    -------
+    int
+        `DATAIMPORTS_CACHE_TIMEOUT` setting (in seconds), defaults to an hour.
+    """
+    return getattr(settings, 'DATAIMPORTS_CACHE_TIMEOUT', 60 * 60)
+
+
+def iter_cached(key, parts):
+    """
+    Iterate over parts of a response, caching them joined once all parts
+    are read.
+
+    Responses larger than `CACHE_MAX_SIZE` are not cached.
+
+    Parameters
+    ----------
+    key : str
+        Cache key.
+    parts : iterable
+        Parts of the response.
+
+    Yields
+    ------
+    str
+        Parts of the response.
+    """
+    cached = []
+    size = 0
+
+    for part in parts:
+        if cached is not None:
+            cached.append(part)
+            size += len(part)
+            if size > CACHE_MAX_SIZE:
+                cached = None
+        yield part
+
+    if cached is not None:
+        cache.set(key, ''.join(cached), get_cache_timeout())
+
+
+def get_cached(key, callback):
+    """
+    Get a cached value, or compute and cache it when it is not cached yet.
+
+    Parameters
+    ----------
+    key : str
+        Cache key.
+    callback : function
+        Computes the value.
+
+    Returns
+    -------
+    obj
+        The value.
+    """
+    value = cache.get(key)
+
+    if value is None:
+        value = callback()
+        cache.set(key, value, get_cache_timeout())
+
+    return value
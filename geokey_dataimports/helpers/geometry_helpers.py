@@ -0,0 +1,218 @@
+"""All helpers for geometries of data features."""
+
+import json
+import math
+import struct
+import binascii
+
+from numbers import Number
+
+from six import string_types
+
+
+# Names of columns holding latitudes and longitudes (compared in lower
+# case), in order of preference
+COORDINATE_NAMES = (
+    ('latitude', 'longitude'),
+    ('lat', 'lon'),
+    ('lat', 'lng'),
+    ('lat', 'long'),
+    ('y', 'x'),
+    ('northing', 'easting'),
+)
+
+EWKB_POINT = 0x01
+EWKB_Z = 0x80000000
+EWKB_SRID = 0x20000000
+
+
+def find_coordinate_fields(fieldnames):
+    """
+    Find the pair of fields holding latitudes and longitudes.
+
+    Parameters
+    ----------
+    fieldnames : list
+        Names of fields.
+
+    Returns
+    -------
+    tuple
+        Names of the latitude and longitude fields, `(None, None)` when the
+        file has no such pair.
+    """
+    names = dict(
+        (name.strip().lower(), name)
+        for name in reversed(fieldnames) if name
+    )
+
+    for latitude, longitude in COORDINATE_NAMES:
+        if latitude in names and longitude in names:
+            return names[latitude], names[longitude]
+
+    return None, None
+
+
+def parse_coordinate(value):
+    """
+    Parse a coordinate.
+
+    Parameters
+    ----------
+    value : str
+        The coordinate, as a string or a number.
+
+    Returns
+    -------
+    float
+        The coordinate, `None` when the value is not a finite number.
+    """
+    if isinstance(value, bool):
+        return None
+
+    try:
+        value = float(
+            value.strip() if isinstance(value, string_types) else value
+        )
+    except (TypeError, ValueError):
+        return None
+
+    return value if not math.isinf(value) and not math.isnan(value) else None
+
+
+def get_point(properties, latitude, longitude):
+    """
+    Get the point of a feature from its latitude and longitude.
+
+    Parameters
+    ----------
+    properties : dict
+        Properties of the feature.
+    latitude : str
+        Name of the latitude field.
+    longitude : str
+        Name of the longitude field.
+
+    Returns
+    -------
+    dict
+        The point as GeoJSON, `None` when coordinates are not numbers.
+    """
+    x = parse_coordinate(properties.get(longitude))
+    y = parse_coordinate(properties.get(latitude))
+
+    if x is None or y is None:
+        return None
+
+    return {'type': 'Point', 'coordinates': [x, y]}
+
+
+def iter_positions(geometry):
+    """
+    Iterate over positions of a geometry.
+
+    Parameters
+    ----------
+    geometry : dict
+        The geometry as GeoJSON.
+
+    Returns
+    -------
+    generator
+        Positions (lists of coordinates).
+    """
+    for member in geometry.get('geometries') or []:
+        for position in iter_positions(member):
+            yield position
+
+    coordinates = [geometry.get('coordinates') or []]
+    while coordinates:
+        value = coordinates.pop()
+        if not isinstance(value, list) or not value:
+            continue
+        if isinstance(value[0], Number):
+            yield value
+        else:
+            coordinates.extend(value)
+
+
+def is_wgs84(geometry):
+    """
+    Check whether coordinates of a geometry are longitudes and latitudes.
+
+    Projected coordinates (e.g. eastings and northings) are out of range,
+    PostGIS refuses to store them as geographies.
+
+    Parameters
+    ----------
+    geometry : dict
+        The geometry as GeoJSON.
+
+    Returns
+    -------
+    bool
+        Whether all coordinates are within the range of WGS84.
+    """
+    return all(
+        len(position) >= 2 and
+        -180 <= position[0] <= 180 and
+        -90 <= position[1] <= 90
+        for position in iter_positions(geometry)
+    )
+
+
+def point_to_ewkb(coordinates, srid=4326):
+    """
+    Encode a point as hex EWKB, without going through GDAL or GEOS.
+
+    Parameters
+    ----------
+    coordinates : list
+        Coordinates of the point (2 or 3 dimensions).
+    srid : int
+        EPSG code of the coordinate reference system.
+
+    Returns
+    -------
+    str
+        The point as hex EWKB.
+    """
+    geometry_type = EWKB_POINT | EWKB_SRID
+    if len(coordinates) > 2:
+        geometry_type |= EWKB_Z
+        coordinates = coordinates[:3]
+
+    return binascii.hexlify(struct.pack(
+        '<BII%sd' % len(coordinates),
+        1,  # Little endian
+        geometry_type,
+        srid,
+        *coordinates
+    )).decode('ascii')
+
+
+def get_geometry_value(geometry):
+    """
+    Get the value a geometry gets stored as.
+
+    Points are encoded as EWKB directly, other geometries as GeoJSON.
+
+    Parameters
+    ----------
+    geometry : dict
+        The geometry as GeoJSON.
+
+    Returns
+    -------
+    str
+        The geometry as hex EWKB or GeoJSON.
+    """
+    if geometry.get('type') == 'Point':
+        coordinates = geometry.get('coordinates') or []
+        if len(coordinates) >= 2 and all(
+            isinstance(value, Number) and not isinstance(value, bool)
+            for value in coordinates
+        ):
+            return point_to_ewkb(coordinates)
+
+    return json.dumps(geometry)
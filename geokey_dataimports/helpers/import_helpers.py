@@ -0,0 +1,323 @@
+"""All helpers for the import of data features."""
+
+from contextlib import contextmanager
+
+from django.core.exceptions import ValidationError
+from django.db import connection, connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from geokey.categories.models import LookupValue
+from geokey.contributions.serializers import ContributionSerializer
+from geokey.socialinteractions.models import SocialInteractionPost
+
+
+@contextmanager
+def post_interactions_disabled(project_id):
+    """
+    Temporarily disable post interactions of a project.
+
+    Contributions created while importing data features should not trigger
+    social interaction posts. Statuses are restored when the block exits.
+
+    Parameters
+    ----------
+    project_id : int
+        Identifies the project in the database.
+    """
+    post_interactions_backup = {}
+    post_interactions = SocialInteractionPost.objects.filter(
+        project_id=project_id
+    )
+    for post_interaction in post_interactions:
+        post_interactions_backup[post_interaction] = post_interaction.status
+        post_interaction.status = 'inactive'
+        post_interaction.save()
+
+    try:
+        yield
+    finally:
+        for post_interaction, status in post_interactions_backup.items():
+            post_interaction.status = status
+            post_interaction.save()
+
+
+def create_lookup_values(dataimport, lookupfields=None):
+    """
+    Create lookup values for all values of lookup fields, before data
+    features get converted.
+
+    Workers converting data features in parallel then only get existing
+    lookup values, so none of them gets created twice.
+
+    Parameters
+    ----------
+    dataimport : geokey_dataimports.models.DataImport
+        The data import to create lookup values for.
+    lookupfields : dict
+        Lookup fields of a category, looked up when not provided.
+
+    Returns
+    -------
+    int
+        Number of lookup values created.
+    """
+    if lookupfields is None:
+        lookupfields = dataimport.get_lookup_fields()
+
+    table = dataimport.datafeatures.model._meta.db_table
+    created_count = 0
+
+    for key, field in lookupfields.items():
+        if key not in (dataimport.keys or []):
+            continue
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT DISTINCT properties ->> %%s FROM %s'
+                ' WHERE dataimport_id = %%s AND NOT imported'
+                ' AND properties ? %%s' % table,
+                [key, dataimport.id, key]
+            )
+            names = [row[0] for row in cursor.fetchall()]
+
+        for name in names:
+            value, created = LookupValue.objects.get_or_create(
+                name=name,
+                field=field
+            )
+            created_count += int(created)
+
+    return created_count
+
+
+def convert_datafeatures(dataimport, datafeatures, user, lookupfields=None):
+    """
+    Convert data features to contributions.
+
+    Data features are not marked as imported, that is left to the caller so
+    it can be done in a single query. Lookup values missing are created, so
+    converting in parallel requires `create_lookup_values` to be run first.
+
+    Parameters
+    ----------
+    dataimport : geokey_dataimports.models.DataImport
+        The data import the data features belong to.
+    datafeatures : iterable
+        Data features (geokey_dataimports.models.DataFeature) to convert.
+    user : geokey.users.models.User
+        The user contributions are created for.
+    lookupfields : dict
+        Lookup fields of a category, looked up when not provided.
+
+    Returns
+    -------
+    list
+        IDs of data features that have been converted.
+    """
+    if lookupfields is None:
+        lookupfields = dataimport.get_lookup_fields()
+
+    converted = []
+    for datafeature in datafeatures:
+        properties = datafeature.properties
+
+        for key, value in dict(properties).items():
+            if key not in dataimport.keys:
+                del properties[key]
+            elif key in lookupfields:
+                value, created = LookupValue.objects.get_or_create(
+                    name=value,
+                    field=lookupfields[key]
+                )
+                properties[key] = value.id
+
+        feature = {
+            "location": {
+                "geometry": datafeature.geometry
+            },
+            "meta": {
+                "category": dataimport.category.id,
+            },
+            "properties": properties
+        }
+
+        serializer = ContributionSerializer(
+            data=feature,
+            context={
+                'user': user,
+                'project': dataimport.project
+            }
+        )
+
+        try:
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+            converted.append(datafeature.id)
+        except ValidationError:
+            pass
+
+    return converted
+
+
+def mark_imported(dataimport, ids):
+    """
+    Mark data features as imported.
+
+    Parameters
+    ----------
+    dataimport : geokey_dataimports.models.DataImport
+        The data import the data features belong to.
+    ids : list
+        IDs of data features to mark.
+
+    Returns
+    -------
+    int
+        Number of data features marked.
+    """
+    if not ids:
+        return 0
+
+    now = timezone.now()
+    marked = dataimport.datafeatures.filter(id__in=ids).update(
+        imported=True,
+        modified=now
+    )
+
+    # Touch the data import too, so its cached tiles are no longer served
+    type(dataimport).objects.filter(pk=dataimport.pk).update(
+        imported_count=F('imported_count') + marked,
+        modified=now
+    )
+    dataimport.imported_count += marked
+    dataimport.modified = now
+
+    return marked
+
+
+def import_datafeatures(dataimport, datafeatures, user):
+    """
+    Import data features as contributions within the current process.
+
+    Parameters
+    ----------
+    dataimport : geokey_dataimports.models.DataImport
+        The data import the data features belong to.
+    datafeatures : django.db.models.Queryset
+        Data features to import.
+    user : geokey.users.models.User
+        The user contributions are created for.
+
+    Returns
+    -------
+    int
+        Number of contributions imported.
+    """
+    with transaction.atomic():
+        ids = convert_datafeatures(dataimport, datafeatures, user)
+        return mark_imported(dataimport, ids)
+
+
+def get_id_ranges(dataimport, workers):
+    """
+    Partition data features that are not imported yet into ID ranges.
+
+    Ranges are balanced by the number of data features rather than by width,
+    so gaps in IDs do not leave workers idle.
+
+    Parameters
+    ----------
+    dataimport : geokey_dataimports.models.DataImport
+        The data import to partition.
+    workers : int
+        Number of ranges to make.
+
+    Returns
+    -------
+    list
+        Tuples of the first and last ID (inclusive) of each range.
+    """
+    table = dataimport.datafeatures.model._meta.db_table
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT min(id), max(id) FROM ('
+            '  SELECT id, ntile(%%s) OVER (ORDER BY id) AS bucket'
+            '  FROM %s'
+            '  WHERE dataimport_id = %%s AND NOT imported'
+            ') AS buckets GROUP BY bucket ORDER BY 1' % table,
+            [max(int(workers), 1), dataimport.id]
+        )
+        return [tuple(row) for row in cursor.fetchall()]
+
+
+def close_connections():
+    """
+    Close database connections inherited from the parent process.
+
+    Used as a worker pool initialiser, so every worker opens its own database
+    connection instead of sharing the socket of the parent.
+    """
+    connections.close_all()
+
+
+def import_id_range(args):
+    """
+    Import data features within an ID range (run by a worker process).
+
+    Data features are locked in batches with `SELECT ... FOR UPDATE SKIP
+    LOCKED`, so a data feature locked by another worker is never imported
+    twice. Databases without `SKIP LOCKED` (PostgreSQL before 9.5) wait for
+    locks instead.
+
+    Parameters
+    ----------
+    args : tuple
+        Data import ID, user ID, first ID, last ID and batch size.
+
+    Returns
+    -------
+    int
+        Number of contributions imported.
+    """
+    from geokey.users.models import User
+    from ..models import DataImport
+
+    dataimport_id, user_id, first_id, last_id, batch_size = args
+    dataimport = DataImport.objects.select_related(
+        'project',
+        'category'
+    ).get(pk=dataimport_id)
+    user = User.objects.get(pk=user_id)
+    lookupfields = dataimport.get_lookup_fields()
+
+    skip_locked = connection.features.has_select_for_update_skip_locked
+
+    imported = 0
+    cursor_id = first_id - 1
+    while True:
+        with transaction.atomic():
+            datafeatures = list(
+                dataimport.datafeatures.select_for_update(
+                    **({'skip_locked': True} if skip_locked else {})
+                ).filter(
+                    imported=False,
+                    id__gt=cursor_id,
+                    id__lte=last_id
+                ).order_by('id')[:batch_size]
+            )
+
+            if not datafeatures:
+                break
+
+            cursor_id = datafeatures[-1].id
+            ids = convert_datafeatures(
+                dataimport,
+                datafeatures,
+                user,
+                lookupfields=lookupfields
+            )
+            imported += mark_imported(dataimport, ids)
+
+    return imported
@@ -1,6 +1,7 @@
 import csv
 import codecs
 
+from bs4 import BeautifulSoup
 from django.utils.html import strip_tags
 from six import PY3
 
@@ -36,12 +37,12 @@ class UnicodeReader:
         return self
 
 
-def import_from_csv(features, fields, file_obj):
+def iter_from_csv(fields, file_obj):
     if PY3:
         reader = csv.reader(file_obj)
     else:
         reader = UnicodeReader(file_obj)
-    for fieldname in next(reader, None):
+    for fieldname in next(reader, None) or []:
         fields.append({
             'name': strip_tags(fieldname),
             'good_types': {'TextField', 'LookupField'},
@@ -57,7 +58,23 @@ def import_from_csv(features, fields, file_obj):
                 field = fields[i]
                 properties[field['name']] = column
 
-        features.append({'line': line, 'properties': properties})
-
+        yield {'line': line, 'properties': properties}
 
 
+def import_from_csv(features, fields, file_obj):
+    features.extend(iter_from_csv(fields, file_obj))
+
+
+def table_to_json(table):
+    fields = []
+    table_data = []
+    model = BeautifulSoup(table, features="html.parser")
+    datum = {}
+    ta = model.find_all('table')[0]
+    for i, tr in enumerate(ta.find_all('tr', recursive=False)):
+        fields.append((tr.find_all('td')[0]).text)
+        datum[fields[i]] = (tr.find_all('td')[1]).text
+    if datum:
+        table_data.append(datum)
+
+    return(table_data)
@@ -0,0 +1,227 @@
+"""All helpers for the partitioning of data features."""
+
+from django.apps import apps
+from django.db import connection, transaction
+
+
+MIN_PG_VERSION = 110000
+
+
+def get_table():
+    """
+    Get the table of data features.
+
+    Returns
+    -------
+    str
+        Name of the table.
+    """
+    return apps.get_model('geokey_dataimports', 'DataFeature')._meta.db_table
+
+
+def get_partition_name(dataimport_id):
+    """
+    Get the name of the partition holding data features of a data import.
+
+    Parameters
+    ----------
+    dataimport_id : int
+        Identifies the data import in the database.
+
+    Returns
+    -------
+    str
+        Name of the partition.
+    """
+    return '%s_%d' % (get_table(), int(dataimport_id))
+
+
+def is_partitioned():
+    """
+    Check if data features are partitioned by data import.
+
+    Returns
+    -------
+    bool
+        `True` when the table of data features is partitioned.
+    """
+    if connection.vendor != 'postgresql' or connection.pg_version < 100000:
+        return False
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT EXISTS ('
+            '  SELECT 1 FROM pg_partitioned_table'
+            '  WHERE partrelid = to_regclass(%s)'
+            ')',
+            [get_table()]
+        )
+        return cursor.fetchone()[0]
+
+
+def create_partition(dataimport_id):
+    """
+    Create the partition of a data import, when data features are
+    partitioned.
+
+    Creating a partition locks the table of data features, it should run in
+    a short transaction of its own (not within the parse of a file).
+
+    Parameters
+    ----------
+    dataimport_id : int
+        Identifies the data import in the database.
+
+    Returns
+    -------
+    bool
+        `True` when the partition was created.
+    """
+    if not is_partitioned():
+        return False
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'CREATE TABLE IF NOT EXISTS %s PARTITION OF %s '
+            'FOR VALUES IN (%d)' % (
+                get_partition_name(dataimport_id),
+                get_table(),
+                int(dataimport_id)
+            )
+        )
+
+    return True
+
+
+def drop_partition(dataimport_id):
+    """
+    Drop the partition of a data import (with all its data features), when
+    data features are partitioned.
+
+    Parameters
+    ----------
+    dataimport_id : int
+        Identifies the data import in the database.
+
+    Returns
+    -------
+    int
+        Number of data features dropped, `None` when data features are not
+        partitioned.
+    """
+    if not is_partitioned():
+        return None
+
+    partition = get_partition_name(dataimport_id)
+
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT to_regclass(%s) IS NOT NULL', [partition])
+        if not cursor.fetchone()[0]:
+            return 0
+
+        cursor.execute('SELECT count(*) FROM %s' % partition)
+        count = cursor.fetchone()[0]
+        cursor.execute('DROP TABLE %s' % partition)
+
+    return count
+
+
+def partition_table():
+    """
+    Convert the table of data features into a table partitioned by data
+    import (list partitioning on `dataimport_id`).
+
+    A partition is created for every data import and data features are
+    copied into their partitions, all within a single transaction, so it
+    should run while data imports are not being used.
+
+    Returns
+    -------
+    int
+        Number of partitions created.
+
+    Raises
+    ------
+    RuntimeError
+        When the database does not support partitioning or the table is
+        partitioned already.
+    """
+    if connection.vendor != 'postgresql' or \
+            connection.pg_version < MIN_PG_VERSION:
+        raise RuntimeError('Partitioning requires PostgreSQL 11 or greater.')
+    if is_partitioned():
+        raise RuntimeError('Data features are partitioned already.')
+
+    table = get_table()
+    unpartitioned = '%s_unpartitioned' % table
+    dataimport_ids = apps.get_model(
+        'geokey_dataimports',
+        'DataImport'
+    )._base_manager.values_list('id', flat=True)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute('LOCK TABLE %s IN ACCESS EXCLUSIVE MODE' % table)
+        cursor.execute('ALTER TABLE %s RENAME TO %s' % (table, unpartitioned))
+        # Index names are unique within a schema, the partitioned table takes
+        # these over
+        cursor.execute(
+            'DROP INDEX IF EXISTS %s_not_imported' % table
+        )
+        cursor.execute(
+            'DROP INDEX IF EXISTS %s_properties' % table
+        )
+
+        cursor.execute(
+            'CREATE TABLE %s (LIKE %s INCLUDING DEFAULTS) '
+            'PARTITION BY LIST (dataimport_id)' % (table, unpartitioned)
+        )
+        cursor.execute(
+            'ALTER TABLE %s ADD PRIMARY KEY (id, dataimport_id)' % table
+        )
+        cursor.execute(
+            'ALTER TABLE %s ADD CONSTRAINT %s_dataimport_fk '
+            'FOREIGN KEY (dataimport_id) '
+            'REFERENCES geokey_dataimports_dataimport (id) '
+            'DEFERRABLE INITIALLY DEFERRED' % (table, table)
+        )
+        cursor.execute(
+            'CREATE INDEX %s_geometry_gist ON %s USING GIST (geometry)' % (
+                table,
+                table
+            )
+        )
+        cursor.execute(
+            'CREATE INDEX %s_not_imported ON %s (dataimport_id, id) '
+            'WHERE NOT imported' % (table, table)
+        )
+        cursor.execute(
+            'CREATE INDEX %s_properties ON %s '
+            'USING GIN (properties jsonb_path_ops)' % (table, table)
+        )
+
+        # Keep the sequence of IDs when the old table gets dropped
+        cursor.execute(
+            'SELECT pg_get_serial_sequence(%s, %s)',
+            [unpartitioned, 'id']
+        )
+        sequence = cursor.fetchone()[0]
+        cursor.execute(
+            'ALTER SEQUENCE %s OWNED BY %s.id' % (sequence, table)
+        )
+
+        for dataimport_id in dataimport_ids:
+            cursor.execute(
+                'CREATE TABLE %s PARTITION OF %s FOR VALUES IN (%d)' % (
+                    get_partition_name(dataimport_id),
+                    table,
+                    dataimport_id
+                )
+            )
+
+        cursor.execute(
+            'INSERT INTO %s SELECT * FROM %s' % (table, unpartitioned)
+        )
+        cursor.execute('DROP TABLE %s' % unpartitioned)
+        cursor.execute('ANALYZE %s' % table)
+
+    return len(dataimport_ids)
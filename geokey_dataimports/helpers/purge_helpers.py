@@ -0,0 +1,139 @@
+"""All helpers for the purge of deleted data imports."""
+
+import os
+
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from .partition_helpers import drop_partition
+from .tile_helpers import clear_tiles
+
+
+def get_purgeable(model, days):
+    """
+    Get data imports deleted before the retention period.
+
+    Parameters
+    ----------
+    model : geokey_dataimports.models.DataImport
+        The model of data imports.
+    days : int
+        Retention period (in days).
+
+    Returns
+    -------
+    django.db.models.Queryset
+        Data imports that can be purged.
+    """
+    return model._base_manager.filter(
+        status=model.STATUS.deleted,
+        status_changed__lt=timezone.now() - timedelta(days=days)
+    )
+
+
+def delete_in_batches(queryset, batch_size):
+    """
+    Delete rows in batches, each within its own transaction, so locks are
+    never held for long.
+
+    Parameters
+    ----------
+    queryset : django.db.models.Queryset
+        Rows to delete.
+    batch_size : int
+        Rows deleted per transaction.
+
+    Returns
+    -------
+    int
+        Number of rows deleted.
+    """
+    deleted = 0
+
+    while True:
+        with transaction.atomic():
+            ids = list(
+                queryset.order_by('id').values_list('id', flat=True)[
+                    :batch_size
+                ]
+            )
+            if not ids:
+                break
+
+            deleted += queryset.model._base_manager.filter(
+                id__in=ids
+            ).delete()[0]
+
+    return deleted
+
+
+def purge_dataimport(dataimport, batch_size):
+    """
+    Delete a data import with all its data features, data fields, stored
+    file and cached tiles.
+
+    Parameters
+    ----------
+    dataimport : geokey_dataimports.models.DataImport
+        The data import to purge.
+    batch_size : int
+        Rows deleted per transaction.
+
+    Returns
+    -------
+    tuple
+        Number of rows and bytes reclaimed.
+    """
+    rows = drop_partition(dataimport.id)
+    if rows is None:
+        rows = delete_in_batches(dataimport.datafeatures.all(), batch_size)
+    rows += delete_in_batches(dataimport.datafields.all(), batch_size)
+
+    size = 0
+    if dataimport.file:
+        try:
+            size = dataimport.file.size
+        except (IOError, OSError):
+            pass  # File is missing already
+        dataimport.file.delete(save=False)
+
+    clear_tiles(dataimport)
+    rows += type(dataimport)._base_manager.filter(
+        pk=dataimport.pk
+    ).delete()[0]
+
+    return rows, size
+
+
+def purge_uploads(model, days):
+    """
+    Delete uploads not continued within the retention period, with their
+    partially uploaded files.
+
+    Parameters
+    ----------
+    model : geokey_dataimports.models.DataUpload
+        The model of uploads.
+    days : int
+        Retention period (in days).
+
+    Returns
+    -------
+    tuple
+        Number of uploads deleted and bytes reclaimed.
+    """
+    purged = size = 0
+
+    for upload in model.objects.filter(
+        modified__lt=timezone.now() - timedelta(days=days)
+    ):
+        path = upload.get_path()
+        if os.path.isfile(path):
+            size += os.path.getsize(path)
+
+        upload.delete()
+        purged += 1
+
+    return purged, size
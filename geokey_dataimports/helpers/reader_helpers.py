@@ -0,0 +1,833 @@
+"""All helpers for reading data import files (a registry of readers)."""
+
+import os
+import re
+import sys
+import csv
+import json
+
+from datetime import date, datetime, time
+from numbers import Number
+
+from osgeo import ogr
+from six import string_types, text_type
+
+from django.utils.html import strip_tags
+
+from ..base import FORMAT
+from .compression_helpers import get_compression, get_ogr_path, open_file
+from .crs_helpers import get_geojson_srid, get_layer_srid
+from .geometry_helpers import find_coordinate_fields, get_point
+from .model_helpers import iter_from_csv, table_to_json
+
+
+READERS = {}
+
+GEOMETRY_TYPES = (
+    'Point',
+    'MultiPoint',
+    'LineString',
+    'MultiLineString',
+    'Polygon',
+    'MultiPolygon',
+    'GeometryCollection',
+)
+# Record separator starting each text of GeoJSON text sequences (RFC 8142)
+RECORD_SEPARATOR = b'\x1e'
+# Lines of files split into chunks are counted a block at a time
+BLOCK_SIZE = 64 * 1024
+
+# Types of fields declared by a schema, no types get inferred for them
+DECLARED_TYPES = {
+    ogr.OFTInteger: ['NumericField'],
+    ogr.OFTInteger64: ['NumericField'],
+    ogr.OFTReal: ['NumericField'],
+    ogr.OFTDate: ['DateField', 'DateTimeField'],
+    ogr.OFTDateTime: ['DateTimeField'],
+    ogr.OFTTime: ['TimeField'],
+}
+# Types of fields exported by OGR as dates, i.e. `YYYY/MM/DD HH:MM:SS+HH`
+DATE_TYPES = (ogr.OFTDate, ogr.OFTDateTime)
+OGR_DATE_PATTERN = re.compile(
+    r'^(\d{4})/(\d{2})/(\d{2})'
+    r'(?:[ T](\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)'
+    r'(?:([+-]\d{2}):?(\d{2})?|Z)?)?$'
+)
+
+
+def count_lines(file_obj, start, end):
+    """
+    Count lines between two byte offsets of a file, only looking for line
+    breaks.
+
+    Parameters
+    ----------
+    file_obj : file
+        The file, opened as bytes.
+    start : int
+        Byte offset to count from.
+    end : int
+        Byte offset to count to.
+
+    Returns
+    -------
+    int
+        Number of line breaks.
+    """
+    file_obj.seek(start)
+    lines = 0
+
+    while start < end:
+        block = file_obj.read(min(BLOCK_SIZE, end - start))
+        if not block:
+            break
+        lines += block.count(b'\n')
+        start += len(block)
+
+    return lines
+
+
+def to_iso_date(value):
+    """
+    Convert a date (with time) exported by OGR to ISO 8601.
+
+    Parameters
+    ----------
+    value : str
+        The date, as `YYYY/MM/DD`, optionally followed by time and offset.
+
+    Returns
+    -------
+    str
+        The date in ISO 8601, or the value itself when it is not a date.
+    """
+    match = OGR_DATE_PATTERN.match(value)
+    if match is None:
+        return value
+
+    year, month, day, clock, hours, minutes = match.groups()
+    iso_date = '%s-%s-%s' % (year, month, day)
+
+    if clock:
+        iso_date += 'T' + clock
+        if hours:
+            iso_date += '%s:%s' % (hours, minutes or '00')
+        elif value.endswith('Z'):
+            iso_date += 'Z'
+
+    return iso_date
+
+
+def register_reader(dataformat):
+    """
+    Register a reader of a data format (used as a class decorator).
+
+    Parameters
+    ----------
+    dataformat : str
+        Data format read by the reader.
+
+    Returns
+    -------
+    function
+        Decorator registering the reader.
+    """
+    def decorator(reader_class):
+        READERS[dataformat] = reader_class
+        return reader_class
+
+    return decorator
+
+
+def get_reader(dataimport):
+    """
+    Get a reader of a data import file.
+
+    Parameters
+    ----------
+    dataimport : geokey_dataimports.models.DataImport
+        The data import to read the file of.
+
+    Returns
+    -------
+    BaseReader
+        The reader.
+
+    Raises
+    ------
+    ValueError
+        When no reader is registered for the data format.
+    """
+    try:
+        reader_class = READERS[dataimport.dataformat]
+    except KeyError:
+        raise ValueError(
+            'Data format %s cannot be read.' % dataimport.dataformat
+        )
+
+    return reader_class(dataimport.file.path, sheet=dataimport.sheet)
+
+
+class BaseReader(object):
+    """
+    Base of readers of data import files.
+
+    A reader streams features of a file, so it can be iterated more than
+    once without holding all features in memory.
+    """
+
+    def __init__(self, path, sheet=None):
+        """
+        Initialise the reader of a file.
+
+        Parameters
+        ----------
+        path : str
+            Path of the file.
+        sheet : str
+            Name of the sheet (or layer) to read, for formats having more
+            than one.
+        """
+        self.path = path
+        self.sheet = sheet
+        self.srid = None
+
+    def get_fieldnames(self):
+        """
+        Get names of fields declared by the file (e.g. a CSV header).
+
+        Returns
+        -------
+        list
+            Names of fields, in the order they are declared.
+        """
+        return []
+
+    def get_fieldtypes(self):
+        """
+        Get types of fields declared by a schema of the file.
+
+        Returns
+        -------
+        dict
+            Types (as GeoKey field types) by names of fields, only for
+            fields with types declared.
+        """
+        return {}
+
+    def iter_features(self):
+        """
+        Iterate over features of the file.
+
+        Features are dicts with `line` (position in the file) and
+        `properties`, and `geometry` (GeoJSON) when the format has
+        geometries. Otherwise geometries are looked for within properties as
+        WKT. Features can also have `types` of properties known from the
+        file (e.g. cells of spreadsheets), no types get inferred for them.
+
+        The coordinate reference system found in the file is set as `srid`
+        once features have been iterated over.
+
+        Returns
+        -------
+        generator
+            Features.
+
+        Raises
+        ------
+        ValueError
+            When the file cannot be read.
+        """
+        raise NotImplementedError('Readers must iterate over features.')
+
+
+def iter_with_points(features, fieldnames):
+    """
+    Iterate over features, setting points from latitude and longitude
+    fields (e.g. exports of GPS loggers).
+
+    Features without numeric coordinates are left as they are, so their
+    geometries are looked for within properties as WKT.
+
+    Parameters
+    ----------
+    features : generator
+        Features, with geometries within properties.
+    fieldnames : list
+        Names of fields of the file.
+
+    Returns
+    -------
+    generator
+        Features, with points set as geometries when the file has latitude
+        and longitude fields.
+    """
+    latitude, longitude = find_coordinate_fields(fieldnames)
+
+    for feature in features:
+        if latitude:
+            point = get_point(feature['properties'], latitude, longitude)
+            if point:
+                feature['geometry'] = point
+
+        yield feature
+
+
+@register_reader(FORMAT.CSV)
+class CSVReader(BaseReader):
+    """
+    Reader of CSV files (with WKT formatted geometries, or latitude and
+    longitude fields).
+    """
+
+    def get_fieldnames(self):
+        """Get names of fields from the header."""
+        csv.field_size_limit(sys.maxsize)
+
+        with open_file(self.path) as file_obj:
+            fields = []
+            next(iter_from_csv(fields, file_obj), None)
+
+        return [field['name'] for field in fields]
+
+    def iter_features(self):
+        """Iterate over rows of the file, as features."""
+        csv.field_size_limit(sys.maxsize)
+
+        fieldnames = self.get_fieldnames()
+
+        with open_file(self.path) as file_obj:
+            for feature in iter_with_points(
+                iter_from_csv([], file_obj),
+                fieldnames
+            ):
+                yield feature
+
+
+@register_reader(FORMAT.GeoJSON)
+class GeoJSONReader(BaseReader):
+    """
+    Reader of GeoJSON files.
+
+    The document is parsed as a whole once, only features are then
+    streamed.
+    """
+
+    document = None
+
+    def get_document(self):
+        """
+        Get the document, parsed when first needed.
+
+        Returns
+        -------
+        dict
+            The feature collection.
+
+        Raises
+        ------
+        ValueError
+            When the file is not a GeoJSON feature collection.
+        """
+        if self.document is None:
+            with open_file(self.path) as file_obj:
+                document = json.load(file_obj)
+
+            if (not isinstance(document, dict) or
+                    not isinstance(document.get('features'), list)):
+                raise ValueError(
+                    'The file is not a GeoJSON feature collection.'
+                )
+
+            self.document = document
+
+        return self.document
+
+    def iter_features(self):
+        """Iterate over features of the feature collection."""
+        document = self.get_document()
+        self.srid = get_geojson_srid(document)
+
+        for line, feature in enumerate(document['features'], 1):
+            yield {
+                'line': line,
+                'geometry': feature.get('geometry'),
+                'properties': feature.get('properties') or {}
+            }
+
+
+@register_reader(FORMAT.GeoJSONSeq)
+class GeoJSONSeqReader(BaseReader):
+    """
+    Reader of newline-delimited GeoJSON files (GeoJSON text sequences and
+    NDJSON), parsing one feature (or geometry) per line.
+
+    Lines are tracked by their byte offsets, so a file can be split into
+    chunks of whole lines read independently (e.g. by separate worker
+    processes), without any JSON tokenizer. Lines are numbered from the start
+    of the file, also when read in chunks.
+    """
+
+    def get_chunks(self, count):
+        """
+        Split the file into chunks of whole lines.
+
+        Compressed files cannot be seeked into, they are read as one chunk.
+
+        Parameters
+        ----------
+        count : int
+            Number of chunks wanted.
+
+        Returns
+        -------
+        list
+            Byte offsets each chunk starts and ends at (`None` for the end
+            of the file) and number of lines before the chunk, as tuples.
+        """
+        size = os.path.getsize(self.path)
+        chunks = []
+        start = 0
+        line = 0
+
+        with open(self.path, 'rb') as file_obj:
+            if get_compression(file_obj):
+                count = 1
+
+            for index in range(1, count):
+                # Next chunk starts after the line the offset falls into
+                file_obj.seek(max(size * index // count, start + 1) - 1)
+                file_obj.readline()
+                offset = file_obj.tell()
+
+                if offset >= size:
+                    break
+
+                chunks.append((start, offset, line))
+                line += count_lines(file_obj, start, offset)
+                start = offset
+
+        chunks.append((start, None, line))
+        return chunks
+
+    def parse_line(self, text, line, offset):
+        """
+        Parse a line of the file.
+
+        Parameters
+        ----------
+        text : bytes
+            The line.
+        line : int
+            Number of the line, counted from the start of the file.
+        offset : int
+            Byte offset the line starts at.
+
+        Returns
+        -------
+        dict
+            The feature, `None` when the line is blank.
+
+        Raises
+        ------
+        ValueError
+            When the line is not a GeoJSON feature or geometry.
+        """
+        text = text.strip().lstrip(RECORD_SEPARATOR).strip()
+        if not text:
+            return None
+
+        try:
+            value = json.loads(text.decode('utf-8'))
+        except ValueError:
+            raise ValueError('Line %s (at byte %s) is not valid JSON.' % (
+                line,
+                offset
+            ))
+
+        if isinstance(value, dict):
+            if value.get('type') == 'Feature':
+                return {
+                    'line': line,
+                    'offset': offset,
+                    'geometry': value.get('geometry'),
+                    'properties': value.get('properties') or {}
+                }
+            elif value.get('type') in GEOMETRY_TYPES:
+                return {
+                    'line': line,
+                    'offset': offset,
+                    'geometry': value,
+                    'properties': {}
+                }
+
+        raise ValueError(
+            'Line %s (at byte %s) is not a GeoJSON feature.' % (line, offset)
+        )
+
+    def iter_features(self, start=0, end=None, line=0):
+        """
+        Iterate over lines of the file (or of a chunk), as features.
+
+        Features also have the byte `offset` of their line.
+
+        Parameters
+        ----------
+        start : int
+            Byte offset the chunk starts at.
+        end : int
+            Byte offset the chunk ends at, `None` for the end of the file.
+        line : int
+            Number of lines before the chunk.
+        """
+        with open_file(self.path, binary=True) as file_obj:
+            if start:
+                file_obj.seek(start)
+
+            offset = start
+
+            for text in iter(file_obj.readline, b''):
+                if end is not None and offset >= end:
+                    break
+
+                line += 1
+                feature = self.parse_line(text, line, offset)
+                offset += len(text)
+
+                if feature:
+                    yield feature
+
+
+class OGRReader(BaseReader):
+    """
+    Reader of any vector format supported by OGR, reading all layers.
+
+    Subclasses set the name of the OGR driver and get registered for their
+    data format.
+    """
+
+    driver_name = None
+    date_fields = ()
+
+    def open(self):
+        """
+        Open the file with OGR.
+
+        Returns
+        -------
+        osgeo.ogr.DataSource
+            The data source.
+
+        Raises
+        ------
+        ValueError
+            When the file cannot be opened.
+        """
+        driver = ogr.GetDriverByName(self.driver_name)
+        if driver is None:
+            raise ValueError(
+                'OGR driver %s is not available.' % self.driver_name
+            )
+
+        source = driver.Open(get_ogr_path(self.path))
+        if source is None:
+            raise ValueError('The file cannot be opened.')
+
+        return source
+
+    def iter_layers(self):
+        """
+        Iterate over layers to read, all of them unless one is set.
+
+        Returns
+        -------
+        generator
+            Layers (`osgeo.ogr.Layer`).
+
+        Raises
+        ------
+        ValueError
+            When the layer set does not exist.
+        """
+        source = self.open()
+
+        if self.sheet:
+            layer = source.GetLayerByName(self.sheet)
+            if layer is None:
+                raise ValueError('Layer %s does not exist.' % self.sheet)
+            yield layer
+        else:
+            for layer in source:
+                yield layer
+
+    def iter_field_definitions(self):
+        """
+        Iterate over definitions of fields of all layers.
+
+        Returns
+        -------
+        generator
+            Field definitions (`osgeo.ogr.FieldDefn`).
+        """
+        for layer in self.iter_layers():
+            definition = layer.GetLayerDefn()
+            for index in range(definition.GetFieldCount()):
+                yield definition.GetFieldDefn(index)
+
+    def get_fieldnames(self):
+        """Get names of fields of all layers."""
+        fieldnames = []
+
+        for definition in self.iter_field_definitions():
+            if definition.GetName() not in fieldnames:
+                fieldnames.append(definition.GetName())
+
+        return fieldnames
+
+    def get_fieldtypes(self):
+        """
+        Get types of fields of all layers, as declared by their schemas.
+
+        A field declared differently by layers gets its types inferred.
+        """
+        fieldtypes = {}
+        undeclared = set()
+
+        for definition in self.iter_field_definitions():
+            name = definition.GetName()
+            types = DECLARED_TYPES.get(definition.GetType())
+
+            if types is None or fieldtypes.get(name, types) != types:
+                undeclared.add(name)
+            else:
+                fieldtypes[name] = types
+
+        return dict(
+            (name, ['TextField', 'LookupField'] + types)
+            for name, types in fieldtypes.items()
+            if name not in undeclared
+        )
+
+    def get_properties(self, feature):
+        """
+        Get properties of a feature.
+
+        Parameters
+        ----------
+        feature : dict
+            The feature exported to GeoJSON.
+
+        Returns
+        -------
+        dict
+            Properties of the feature, with dates converted to ISO 8601.
+        """
+        properties = feature.get('properties') or {}
+
+        for name in self.date_fields:
+            value = properties.get(name)
+            if isinstance(value, string_types):
+                properties[name] = to_iso_date(value)
+
+        return properties
+
+    def iter_features(self):
+        """Iterate over features of all layers."""
+        line = 0
+
+        for layer in self.iter_layers():
+            self.srid = get_layer_srid(layer) or self.srid
+
+            definition = layer.GetLayerDefn()
+            self.date_fields = [
+                definition.GetFieldDefn(index).GetName()
+                for index in range(definition.GetFieldCount())
+                if definition.GetFieldDefn(index).GetType() in DATE_TYPES
+            ]
+
+            for feature in layer:
+                line += 1
+                feature = json.loads(feature.ExportToJson())
+                yield {
+                    'line': line,
+                    'geometry': feature.get('geometry'),
+                    'properties': self.get_properties(feature)
+                }
+
+
+@register_reader(FORMAT.KML)
+class KMLReader(OGRReader):
+    """Reader of KML files, with properties set as a table description."""
+
+    driver_name = 'KML'
+
+    def get_fieldnames(self):
+        """Get no names of fields, properties come from descriptions."""
+        return []
+
+    def get_fieldtypes(self):
+        """Get no types of fields, properties come from descriptions."""
+        return {}
+
+    def get_properties(self, feature):
+        """Get properties from the table of the description of a feature."""
+        return table_to_json(feature['properties']['Description'])[0]
+
+
+@register_reader(FORMAT.GPKG)
+class GPKGReader(OGRReader):
+    """Reader of GeoPackage files."""
+
+    driver_name = 'GPKG'
+
+
+@register_reader(FORMAT.SHP)
+class SHPReader(OGRReader):
+    """Reader of Shapefiles (within zip archives)."""
+
+    driver_name = 'ESRI Shapefile'
+
+
+@register_reader(FORMAT.XLSX)
+class XLSXReader(BaseReader):
+    """
+    Reader of Excel workbooks (with WKT formatted geometries, or latitude
+    and longitude fields), reading a sheet the same way as a CSV file.
+
+    Workbooks are read in the read-only mode of openpyxl, streaming rows of
+    the sheet without loading the whole workbook.
+    """
+
+    def open(self):
+        """
+        Open the sheet to read, the first one unless one is set.
+
+        Returns
+        -------
+        tuple
+            The workbook and the sheet.
+
+        Raises
+        ------
+        ValueError
+            When openpyxl is not installed, or the file or the sheet cannot
+            be opened.
+        """
+        try:
+            import openpyxl
+        except ImportError:
+            raise ValueError('Reading XLSX files requires openpyxl.')
+
+        try:
+            workbook = openpyxl.load_workbook(
+                self.path,
+                read_only=True,
+                data_only=True
+            )
+        except Exception:
+            raise ValueError('The file cannot be opened.')
+
+        if self.sheet:
+            if self.sheet not in workbook.sheetnames:
+                workbook.close()
+                raise ValueError('Sheet %s does not exist.' % self.sheet)
+            return workbook, workbook[self.sheet]
+
+        return workbook, workbook.worksheets[0]
+
+    def iter_rows(self):
+        """
+        Iterate over rows of the sheet.
+
+        Returns
+        -------
+        generator
+            Values of cells of each row.
+        """
+        workbook, sheet = self.open()
+
+        try:
+            for row in sheet.iter_rows():
+                yield [cell.value for cell in row]
+        finally:
+            workbook.close()
+
+    def read_header(self, rows):
+        """
+        Read names of fields from the first row.
+
+        Parameters
+        ----------
+        rows : generator
+            Rows of the sheet, as iterated by `iter_rows`.
+
+        Returns
+        -------
+        list
+            Names of fields.
+        """
+        return [
+            strip_tags(text_type(value)) if value is not None else ''
+            for value in next(rows, None) or []
+        ]
+
+    def get_fieldnames(self):
+        """Get names of fields from the first row."""
+        rows = self.iter_rows()
+        fieldnames = self.read_header(rows)
+        rows.close()
+
+        return fieldnames
+
+    def iter_features(self):
+        """Iterate over rows of the sheet, as features."""
+        rows = self.iter_rows()
+        fieldnames = self.read_header(rows)
+
+        return iter_with_points(
+            self.iter_rows_as_features(rows, fieldnames),
+            fieldnames
+        )
+
+    def iter_rows_as_features(self, rows, fieldnames):
+        """
+        Iterate over rows of the sheet following the header, as features.
+
+        Parameters
+        ----------
+        rows : generator
+            Rows of the sheet, as iterated by `iter_rows`.
+        fieldnames : list
+            Names of fields.
+
+        Returns
+        -------
+        generator
+            Features.
+        """
+        for line, row in enumerate(rows, 1):
+            properties = {}
+            types = {}
+
+            for name, value in zip(fieldnames, row):
+                if value is None or value == '':
+                    continue
+
+                if isinstance(value, string_types):
+                    properties[name] = value
+                elif isinstance(value, bool):
+                    properties[name] = text_type(value).lower()
+                elif isinstance(value, Number):
+                    properties[name] = value
+                    types[name] = ['NumericField']
+                elif isinstance(value, (datetime, date)):
+                    properties[name] = value.isoformat()
+                    types[name] = ['DateField', 'DateTimeField']
+                elif isinstance(value, time):
+                    properties[name] = value.isoformat()
+                    types[name] = ['TimeField']
+                else:
+                    properties[name] = text_type(value)
+
+            if properties:
+                yield {'line': line, 'properties': properties, 'types': types}
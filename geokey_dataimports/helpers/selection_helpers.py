@@ -0,0 +1,236 @@
+"""All helpers for the selection of data features."""
+
+import json
+
+from django.db.models import Q
+from django.contrib.gis.gdal import GDALException
+from django.contrib.gis.geos import GEOSGeometry, GEOSException
+
+from .feature_helpers import parse_bbox, parse_where, filter_by_where
+
+
+SELECTION_TYPES = ('all', 'ids', 'bbox', 'polygon', 'properties')
+
+
+def encode_ranges(ids):
+    """
+    Encode IDs as ranges.
+
+    Consecutive IDs are run-length encoded as `first-last`, ranges are
+    separated by commas, e.g. `1-5,8,10-12`.
+
+    Parameters
+    ----------
+    ids : iterable
+        IDs to encode.
+
+    Returns
+    -------
+    str
+        Encoded IDs.
+    """
+    return ','.join(
+        str(first) if first == last else '%s-%s' % (first, last)
+        for first, last in to_ranges(ids)
+    )
+
+
+def to_ranges(ids):
+    """
+    Convert IDs to ranges of consecutive IDs.
+
+    Parameters
+    ----------
+    ids : iterable
+        IDs to convert.
+
+    Returns
+    -------
+    list
+        Tuples of the first and last ID (inclusive) of each range.
+    """
+    ranges = []
+
+    for id in sorted(set(ids)):
+        if ranges and ranges[-1][1] == id - 1:
+            ranges[-1][1] = id
+        else:
+            ranges.append([id, id])
+
+    return [tuple(id_range) for id_range in ranges]
+
+
+def decode_ranges(value):
+    """
+    Decode ranges of IDs encoded by `encode_ranges`.
+
+    Parameters
+    ----------
+    value : str
+        Encoded IDs.
+
+    Returns
+    -------
+    list
+        Tuples of the first and last ID (inclusive) of each range.
+
+    Raises
+    ------
+    ValueError
+        When the value is not valid.
+    """
+    ranges = []
+
+    for part in value.split(','):
+        if not part:
+            continue
+
+        first, separator, last = part.partition('-')
+        first = int(first)
+        last = int(last) if separator else first
+
+        if first > last:
+            raise ValueError('Range %s is not valid.' % part)
+
+        ranges.append((first, last))
+
+    return ranges
+
+
+def ranges_to_q(ranges):
+    """
+    Convert ranges of IDs to a query filter.
+
+    Single IDs are looked up together, other ranges as range predicates.
+
+    Parameters
+    ----------
+    ranges : list
+        Tuples of the first and last ID (inclusive) of each range.
+
+    Returns
+    -------
+    django.db.models.Q
+        Query filter, matching nothing when there are no ranges.
+    """
+    single = [first for first, last in ranges if first == last]
+    q = Q(id__in=single)
+
+    for first, last in ranges:
+        if first != last:
+            q |= Q(id__range=(first, last))
+
+    return q
+
+
+def parse_selection(value):
+    """
+    Parse a selection of data features.
+
+    A selection is a JSON object with `type` being one of:
+
+    - `all`: all data features;
+    - `ids`: data features set as `ids`;
+    - `bbox`: data features overlapping `bbox` (`[west, south, east, north]`);
+    - `polygon`: data features intersecting `geometry` (GeoJSON);
+    - `properties`: data features having all `properties` set to the values.
+
+    Data features set as `exclude` are never selected. Data features can also
+    be filtered by their properties with `where` (see
+    `geokey_dataimports.helpers.feature_helpers.parse_where`), so the same
+    filter as for the preview selects data features to import.
+
+    IDs are set as a list, or as ranges encoded by `encode_ranges`.
+
+    Parameters
+    ----------
+    value : str
+        Selection as JSON.
+
+    Returns
+    -------
+    dict
+        Selection, with `ids` and `exclude` as lists of ranges.
+
+    Raises
+    ------
+    ValueError
+        When the selection is not valid.
+    """
+    selection = json.loads(value)
+
+    if not isinstance(selection, dict):
+        raise ValueError('Selection must be an object.')
+    if selection.get('type') not in SELECTION_TYPES:
+        raise ValueError('Selection type is not supported.')
+
+    for key in ('ids', 'exclude'):
+        ids = selection.get(key, [])
+        try:
+            if isinstance(ids, list):
+                selection[key] = to_ranges(int(id) for id in ids)
+            else:
+                selection[key] = decode_ranges(ids)
+        except (ValueError, TypeError, AttributeError):
+            raise ValueError('Selection %s must be a list of IDs.' % key)
+
+    if 'where' in selection:
+        selection['where'] = parse_where(selection['where'])
+
+    return selection
+
+
+def filter_by_selection(datafeatures, selection):
+    """
+    Filter data features by a selection.
+
+    Parameters
+    ----------
+    datafeatures : django.db.models.Queryset
+        Data features to filter.
+    selection : dict
+        Selection, as parsed by `parse_selection`.
+
+    Returns
+    -------
+    django.db.models.Queryset
+        Selected data features.
+
+    Raises
+    ------
+    ValueError
+        When the selection is not valid.
+    """
+    selection_type = selection['type']
+
+    if selection_type == 'ids':
+        datafeatures = datafeatures.filter(ranges_to_q(selection['ids']))
+    elif selection_type == 'bbox':
+        bbox = selection.get('bbox')
+        if not isinstance(bbox, list):
+            raise ValueError('Selection bbox must be a list.')
+        datafeatures = datafeatures.filter(
+            geometry__bboverlaps=parse_bbox(','.join(map(str, bbox)))
+        )
+    elif selection_type == 'polygon':
+        try:
+            polygon = GEOSGeometry(json.dumps(selection.get('geometry')))
+        except (GDALException, GEOSException, ValueError, TypeError):
+            raise ValueError('Selection geometry is not valid.')
+        if polygon.geom_type not in ('Polygon', 'MultiPolygon'):
+            raise ValueError('Selection geometry must be a polygon.')
+        polygon.srid = 4326
+        datafeatures = datafeatures.filter(geometry__intersects=polygon)
+    elif selection_type == 'properties':
+        properties = selection.get('properties')
+        if not isinstance(properties, dict) or not properties:
+            raise ValueError('Selection properties must be an object.')
+        datafeatures = datafeatures.filter(properties__contains=properties)
+
+    if selection.get('where'):
+        datafeatures = filter_by_where(datafeatures, selection['where'])
+
+    if selection['exclude']:
+        datafeatures = datafeatures.exclude(ranges_to_q(selection['exclude']))
+
+    return datafeatures
@@ -0,0 +1,218 @@
+"""All helpers for recognising data formats by the content of files."""
+
+import os
+import re
+import csv
+import gzip
+import json
+
+from six import PY3
+
+from ..base import FORMAT
+from .compression_helpers import (
+    GZIP,
+    ZIP,
+    get_compression,
+    get_dataformat_by_name,
+    get_compressed_dataformat
+)
+
+
+# Only the start of a file is read to recognise its data format
+SNIFF_SIZE = 4 * 1024
+
+SQLITE_HEADER = b'SQLite format 3\x00'
+# Application ID of GeoPackage files, set in the SQLite header at offset 68
+GPKG_APPLICATION_IDS = (b'GPKG', b'GP10', b'GP11')
+
+SEQUENCE_TYPES = (
+    'Feature',
+    'Point',
+    'MultiPoint',
+    'LineString',
+    'MultiLineString',
+    'Polygon',
+    'MultiPolygon',
+    'GeometryCollection',
+)
+KML_PATTERN = re.compile(r'<(?:\w+:)?kml[\s>]')
+GEOJSON_PATTERN = re.compile(r'"type"\s*:\s*"(?:FeatureCollection|Feature)"')
+WKT_PATTERN = re.compile(
+    r'^\s*(?:SRID=\d+;)?\s*(?:POINT|LINESTRING|POLYGON|MULTIPOINT|'
+    r'MULTILINESTRING|MULTIPOLYGON|GEOMETRYCOLLECTION)\b',
+    re.IGNORECASE
+)
+
+
+def read_head(file_obj, compression=None):
+    """
+    Read the start of a file, decompressing it when gzip.
+
+    Parameters
+    ----------
+    file_obj : file
+        The file, read from the start and rewound.
+    compression : str
+        Compression of the file.
+
+    Returns
+    -------
+    bytes
+        Up to `SNIFF_SIZE` bytes of the (uncompressed) file.
+    """
+    file_obj.seek(0)
+
+    try:
+        if compression == GZIP:
+            head = gzip.GzipFile(fileobj=file_obj, mode='rb').read(SNIFF_SIZE)
+        else:
+            head = file_obj.read(SNIFF_SIZE)
+    except (IOError, EOFError):
+        head = b''
+    finally:
+        file_obj.seek(0)
+
+    return head
+
+
+def is_csv(text, complete=False):
+    """
+    Check if text is CSV, as read by the CSV reader (comma separated, with
+    a header naming all columns and rows of as many columns). A single
+    column is only CSV when it holds WKT formatted geometries.
+
+    Parameters
+    ----------
+    text : str
+        Start of the file.
+    complete : bool
+        Whether the text is the whole file (otherwise, its last line might
+        be cut).
+
+    Returns
+    -------
+    bool
+        Whether the text is CSV.
+    """
+    lines = text.splitlines(True)
+
+    try:
+        rows = [row for row in csv.reader(
+            lines if PY3 else [line.encode('utf-8') for line in lines]
+        ) if any(value.strip() for value in row)]
+    except csv.Error:
+        return False
+
+    if not complete:
+        rows = rows[:-1] or rows
+
+    if not rows:
+        return False
+
+    header = rows[0]
+    if len(header) == 1:
+        return len(rows) > 1 and all(
+            len(row) == 1 and WKT_PATTERN.match(row[0]) for row in rows[1:]
+        )
+
+    return all(len(row) == len(header) for row in rows[1:])
+
+
+def sniff_head(head, complete=False):
+    """
+    Recognise the data format by the start of a file.
+
+    Parameters
+    ----------
+    head : bytes
+        Start of the (uncompressed) file.
+    complete : bool
+        Whether the start is the whole file.
+
+    Returns
+    -------
+    str
+        Data format, `None` when the content is not supported.
+    """
+    if head.startswith(SQLITE_HEADER):
+        if head[68:72] in GPKG_APPLICATION_IDS:
+            return FORMAT.GPKG
+        return None
+
+    # Text files never have null bytes, binary files mostly do
+    if not head or b'\x00' in head:
+        return None
+
+    text = head.decode('utf-8', 'replace').lstrip(u'\ufeff').lstrip()
+
+    if text.startswith(u'\x1e'):
+        return FORMAT.GeoJSONSeq
+
+    if text.startswith(u'{'):
+        # Newline-delimited GeoJSON has a whole feature on its first line
+        try:
+            value = json.loads(text.splitlines()[0])
+        except ValueError:
+            value = None
+
+        if isinstance(value, dict) and value.get('type') in SEQUENCE_TYPES:
+            return FORMAT.GeoJSONSeq
+        if GEOJSON_PATTERN.search(text):
+            return FORMAT.GeoJSON
+        return None
+
+    if text.startswith(u'<'):
+        if KML_PATTERN.search(text):
+            return FORMAT.KML
+        return None
+
+    if is_csv(text, complete):
+        return FORMAT.CSV
+
+    return None
+
+
+def sniff_dataformat(file_obj, filename=None):
+    """
+    Recognise the data format of a file by its content, reading only the
+    start of it.
+
+    Zip archives (also KMZ and Excel workbooks) are looked into, gzip files
+    are recognised by their names first and by their uncompressed content
+    otherwise. A file with a whole feature on its first line is
+    newline-delimited GeoJSON, whatever its name; otherwise, the name tells
+    newline-delimited GeoJSON with a first line longer than what is read.
+
+    Parameters
+    ----------
+    file_obj : file
+        The file, read from the start and rewound.
+    filename : str
+        Name of the file.
+
+    Returns
+    -------
+    str
+        Data format, `None` when the file is not supported.
+    """
+    compression = get_compression(file_obj)
+
+    if compression == ZIP:
+        return get_compressed_dataformat(file_obj, filename)
+
+    if compression == GZIP:
+        dataformat = get_compressed_dataformat(file_obj, filename)
+        if dataformat:
+            return dataformat
+
+    head = read_head(file_obj, compression)
+    dataformat = sniff_head(head, complete=len(head) < SNIFF_SIZE)
+
+    if dataformat == FORMAT.GeoJSON:
+        name = filename or ''
+        if compression == GZIP:
+            name = os.path.splitext(name)[0]
+        if get_dataformat_by_name(name) == FORMAT.GeoJSONSeq:
+            return FORMAT.GeoJSONSeq
+
+    return dataformat
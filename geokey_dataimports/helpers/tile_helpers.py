@@ -0,0 +1,242 @@
+"""All helpers for the vector tiles."""
+
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.db import connection
+
+
+EXTENT = 4096
+BUFFER = 64
+MAX_ZOOM = 22
+WEB_MERCATOR_HALF_SIZE = 20037508.342789244
+
+
+def get_tiles_root():
+    """
+    Get the root directory of cached tiles.
+
+    Returns
+    -------
+    str
+        `DATAIMPORTS_TILES_ROOT` setting, defaults to `dataimports/tiles`
+        within the media root.
+    """
+    return getattr(
+        settings,
+        'DATAIMPORTS_TILES_ROOT',
+        os.path.join(settings.MEDIA_ROOT, 'dataimports', 'tiles')
+    )
+
+
+def get_tile_bounds(z, x, y):
+    """
+    Get bounds of a tile in Web Mercator (EPSG:3857).
+
+    Parameters
+    ----------
+    z : int
+        Zoom level.
+    x : int
+        Tile column.
+    y : int
+        Tile row (XYZ scheme, counted from the top).
+
+    Returns
+    -------
+    tuple
+        West, south, east and north bounds.
+
+    Raises
+    ------
+    ValueError
+        When the tile does not exist.
+    """
+    z, x, y = int(z), int(x), int(y)
+    if not 0 <= z <= MAX_ZOOM or not 0 <= x < 2 ** z or not 0 <= y < 2 ** z:
+        raise ValueError('Tile does not exist.')
+
+    size = 2 * WEB_MERCATOR_HALF_SIZE / 2 ** z
+    west = -WEB_MERCATOR_HALF_SIZE + x * size
+    north = WEB_MERCATOR_HALF_SIZE - y * size
+    return (west, north - size, west + size, north)
+
+
+def get_tile_path(dataimport, z, x, y):
+    """
+    Get path of a cached tile.
+
+    Tiles are keyed by the data import and the time it was last modified (it
+    is touched whenever its data features get imported), so stale tiles are
+    never served.
+
+    Parameters
+    ----------
+    dataimport : geokey_dataimports.models.DataImport
+        The data import the tile is made for.
+    z : int
+        Zoom level.
+    x : int
+        Tile column.
+    y : int
+        Tile row.
+
+    Returns
+    -------
+    str
+        Path of the tile.
+    """
+    return os.path.join(
+        get_tiles_directory(dataimport),
+        str(z),
+        str(x),
+        '%s.mvt' % y
+    )
+
+
+def get_tiles_directory(dataimport):
+    """
+    Get the directory of cached tiles of a data import, as last modified.
+
+    Parameters
+    ----------
+    dataimport : geokey_dataimports.models.DataImport
+        The data import the tiles are made for.
+
+    Returns
+    -------
+    str
+        Path of the directory.
+    """
+    return os.path.join(
+        get_tiles_root(),
+        str(dataimport.id),
+        dataimport.modified.strftime('%Y%m%d%H%M%S%f')
+    )
+
+
+def build_tile(dataimport, z, x, y):
+    """
+    Build a Mapbox Vector Tile of data features (not imported yet).
+
+    Parameters
+    ----------
+    dataimport : geokey_dataimports.models.DataImport
+        The data import the tile is made for.
+    z : int
+        Zoom level.
+    x : int
+        Tile column.
+    y : int
+        Tile row.
+
+    Returns
+    -------
+    bytes
+        The tile.
+    """
+    table = dataimport.datafeatures.model._meta.db_table
+    bounds = list(get_tile_bounds(z, x, y))
+    envelope = 'ST_MakeEnvelope(%s, %s, %s, %s, 3857)'
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT ST_AsMVT(tile, %%s, %%s, %%s) FROM ('
+            '  SELECT id, ST_AsMVTGeom('
+            '    ST_Transform(geometry::geometry, 3857), %s, %%s, %%s, true'
+            '  ) AS geom'
+            '  FROM %s'
+            '  WHERE dataimport_id = %%s AND NOT imported'
+            '  AND geometry && ST_Transform(%s, 4326)::geography'
+            ') AS tile WHERE geom IS NOT NULL' % (envelope, table, envelope),
+            ['datafeatures', EXTENT, 'geom'] + bounds +
+            [EXTENT, BUFFER, dataimport.id] + bounds
+        )
+        tile = cursor.fetchone()[0]
+
+    return bytes(tile) if tile else b''
+
+
+def get_tile(dataimport, z, x, y):
+    """
+    Get a tile, built and cached on disk when it is not cached yet.
+
+    Parameters
+    ----------
+    dataimport : geokey_dataimports.models.DataImport
+        The data import the tile is made for.
+    z : int
+        Zoom level.
+    x : int
+        Tile column.
+    y : int
+        Tile row.
+
+    Returns
+    -------
+    bytes
+        The tile.
+    """
+    path = get_tile_path(dataimport, z, x, y)
+
+    if os.path.isfile(path):
+        with open(path, 'rb') as file_obj:
+            return file_obj.read()
+
+    tile = build_tile(dataimport, z, x, y)
+
+    # First tile since the data import was modified, older ones are stale
+    if not os.path.isdir(get_tiles_directory(dataimport)):
+        clear_stale_tiles(dataimport)
+
+    directory = os.path.dirname(path)
+    if not os.path.isdir(directory):
+        try:
+            os.makedirs(directory)
+        except OSError:
+            pass  # Made by a concurrent request
+
+    # Write to a temporary file first, so a half-written tile is never read
+    descriptor, temporary_path = tempfile.mkstemp(dir=directory)
+    with os.fdopen(descriptor, 'wb') as file_obj:
+        file_obj.write(tile)
+    os.rename(temporary_path, path)
+
+    return tile
+
+
+def clear_tiles(dataimport):
+    """
+    Remove all cached tiles of a data import.
+
+    Parameters
+    ----------
+    dataimport : geokey_dataimports.models.DataImport
+        The data import to remove tiles for.
+    """
+    shutil.rmtree(
+        os.path.join(get_tiles_root(), str(dataimport.id)),
+        ignore_errors=True
+    )
+
+
+def clear_stale_tiles(dataimport):
+    """
+    Remove cached tiles of a data import made before it was last modified.
+
+    Parameters
+    ----------
+    dataimport : geokey_dataimports.models.DataImport
+        The data import to remove stale tiles for.
+    """
+    root = os.path.join(get_tiles_root(), str(dataimport.id))
+    current = os.path.basename(get_tiles_directory(dataimport))
+
+    if not os.path.isdir(root):
+        return
+
+    for name in os.listdir(root):
+        if name != current:
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
@@ -0,0 +1,194 @@
+"""All helpers for the chunked upload of data import files."""
+
+import os
+import base64
+import hashlib
+import binascii
+
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils.text import get_valid_filename
+
+from ..exceptions import UploadChecksumError, UploadOffsetError
+
+
+BLOCK_SIZE = 64 * 1024
+
+
+def parse_chunk_checksum(value):
+    """
+    Parse a SHA-256 checksum of a chunk (`Upload-Checksum` header).
+
+    Parameters
+    ----------
+    value : str
+        Checksum as `sha256 <base64 digest>`.
+
+    Returns
+    -------
+    bytes
+        Digest.
+
+    Raises
+    ------
+    ValueError
+        When no value is provided or it is not a SHA-256 checksum.
+    """
+    if not value:
+        raise ValueError(
+            'Checksum of the chunk must be set as Upload-Checksum header.'
+        )
+
+    algorithm, _, digest = value.partition(' ')
+    if algorithm != 'sha256':
+        raise ValueError('Only SHA-256 checksums are supported.')
+
+    try:
+        digest = base64.b64decode(digest.encode('ascii'))
+    except (binascii.Error, TypeError, UnicodeEncodeError):
+        raise ValueError('Checksum must be encoded as Base64.')
+
+    if len(digest) != hashlib.sha256().digest_size:
+        raise ValueError('Checksum must be a SHA-256 digest.')
+
+    return digest
+
+
+def append_chunk(upload, stream, offset, length, checksum):
+    """
+    Append a chunk to the file being assembled.
+
+    The upload is locked while the chunk is written, so concurrent chunks
+    never interleave. A chunk not received in full, or not matching its
+    checksum, is discarded.
+
+    Parameters
+    ----------
+    upload : geokey_dataimports.models.DataUpload
+        The upload the chunk belongs to.
+    stream : file
+        Stream to read the chunk from.
+    offset : int
+        Offset the chunk starts at.
+    length : int
+        Length of the chunk.
+    checksum : bytes
+        SHA-256 digest of the chunk.
+
+    Returns
+    -------
+    int
+        Offset after the chunk.
+
+    Raises
+    ------
+    UploadOffsetError
+        When the offset does not match the upload.
+    UploadChecksumError
+        When the chunk does not match its checksum.
+    ValueError
+        When the chunk is not valid.
+    """
+    with transaction.atomic():
+        upload = type(upload).objects.select_for_update().get(pk=upload.pk)
+
+        if offset != upload.offset:
+            raise UploadOffsetError(upload.offset)
+        if length < 1 or offset + length > upload.size:
+            raise ValueError('Chunk exceeds the size of the file.')
+
+        path = upload.get_path()
+        directory = os.path.dirname(path)
+        if not os.path.isdir(directory):
+            try:
+                os.makedirs(directory)
+            except OSError:
+                pass  # Made by a concurrent request
+
+        digest = hashlib.sha256()
+        received = 0
+
+        with open(path, 'r+b' if os.path.isfile(path) else 'wb') as file_obj:
+            # Anything after the offset was left by an interrupted chunk
+            file_obj.seek(offset)
+            file_obj.truncate()
+
+            while received < length:
+                block = stream.read(min(BLOCK_SIZE, length - received))
+                if not block:
+                    break
+                file_obj.write(block)
+                digest.update(block)
+                received += len(block)
+
+            if received < length:
+                file_obj.truncate(offset)
+                raise ValueError('Chunk was not received in full.')
+            if digest.digest() != checksum:
+                file_obj.truncate(offset)
+                raise UploadChecksumError()
+
+        upload.offset = offset + received
+        upload.save(update_fields=['offset', 'modified'])
+
+    return upload.offset
+
+
+def get_checksum(path):
+    """
+    Get the SHA-256 checksum of a file.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file.
+
+    Returns
+    -------
+    str
+        Checksum as a hexadecimal string.
+    """
+    digest = hashlib.sha256()
+
+    with open(path, 'rb') as file_obj:
+        for block in iter(lambda: file_obj.read(BLOCK_SIZE), b''):
+            digest.update(block)
+
+    return digest.hexdigest()
+
+
+def store_upload(upload):
+    """
+    Verify an assembled file and move it to the data import files.
+
+    Parameters
+    ----------
+    upload : geokey_dataimports.models.DataUpload
+        The upload to store.
+
+    Returns
+    -------
+    tuple
+        Name of the file in the storage and its SHA-256 checksum.
+
+    Raises
+    ------
+    ValueError
+        When the file is not complete.
+    """
+    if upload.offset != upload.size:
+        raise ValueError('The file has not been uploaded in full yet.')
+
+    path = upload.get_path()
+    checksum = get_checksum(path)
+
+    name = default_storage.get_available_name(
+        os.path.join(
+            'dataimports',
+            'files',
+            get_valid_filename(os.path.basename(upload.filename))
+        )
+    )
+    os.rename(path, default_storage.path(name))
+
+    return name, checksum
@@ -0,0 +1,109 @@
+"""Command to import data features of a data import in parallel."""
+
+import time
+
+from multiprocessing import Pool
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from geokey.users.models import User
+
+from geokey_dataimports.helpers.import_helpers import (
+    post_interactions_disabled,
+    create_lookup_values,
+    get_id_ranges,
+    close_connections,
+    import_id_range
+)
+from geokey_dataimports.helpers.tile_helpers import clear_tiles
+from geokey_dataimports.models import DataImport
+
+
+class Command(BaseCommand):
+    """Import all data features (not imported yet) as contributions."""
+
+    help = (
+        'Imports all data features of a data import that are not imported '
+        'yet, partitioned by ID ranges across a pool of worker processes.'
+    )
+
+    def add_arguments(self, parser):
+        """Add arguments to the command."""
+        parser.add_argument('dataimport_id', type=int)
+        parser.add_argument(
+            '--user',
+            required=True,
+            help='Email address of the user contributions are created for.'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Number of worker processes (default: 1).'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Data features locked and imported per transaction '
+                 '(default: 500).'
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command."""
+        try:
+            dataimport = DataImport.objects.get(pk=options['dataimport_id'])
+        except DataImport.DoesNotExist:
+            raise CommandError('Data import does not exist.')
+
+        try:
+            user = User.objects.get(email=options['user'])
+        except User.DoesNotExist:
+            raise CommandError('User does not exist.')
+
+        if dataimport.project.islocked:
+            raise CommandError('The project is locked.')
+        if not dataimport.category:
+            raise CommandError(
+                'The data import has no category associated with it.'
+            )
+        if dataimport.keys is None:
+            raise CommandError('The data import has no fields assigned.')
+
+        workers = max(options['workers'], 1)
+        tasks = [
+            (dataimport.id, user.id, first, last, options['batch_size'])
+            for first, last in get_id_ranges(dataimport, workers)
+        ]
+
+        started = time.time()
+        # Lookup values are created once, so workers never race to create
+        # the same ones
+        create_lookup_values(dataimport)
+
+        with post_interactions_disabled(dataimport.project_id):
+            if workers == 1:
+                imported = sum(import_id_range(task) for task in tasks)
+            else:
+                # Forked workers must not share the connection of the parent
+                connections.close_all()
+                pool = Pool(workers, initializer=close_connections)
+                try:
+                    imported = sum(pool.map(import_id_range, tasks))
+                finally:
+                    pool.close()
+                    pool.join()
+        elapsed = time.time() - started
+
+        if imported:
+            clear_tiles(dataimport)
+
+        self.stdout.write(
+            '%s contribution(s) imported in %.2fs (%.1f/s, %s worker(s)).' % (
+                imported,
+                elapsed,
+                imported / elapsed if elapsed else 0,
+                workers
+            )
+        )
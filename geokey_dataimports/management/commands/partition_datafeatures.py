@@ -0,0 +1,26 @@
+"""Command to partition data features by data import."""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from geokey_dataimports.helpers.partition_helpers import partition_table
+
+
+class Command(BaseCommand):
+    """Convert the table of data features into a partitioned table."""
+
+    help = (
+        'Partitions data features by data import (requires PostgreSQL 11 or '
+        'greater). Data features are copied into their partitions within a '
+        'single transaction, so run it while data imports are not used.'
+    )
+
+    def handle(self, *args, **options):
+        """Handle the command."""
+        try:
+            partitions = partition_table()
+        except RuntimeError as error:
+            raise CommandError(str(error))
+
+        self.stdout.write(
+            'Data features partitioned into %s partition(s).' % partitions
+        )
@@ -0,0 +1,63 @@
+"""Command to purge deleted data imports."""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from geokey_dataimports.helpers.purge_helpers import (
+    get_purgeable,
+    purge_dataimport,
+    purge_uploads
+)
+from geokey_dataimports.models import DataImport, DataUpload
+
+
+class Command(BaseCommand):
+    """Permanently delete data imports deleted before a retention period."""
+
+    help = (
+        'Permanently deletes data imports deleted more than a number of days '
+        'ago, with all their data features, data fields and stored files. '
+        'Uploads not continued within the same period are deleted too.'
+    )
+
+    def add_arguments(self, parser):
+        """Add arguments to the command."""
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=30,
+            help='Retention period of deleted data imports, in days '
+                 '(default: 30).'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=10000,
+            help='Rows deleted per transaction (default: 10000).'
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command."""
+        if options['days'] < 0:
+            raise CommandError('Retention period cannot be negative.')
+        if options['batch_size'] < 1:
+            raise CommandError('Batch size must be a positive number.')
+
+        purged = rows = size = 0
+        for dataimport in get_purgeable(DataImport, options['days']):
+            dataimport_rows, dataimport_size = purge_dataimport(
+                dataimport,
+                options['batch_size']
+            )
+            purged += 1
+            rows += dataimport_rows
+            size += dataimport_size
+
+        self.stdout.write(
+            '%s data import(s) purged, %s row(s) and %s byte(s) '
+            'reclaimed.' % (purged, rows, size)
+        )
+
+        purged, size = purge_uploads(DataUpload, options['days'])
+        self.stdout.write(
+            '%s upload(s) purged, %s byte(s) reclaimed.' % (purged, size)
+        )
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+
+
+from django.db import models, migrations
+from django.db.models import Count, Sum, Case, When, IntegerField
+
+
+def count_datafeatures(apps, schema_editor):
+    DataImport = apps.get_model('geokey_dataimports', 'DataImport')
+    DataFeature = apps.get_model('geokey_dataimports', 'DataFeature')
+
+    counts = DataFeature.objects.values('dataimport').annotate(
+        total=Count('id'),
+        imported_total=Sum(Case(
+            When(imported=True, then=1),
+            default=0,
+            output_field=IntegerField()
+        ))
+    ).order_by()
+
+    for count in counts:
+        DataImport.objects.filter(pk=count['dataimport']).update(
+            feature_count=count['total'],
+            imported_count=count['imported_total']
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('geokey_dataimports', '0002_auto_20160329_0957'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataimport',
+            name='feature_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='dataimport',
+            name='imported_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(
+            count_datafeatures,
+            migrations.RunPython.noop
+        ),
+    ]
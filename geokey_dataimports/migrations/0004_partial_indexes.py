@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('geokey_dataimports', '0003_dataimport_counts'),
+    ]
+
+    operations = [
+        # Data features not imported yet, in the order they get imported
+        migrations.RunSQL(
+            'CREATE INDEX geokey_dataimports_datafeature_not_imported '
+            'ON geokey_dataimports_datafeature (dataimport_id, id) '
+            'WHERE NOT imported;',
+            'DROP INDEX geokey_dataimports_datafeature_not_imported;'
+        ),
+        # Data imports not deleted, per project
+        migrations.RunSQL(
+            'CREATE INDEX geokey_dataimports_dataimport_active '
+            'ON geokey_dataimports_dataimport (project_id) '
+            'WHERE status <> \'deleted\';',
+            'DROP INDEX geokey_dataimports_dataimport_active;'
+        ),
+    ]
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+
+
+from django.db import models, migrations
+import django.utils.timezone
+import model_utils.fields
+import uuid
+from django.conf import settings
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('categories', '0016_multiplelookupvalue_symbol'),
+        ('projects', '0007_auto_20160122_1409'),
+        ('geokey_dataimports', '0004_partial_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DataUpload',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('created', model_utils.fields.AutoCreatedField(default=django.utils.timezone.now, verbose_name='created', editable=False)),
+                ('modified', model_utils.fields.AutoLastModifiedField(default=django.utils.timezone.now, verbose_name='modified', editable=False)),
+                ('token', models.UUIDField(default=uuid.uuid4, unique=True, editable=False)),
+                ('name', models.CharField(max_length=100)),
+                ('description', models.TextField(null=True, blank=True)),
+                ('filename', models.CharField(max_length=255)),
+                ('size', models.BigIntegerField()),
+                ('offset', models.BigIntegerField(default=0)),
+                ('category', models.ForeignKey(blank=True, to='categories.Category', null=True)),
+                ('creator', models.ForeignKey(to=settings.AUTH_USER_MODEL)),
+                ('project', models.ForeignKey(related_name='dataimport_uploads', to='projects.Project')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('geokey_dataimports', '0005_dataupload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataimport',
+            name='checksum',
+            field=models.CharField(max_length=64, null=True, blank=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='dataimport',
+            name='parser_version',
+            field=models.PositiveIntegerField(null=True, blank=True),
+        ),
+    ]
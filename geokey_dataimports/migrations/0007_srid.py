@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('geokey_dataimports', '0006_dataimport_checksum'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataimport',
+            name='srid',
+            field=models.PositiveIntegerField(null=True, blank=True),
+        ),
+        migrations.AddField(
+            model_name='dataupload',
+            name='srid',
+            field=models.PositiveIntegerField(null=True, blank=True),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('geokey_dataimports', '0007_srid'),
+    ]
+
+    operations = [
+        # Data features filtered by their properties (containment only)
+        migrations.RunSQL(
+            'CREATE INDEX geokey_dataimports_datafeature_properties '
+            'ON geokey_dataimports_datafeature '
+            'USING GIN (properties jsonb_path_ops);',
+            'DROP INDEX geokey_dataimports_datafeature_properties;'
+        ),
+    ]
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('geokey_dataimports', '0009_dataformat_gpkg_shp'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataimport',
+            name='sheet',
+            field=models.CharField(max_length=100, null=True, blank=True),
+        ),
+        migrations.AddField(
+            model_name='dataupload',
+            name='sheet',
+            field=models.CharField(max_length=100, null=True, blank=True),
+        ),
+        migrations.AlterField(
+            model_name='dataimport',
+            name='dataformat',
+            field=models.CharField(max_length=10, choices=[('GeoJSON', 'GeoJSON'), ('KML', 'KML'), ('CSV', 'CSV'), ('GPKG', 'GPKG'), ('SHP', 'SHP'), ('XLSX', 'XLSX')]),
+        ),
+    ]
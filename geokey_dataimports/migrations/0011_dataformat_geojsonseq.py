@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('geokey_dataimports', '0010_dataimport_sheet'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='dataimport',
+            name='dataformat',
+            field=models.CharField(max_length=10, choices=[('GeoJSON', 'GeoJSON'), ('GeoJSONSeq', 'GeoJSONSeq'), ('KML', 'KML'), ('CSV', 'CSV'), ('GPKG', 'GPKG'), ('SHP', 'SHP'), ('XLSX', 'XLSX')]),
+        ),
+    ]
@@ -1,20 +1,19 @@
 """All models for the extension."""
 
-import sys
+import os
 import json
-import csv
+import uuid
 
 from osgeo import ogr
 
 from django.conf import settings
 from django.dispatch import receiver
-from django.db import models
+from django.db import models, transaction
 from django.template.defaultfilters import slugify
+from django.utils import timezone
 from django.contrib.postgres.fields import ArrayField
 from django.contrib.gis.db import models as gis
 
-from bs4 import BeautifulSoup
-
 
 try:
     from django.contrib.postgres.fields import JSONField
@@ -25,13 +24,31 @@ from model_utils.models import StatusModel, TimeStampedModel
 from geokey.projects.models import Project
 from geokey.categories.models import Category, Field
 
-from geokey_dataimports.helpers.model_helpers import import_from_csv
+from geokey_dataimports.helpers.partition_helpers import (
+    create_partition,
+    drop_partition
+)
+from geokey_dataimports.helpers.dedup_helpers import find_parsed, clone_parsed
+from geokey_dataimports.helpers.upload_helpers import get_checksum
+from geokey_dataimports.helpers.crs_helpers import (
+    get_transformation,
+    transform_geometries
+)
+from geokey_dataimports.helpers.geometry_helpers import (
+    get_geometry_value,
+    is_wgs84
+)
+from geokey_dataimports.helpers.reader_helpers import get_reader
 from .helpers import type_helpers
-from .base import STATUS, FORMAT
+from .base import STATUS, FORMAT, PARSER_VERSION
 from .exceptions import FileParseError
 from .managers import DataImportManager
 
 
+# Data features stored per query while parsing a file
+BATCH_SIZE = 1000
+
+
 class DataImport(StatusModel, TimeStampedModel):
     """Store a single data import."""
 
@@ -46,6 +63,17 @@ class DataImport(StatusModel, TimeStampedModel):
         max_length=500
     )
     keys = ArrayField(models.CharField(max_length=100), null=True, blank=True)
+    feature_count = models.PositiveIntegerField(default=0)
+    imported_count = models.PositiveIntegerField(default=0)
+    checksum = models.CharField(
+        max_length=64,
+        null=True,
+        blank=True,
+        db_index=True
+    )
+    parser_version = models.PositiveIntegerField(null=True, blank=True)
+    srid = models.PositiveIntegerField(null=True, blank=True)
+    sheet = models.CharField(max_length=100, null=True, blank=True)
 
     project = models.ForeignKey(
         'projects.Project',
@@ -63,7 +91,7 @@ class DataImport(StatusModel, TimeStampedModel):
     def delete(self, *args, **kwargs):
         """Delete the data import by setting its status to `deleted`."""
         self.status = self.STATUS.deleted
-        self.save()
+        self.save(update_fields=['status', 'status_changed', 'modified'])
 
     def get_lookup_fields(self):
         """Get all lookup fields of a category."""
@@ -78,106 +106,144 @@ class DataImport(StatusModel, TimeStampedModel):
 def post_save_dataimport(sender, instance, created, **kwargs):
     """Map data fields and data features when the data import gets created."""
     if created:
-        datafields = []
-        datafeatures = []
-
-        fields = []
-        features = []
-        errors = []
-
-        if instance.dataformat == FORMAT.KML:
-            driver = ogr.GetDriverByName('KML')
-            reader = driver.Open(instance.file.path)
+        if not instance.checksum:
+            instance.checksum = get_checksum(instance.file.path)
 
-            for layer in reader:
-                for feature in layer:
-                    test = json.loads(feature.ExportToJson())
-                    test['properties'] = table_to_json(test['properties']['Description'])[0]
-                    features.append(test)
-        else:
-            csv.field_size_limit(sys.maxsize)
-            file_obj = open(instance.file.path, 'rU')
-
-        if instance.dataformat == FORMAT.GeoJSON:
-            reader = json.load(file_obj)
-            features = reader['features']
-
-        if instance.dataformat == FORMAT.CSV:
-            import_from_csv(features=features, fields=fields, file_obj=file_obj)
+        # Identical file parsed already, clone its results instead
+        source = find_parsed(instance)
+        if source:
+            # Partition is created in a transaction of its own, so the table
+            # of data features is only locked briefly
+            create_partition(instance.id)
 
-        for feature in features:
-            geometries = {}
+            try:
+                with transaction.atomic():
+                    instance.feature_count = clone_parsed(source, instance)
+                    instance.parser_version = PARSER_VERSION
+                    DataImport.objects.filter(pk=instance.pk).update(
+                        feature_count=instance.feature_count,
+                        checksum=instance.checksum,
+                        parser_version=instance.parser_version
+                    )
+            except Exception:
+                drop_partition(instance.id)
+                raise
+            return
 
-            for key, value in feature['properties'].items():
-                field = None
+        errors = []
 
-                for existing_field in fields:
-                    if existing_field['name'] == key:
-                        field = existing_field
-                        break
+        try:
+            reader = get_reader(instance)
+            fieldnames = reader.get_fieldnames()
+            fieldtypes = reader.get_fieldtypes()
+        except ValueError as error:
+            instance.delete()
+            raise FileParseError('Failed to read file.', [
+                {'messages': [str(error)]}
+            ])
+
+        fields = [
+            {
+                'name': name,
+                'good_types': set(
+                    fieldtypes.get(name, ['TextField', 'LookupField'])
+                ),
+                'bad_types': set([]),
+                'declared': name in fieldtypes
+            }
+            for name in fieldnames
+        ]
+
+        # First pass infers types of fields (and which one holds geometries,
+        # when the file has no geometries of its own)
+        try:
+            for feature in reader.iter_features():
+                has_geometry = False
+
+                types = feature.get('types') or {}
+
+                for key, value in feature['properties'].items():
+                    field = None
+
+                    for existing_field in fields:
+                        if existing_field['name'] == key:
+                            field = existing_field
+                            break
+
+                    if field is None:
+                        fields.append({
+                            'name': key,
+                            'good_types': set(['TextField', 'LookupField']),
+                            'bad_types': set([])
+                        })
+                        field = fields[-1]
+
+                    # Types declared by a schema are not inferred
+                    if field.get('declared'):
+                        continue
+
+                    fieldtype = None
+                    # Types known from the file are not inferred from values
+                    known_types = types.get(key)
+
+                    if 'geometry' not in feature:
+                        fieldtype = 'GeometryField'
+                        if known_types is None and \
+                                parse_wkt(value) is not None:
+                            if fieldtype not in field['bad_types']:
+                                field['good_types'].add(fieldtype)
+                                has_geometry = True
+                        else:
+                            field['good_types'].discard(fieldtype)
+                            field['bad_types'].add(fieldtype)
+                            fieldtype = None
+
+                    if fieldtype is None:
+                        fieldtype = 'NumericField'
+                        if known_types is not None:
+                            is_numeric = fieldtype in known_types
+                            is_date = 'DateField' in known_types
+                            is_time = 'TimeField' in known_types
+                        else:
+                            is_numeric = type_helpers.is_numeric(value)
+                            is_date = type_helpers.is_date(value)
+                            is_time = type_helpers.is_time(value)
+
+                        if is_numeric:
+                            if fieldtype not in field['bad_types']:
+                                field['good_types'].add(fieldtype)
+                        else:
+                            field['good_types'].discard(fieldtype)
+                            field['bad_types'].add(fieldtype)
 
-                if field is None:
-                    fields.append({
-                        'name': key,
-                        'good_types': set(['TextField', 'LookupField']),
-                        'bad_types': set([])
-                    })
-                    field = fields[-1]
-
-                fieldtype = None
-
-                if 'geometry' not in feature:
-                    try:
-                        geometry = ogr.CreateGeometryFromWkt(str(value))
-                        geometry = geometry.ExportToJson()
-                    except:
-                        geometry = None
-
-                    fieldtype = 'GeometryField'
-                    if geometry is not None:
-                        if fieldtype not in field['bad_types']:
-                            field['good_types'].add(fieldtype)
-                            geometries[field['name']] = json.loads(geometry)
-                    else:
-                        field['good_types'].discard(fieldtype)
-                        field['bad_types'].add(fieldtype)
-                        fieldtype = None
-
-                if fieldtype is None:
-                    fieldtype = 'NumericField'
-                    if type_helpers.is_numeric(value):
-                        if fieldtype not in field['bad_types']:
-                            field['good_types'].add(fieldtype)
-                    else:
-                        field['good_types'].discard(fieldtype)
-                        field['bad_types'].add(fieldtype)
-
-                    fieldtypes = ['DateField', 'DateTimeField']
-                    if type_helpers.is_date(value):
-                        for fieldtype in fieldtypes:
+                        date_types = ['DateField', 'DateTimeField']
+                        if is_date:
+                            for fieldtype in date_types:
+                                if fieldtype not in field['bad_types']:
+                                    field['good_types'].add(fieldtype)
+                        else:
+                            for fieldtype in date_types:
+                                field['good_types'].discard(fieldtype)
+                                field['bad_types'].add(fieldtype)
+
+                        fieldtype = 'TimeField'
+                        if is_time:
                             if fieldtype not in field['bad_types']:
                                 field['good_types'].add(fieldtype)
-                    else:
-                        for fieldtype in fieldtypes:
+                        else:
                             field['good_types'].discard(fieldtype)
                             field['bad_types'].add(fieldtype)
 
-                    fieldtype = 'TimeField'
-                    if type_helpers.is_time(value):
-                        if fieldtype not in field['bad_types']:
-                            field['good_types'].add(fieldtype)
-                    else:
-                        field['good_types'].discard(fieldtype)
-                        field['bad_types'].add(fieldtype)
-
-            if 'geometry' not in feature and len(geometries) == 0:
-                errors.append({
-                    'line': feature['line'],
-                    'messages': ['The entry has no geometry set.']
-                })
-            else:
-                feature['geometries'] = geometries
+                if 'geometry' not in feature and not has_geometry:
+                    errors.append({
+                        'line': feature['line'],
+                        'messages': ['The entry has no geometry set.']
+                    })
+        except ValueError as error:
+            errors.append({'messages': [str(error)]})
+            reader = None  # File cannot be read again
 
+        datafields = []
         geometryfield = None
         for field in fields:
             if 'GeometryField' not in field['good_types']:
@@ -188,44 +254,179 @@ def post_save_dataimport(sender, instance, created, **kwargs):
             elif geometryfield is None:
                 geometryfield = field['name']
 
-        for feature in features:
-            geometry = None
-            if 'geometry' in feature:
-                geometry = feature['geometry']
-            elif 'geometries' in feature:
-                if not geometryfield:
-                    errors.append({
-                        'line': feature['line'],
-                        'messages': ['The file has no valid geometry field.']
-                    })
-                else:
-                    geometries = feature['geometries']
-                    if geometryfield in geometries:
-                        geometry = geometries[geometryfield]
-
-            if geometry:
-                datafeatures.append({
-                    'geometry': geometry,
-                    'properties': feature['properties']
-                })
+        # Coordinates are WGS84, unless the file or the uploader sets else
+        transformation = None
+        if reader:
+            try:
+                transformation = get_transformation(
+                    reader.srid or instance.srid
+                )
+            except ValueError as error:
+                errors.append({'messages': [str(error)]})
+
+        # Partition is created in a transaction of its own, so the table of
+        # data features is only locked briefly
+        create_partition(instance.id)
+
+        # Second pass stores data features in batches, nothing gets stored
+        # once the file is known to have errors
+        try:
+            with transaction.atomic():
+                for datafield in datafields:
+                    if datafield['name']:
+                        DataField.objects.create(
+                            name=datafield['name'],
+                            types=list(datafield['types']),
+                            dataimport=instance
+                        )
+
+                feature_count = 0
+                batch = []
+
+                for feature in reader.iter_features() if reader else []:
+                    geometry = None
+                    if 'geometry' in feature:
+                        geometry = feature['geometry']
+                    elif geometryfield:
+                        value = feature['properties'].get(geometryfield)
+                        if value:
+                            geometry = parse_wkt(value)
+                    elif any(
+                        parse_wkt(value) is not None
+                        for value in feature['properties'].values()
+                    ):
+                        errors.append({
+                            'line': feature['line'],
+                            'messages': [
+                                'The file has no valid geometry field.'
+                            ]
+                        })
+
+                    if geometry and not errors:
+                        batch.append({
+                            'line': feature['line'],
+                            'geometry': geometry,
+                            'properties': feature['properties']
+                        })
+
+                    if len(batch) >= BATCH_SIZE:
+                        feature_count += store_datafeatures(
+                            instance,
+                            batch,
+                            transformation
+                        )
+                        batch = []
+
+                if errors:
+                    raise FileParseError('Failed to read file.', errors)
+
+                feature_count += store_datafeatures(
+                    instance,
+                    batch,
+                    transformation
+                )
 
-        if errors:
-            instance.delete()
-            raise FileParseError('Failed to read file.', errors)
-        else:
-            for datafield in datafields:
-                if datafield['name']:
-                    DataField.objects.create(
-                        name=datafield['name'],
-                        types=list(datafield['types']),
-                        dataimport=instance
-                    )
-            for datafeature in datafeatures:
-                DataFeature.objects.create(
-                    geometry=json.dumps(datafeature['geometry']),
-                    properties=datafeature['properties'],
-                    dataimport=instance
+                instance.feature_count = feature_count
+                instance.parser_version = PARSER_VERSION
+                DataImport.objects.filter(pk=instance.pk).update(
+                    feature_count=instance.feature_count,
+                    checksum=instance.checksum,
+                    parser_version=instance.parser_version
                 )
+        except FileParseError:
+            drop_partition(instance.id)
+            instance.delete()
+            raise
+        except Exception:
+            drop_partition(instance.id)
+            raise
+
+
+def parse_wkt(value):
+    """
+    Parse a WKT formatted geometry.
+
+    Parameters
+    ----------
+    value : str
+        The geometry as WKT.
+
+    Returns
+    -------
+    dict
+        The geometry as GeoJSON, `None` when the value is not WKT.
+    """
+    try:
+        return json.loads(
+            ogr.CreateGeometryFromWkt(str(value)).ExportToJson()
+        )
+    except Exception:
+        return None
+
+
+def store_datafeatures(dataimport, datafeatures, transformation=None):
+    """
+    Store a batch of data features, in a single query.
+
+    Points are stored as EWKB built directly from their coordinates, other
+    geometries as GeoJSON.
+
+    Parameters
+    ----------
+    dataimport : geokey_dataimports.models.DataImport
+        The data import the data features belong to.
+    datafeatures : list
+        Data features, as dicts with `line`, `geometry` (GeoJSON) and
+        `properties`.
+    transformation : osgeo.osr.CoordinateTransformation
+        Transformation of geometries to WGS84, `None` when they are WGS84
+        already.
+
+    Returns
+    -------
+    int
+        Number of data features stored.
+
+    Raises
+    ------
+    FileParseError
+        When a geometry cannot be transformed, or its coordinates are not
+        longitudes and latitudes once transformed.
+    """
+    geometries = [datafeature['geometry'] for datafeature in datafeatures]
+
+    if transformation and geometries:
+        try:
+            geometries = transform_geometries(geometries, transformation)
+        except ValueError as error:
+            raise FileParseError('Failed to read file.', [
+                {'messages': [str(error)]}
+            ])
+
+    errors = [
+        {
+            'line': datafeature.get('line'),
+            'messages': [
+                'Coordinates are out of range of longitudes and '
+                'latitudes, the coordinate reference system must be set.'
+            ]
+        }
+        for datafeature, geometry in zip(datafeatures, geometries)
+        if not is_wgs84(geometry)
+    ]
+    if errors:
+        raise FileParseError('Failed to read file.', errors)
+
+    DataFeature.objects.bulk_create([
+        DataFeature(
+            geometry=get_geometry_value(geometry),
+            properties=datafeature['properties'],
+            dataimport=dataimport
+        )
+        for datafeature, geometry in zip(datafeatures, geometries)
+    ])
+
+    return len(datafeatures)
 
 
 class DataField(TimeStampedModel):
@@ -323,30 +524,94 @@ class DataFeature(TimeStampedModel):
     )
 
 
+def delete_dataimports(dataimports):
+    """
+    Delete data imports by setting their status to `deleted`.
+
+    Data imports are updated with a single query, their data features, data
+    fields and files are left for the `purge_dataimports` command.
+
+    Parameters
+    ----------
+    dataimports : django.db.models.Queryset
+        Data imports to delete.
+    """
+    dataimports.update(
+        status=DataImport.STATUS.deleted,
+        status_changed=timezone.now()
+    )
+
+
+@receiver(models.signals.post_init, sender=Project)
+@receiver(models.signals.post_init, sender=Category)
+def post_init_project_or_category(sender, instance, **kwargs):
+    """Remember the status, so its change can be detected when saved."""
+    # Deferred status is not loaded, it is then never considered changed
+    instance._dataimports_status = instance.__dict__.get('status')
+
+
+class DataUpload(TimeStampedModel):
+    """Store a single upload of a data import file, sent in chunks."""
+
+    token = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    name = models.CharField(max_length=100)
+    description = models.TextField(null=True, blank=True)
+    filename = models.CharField(max_length=255)
+    size = models.BigIntegerField()
+    offset = models.BigIntegerField(default=0)
+    srid = models.PositiveIntegerField(null=True, blank=True)
+    sheet = models.CharField(max_length=100, null=True, blank=True)
+
+    project = models.ForeignKey(
+        'projects.Project',
+        related_name='dataimport_uploads'
+    )
+    category = models.ForeignKey(
+        'categories.Category',
+        null=True,
+        blank=True
+    )
+    creator = models.ForeignKey(settings.AUTH_USER_MODEL)
+
+    def get_path(self):
+        """
+        Get path of the file being assembled.
+
+        Returns
+        -------
+        str
+            Path of the file, within `dataimports/files` of the media root.
+        """
+        return os.path.join(
+            settings.MEDIA_ROOT,
+            'dataimports',
+            'files',
+            '%s.part' % self.token
+        )
+
+
+@receiver(models.signals.post_delete, sender=DataUpload)
+def post_delete_dataupload(sender, instance, **kwargs):
+    """Remove the file being assembled when the upload gets deleted."""
+    try:
+        os.remove(instance.get_path())
+    except OSError:
+        pass  # Nothing uploaded yet, or moved to the data import
+
+
 @receiver(models.signals.post_save, sender=Project)
 def post_save_project(sender, instance, **kwargs):
     """Remove associated data imports when the project gets deleted."""
-    if instance.status == 'deleted':
-        DataImport.objects.filter(project=instance).delete()
+    if instance.status == 'deleted' and \
+            getattr(instance, '_dataimports_status', None) != 'deleted':
+        delete_dataimports(DataImport.objects.filter(project=instance))
+    instance._dataimports_status = instance.status
 
 
 @receiver(models.signals.post_save, sender=Category)
 def post_save_category(sender, instance, **kwargs):
     """Remove associated data imports when the category gets deleted."""
-    if instance.status == 'deleted':
-        DataImport.objects.filter(category=instance).delete()
-
-
-def table_to_json(table):
-    fields = []
-    table_data = []
-    model = BeautifulSoup(table, features="html.parser")
-    datum = {}
-    ta = model.find_all('table')[0]
-    for i, tr in enumerate(ta.find_all('tr', recursive=False)):
-        fields.append((tr.find_all('td')[0]).text)
-        datum[fields[i]] = (tr.find_all('td')[1]).text
-    if datum:
-        table_data.append(datum)
-
-    return(table_data)
+    if instance.status == 'deleted' and \
+            getattr(instance, '_dataimports_status', None) != 'deleted':
+        delete_dataimports(DataImport.objects.filter(category=instance))
+    instance._dataimports_status = instance.status
@@ -10,7 +10,7 @@ from geokey.categories.tests.model_factories import CategoryFactory
 
 from .helpers import file_helpers
 from ..base import STATUS
-from ..models import DataImport, DataField, DataFeature
+from ..models import DataImport, DataField, DataFeature, DataUpload
 
 
 class DataImportFactory(factory.django.DjangoModelFactory):
@@ -59,3 +59,21 @@ class DataFeatureFactory(factory.django.DjangoModelFactory):
         """Model factory meta."""
 
         model = DataFeature
+
+
+class DataUploadFactory(factory.django.DjangoModelFactory):
+    """Fake a single data upload."""
+
+    name = factory.Sequence(lambda n: 'Data import %s' % n)
+    description = factory.LazyAttribute(lambda o: '%s description.' % o.name)
+    filename = 'test_csv.csv'
+    size = 100
+
+    project = factory.SubFactory(ProjectFactory)
+    category = None
+    creator = factory.SubFactory(UserFactory)
+
+    class Meta:
+        """Model factory meta."""
+
+        model = DataUpload
@@ -0,0 +1,325 @@
+"""All tests for management commands."""
+
+import os
+import sys
+
+from datetime import timedelta
+from multiprocessing import Pool
+from unittest import skipUnless
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connections
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+from django.utils.six import StringIO
+
+from geokey.users.tests.model_factories import UserFactory
+from geokey.projects.tests.model_factories import ProjectFactory
+from geokey.categories.tests.model_factories import (
+    CategoryFactory,
+    TextFieldFactory
+)
+from geokey.contributions.models import Observation
+
+from .model_factories import DataImportFactory
+from ..models import DataImport, DataField, DataFeature
+from ..helpers.import_helpers import close_connections, import_id_range
+
+
+def create_datafeatures(dataimport, count):
+    """Create data features of a data import, in a single query."""
+    DataFeature.objects.bulk_create([
+        DataFeature(
+            geometry='POINT(-0.134040713310241 51.52447878755655)',
+            properties={'Name': 'Feature %s' % index},
+            dataimport=dataimport
+        )
+        for index in range(count)
+    ])
+
+
+class ImportDataFeaturesCommandTest(TestCase):
+    """Test import_datafeatures command."""
+
+    def setUp(self):
+        """Set up test."""
+        self.admin = UserFactory.create()
+        self.project = ProjectFactory.create(add_admins=[self.admin])
+        self.category = CategoryFactory.create(project=self.project)
+        self.dataimport = DataImportFactory.create(
+            keys=['Name'],
+            project=self.project,
+            category=self.category
+        )
+        TextFieldFactory.create(key='Name', category=self.category)
+
+    def tearDown(self):
+        """Tear down test."""
+        for dataimport in DataImport.objects.all():
+            if dataimport.file:
+                dataimport.file.delete()
+
+    def test_command(self):
+        """Test command."""
+        out = StringIO()
+        call_command(
+            'import_datafeatures',
+            self.dataimport.id,
+            user=self.admin.email,
+            stdout=out
+        )
+
+        self.assertIn('3 contribution(s) imported', out.getvalue())
+        self.assertEqual(DataFeature.objects.filter(imported=True).count(), 3)
+        self.assertEqual(Observation.objects.count(), 3)
+
+    def test_command_when_no_dataimport(self):
+        """Test command when data import does not exist."""
+        with self.assertRaises(CommandError):
+            call_command(
+                'import_datafeatures',
+                self.dataimport.id + 123,
+                user=self.admin.email
+            )
+
+    def test_command_when_no_fields(self):
+        """Test command when data import has no fields assigned."""
+        self.dataimport.keys = None
+        self.dataimport.save()
+
+        with self.assertRaises(CommandError):
+            call_command(
+                'import_datafeatures',
+                self.dataimport.id,
+                user=self.admin.email
+            )
+        self.assertEqual(Observation.objects.count(), 0)
+
+
+class ImportDataFeaturesInParallelTest(TransactionTestCase):
+    """Test data features imported by several worker processes."""
+
+    def setUp(self):
+        """Set up test."""
+        self.admin = UserFactory.create()
+        self.project = ProjectFactory.create(add_admins=[self.admin])
+        self.category = CategoryFactory.create(project=self.project)
+        self.dataimport = DataImportFactory.create(
+            keys=['Name'],
+            project=self.project,
+            category=self.category
+        )
+        TextFieldFactory.create(key='Name', category=self.category)
+        create_datafeatures(self.dataimport, 37)
+
+    def tearDown(self):
+        """Tear down test."""
+        for dataimport in DataImport._base_manager.all():
+            if dataimport.file:
+                dataimport.file.delete()
+
+    def assert_imported_once(self):
+        """Assert every data feature is imported exactly once."""
+        self.assertEqual(Observation.objects.count(), 40)
+        self.assertFalse(
+            self.dataimport.datafeatures.filter(imported=False).exists()
+        )
+        self.assertEqual(
+            DataImport.objects.get(pk=self.dataimport.id).imported_count,
+            40
+        )
+
+    def test_command_with_workers(self):
+        """Test command with a pool of workers."""
+        out = StringIO()
+        call_command(
+            'import_datafeatures',
+            self.dataimport.id,
+            user=self.admin.email,
+            workers=4,
+            batch_size=3,
+            stdout=out
+        )
+
+        self.assertIn('40 contribution(s) imported', out.getvalue())
+        self.assert_imported_once()
+
+    def test_workers_with_same_range(self):
+        """Test workers competing for the same data features."""
+        ids = self.dataimport.datafeatures.values_list('id', flat=True)
+        task = (self.dataimport.id, self.admin.id, min(ids), max(ids), 2)
+
+        connections.close_all()
+        pool = Pool(4, initializer=close_connections)
+        try:
+            imported = pool.map(import_id_range, [task] * 4)
+        finally:
+            pool.close()
+            pool.join()
+
+        self.assertEqual(sum(imported), 40)
+        self.assert_imported_once()
+
+
+@skipUnless(
+    os.environ.get('BENCHMARK_IMPORT'),
+    'BENCHMARK_IMPORT is not set to a number of data features'
+)
+class ImportDataFeaturesBenchmark(TransactionTestCase):
+    """Benchmark importing data features with more and more workers."""
+
+    def setUp(self):
+        """Set up benchmark."""
+        self.admin = UserFactory.create()
+        self.project = ProjectFactory.create(add_admins=[self.admin])
+        self.count = int(os.environ['BENCHMARK_IMPORT'])
+
+    def tearDown(self):
+        """Tear down benchmark."""
+        for dataimport in DataImport._base_manager.all():
+            if dataimport.file:
+                dataimport.file.delete()
+
+    def test_scaling(self):
+        """Report throughput of each number of workers."""
+        sys.stderr.write('\n')
+
+        for workers in (1, 2, 4, 8):
+            category = CategoryFactory.create(project=self.project)
+            TextFieldFactory.create(key='Name', category=category)
+            dataimport = DataImportFactory.create(
+                keys=['Name'],
+                project=self.project,
+                category=category
+            )
+            create_datafeatures(dataimport, self.count)
+
+            out = StringIO()
+            call_command(
+                'import_datafeatures',
+                dataimport.id,
+                user=self.admin.email,
+                workers=workers,
+                stdout=out
+            )
+            sys.stderr.write(out.getvalue())
+
+            self.assertFalse(
+                dataimport.datafeatures.filter(imported=False).exists()
+            )
+            self.assertEqual(
+                Observation.objects.filter(category=category).count(),
+                self.count + 3
+            )
+
+
+class PartitionDataFeaturesCommandTest(TestCase):
+    """Test partition_datafeatures command."""
+
+    def setUp(self):
+        """Set up test."""
+        self.dataimport = DataImportFactory.create()
+
+    def tearDown(self):
+        """Tear down test."""
+        for dataimport in DataImport.objects.all():
+            if dataimport.file:
+                dataimport.file.delete()
+
+    def test_command(self):
+        """Test command."""
+        out = StringIO()
+        call_command('partition_datafeatures', stdout=out)
+
+        self.assertIn('1 partition(s)', out.getvalue())
+        self.assertEqual(self.dataimport.datafeatures.count(), 3)
+
+    def test_command_when_partitioned(self):
+        """Test command when data features are partitioned already."""
+        call_command('partition_datafeatures', stdout=StringIO())
+
+        self.assertRaises(
+            CommandError,
+            call_command,
+            'partition_datafeatures',
+            stdout=StringIO()
+        )
+
+
+class PurgeDataImportsCommandTest(TestCase):
+    """Test purge_dataimports command."""
+
+    def setUp(self):
+        """Set up test."""
+        self.active = DataImportFactory.create()
+        self.deleted_recently = DataImportFactory.create()
+        self.deleted_recently.delete()
+        self.deleted = DataImportFactory.create()
+        self.deleted.delete()
+        DataImport._base_manager.filter(pk=self.deleted.id).update(
+            status_changed=timezone.now() - timedelta(days=31)
+        )
+
+    def tearDown(self):
+        """Tear down test."""
+        for dataimport in DataImport._base_manager.all():
+            if dataimport.file:
+                dataimport.file.delete()
+
+    def test_command(self):
+        """Test command."""
+        path = self.deleted.file.path
+        size = self.deleted.file.size
+        rows = 3 + self.deleted.datafields.count() + 1
+
+        out = StringIO()
+        call_command('purge_dataimports', '--batch-size', '2', stdout=out)
+
+        self.assertIn(
+            '1 data import(s) purged, %s row(s) and %s byte(s) reclaimed.' % (
+                rows,
+                size
+            ),
+            out.getvalue()
+        )
+        self.assertFalse(
+            DataImport._base_manager.filter(pk=self.deleted.id).exists()
+        )
+        self.assertFalse(
+            DataFeature.objects.filter(dataimport_id=self.deleted.id).exists()
+        )
+        self.assertFalse(
+            DataField.objects.filter(dataimport_id=self.deleted.id).exists()
+        )
+        self.assertFalse(os.path.isfile(path))
+
+        self.assertEqual(self.active.datafeatures.count(), 3)
+        self.assertEqual(self.deleted_recently.datafeatures.count(), 3)
+
+    def test_command_with_days(self):
+        """Test command with a shorter retention period."""
+        out = StringIO()
+        call_command('purge_dataimports', '--days', '0', stdout=out)
+
+        self.assertIn('2 data import(s) purged', out.getvalue())
+        self.assertEqual(DataImport._base_manager.count(), 1)
+
+    def test_command_with_wrong_input(self):
+        """Test command with wrong input."""
+        self.assertRaises(
+            CommandError,
+            call_command,
+            'purge_dataimports',
+            '--days',
+            '-1',
+            stdout=StringIO()
+        )
+        self.assertRaises(
+            CommandError,
+            call_command,
+            'purge_dataimports',
+            '--batch-size',
+            '0',
+            stdout=StringIO()
+        )
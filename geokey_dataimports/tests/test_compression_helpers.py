@@ -0,0 +1,151 @@
+"""All tests for compression helpers."""
+
+import os
+import gzip
+import shutil
+import zipfile
+import tempfile
+
+from io import BytesIO
+
+from django.test import TestCase
+
+from ..base import FORMAT
+from ..helpers.compression_helpers import (
+    GZIP,
+    ZIP,
+    get_compression,
+    get_dataformat_by_name,
+    find_member,
+    get_compressed_dataformat,
+    get_ogr_path,
+    open_file
+)
+
+
+CONTENT = b'Geometry,Name\n"POINT (30 10)",Meat\n'
+
+
+class CompressionHelpersTest(TestCase):
+    """Test compression helpers."""
+
+    def setUp(self):
+        """Set up test."""
+        self.directory = tempfile.mkdtemp()
+
+        self.plain_path = os.path.join(self.directory, 'data.csv')
+        with open(self.plain_path, 'wb') as file_obj:
+            file_obj.write(CONTENT)
+
+        self.gzip_path = os.path.join(self.directory, 'data.csv.gz')
+        with gzip.open(self.gzip_path, 'wb') as file_obj:
+            file_obj.write(CONTENT)
+
+        self.zip_path = os.path.join(self.directory, 'data.kmz')
+        with zipfile.ZipFile(self.zip_path, 'w') as archive:
+            archive.writestr('images/', '')
+            archive.writestr('doc.kml', '<kml></kml>')
+
+        self.unsupported_path = os.path.join(self.directory, 'images.zip')
+        with zipfile.ZipFile(self.unsupported_path, 'w') as archive:
+            archive.writestr('image.png', '')
+
+    def tearDown(self):
+        """Tear down test."""
+        shutil.rmtree(self.directory)
+
+    def test_get_compression(self):
+        """Test get_compression method."""
+        with open(self.plain_path, 'rb') as file_obj:
+            self.assertIsNone(get_compression(file_obj))
+        with open(self.gzip_path, 'rb') as file_obj:
+            self.assertEqual(get_compression(file_obj), GZIP)
+            self.assertEqual(file_obj.tell(), 0)
+        with open(self.zip_path, 'rb') as file_obj:
+            self.assertEqual(get_compression(file_obj), ZIP)
+
+    def test_get_dataformat_by_name(self):
+        """Test get_dataformat_by_name method."""
+        self.assertEqual(get_dataformat_by_name('a.GeoJSON'), FORMAT.GeoJSON)
+        self.assertEqual(get_dataformat_by_name('a.json'), FORMAT.GeoJSON)
+        self.assertEqual(get_dataformat_by_name('a.kml'), FORMAT.KML)
+        self.assertEqual(get_dataformat_by_name('a.csv'), FORMAT.CSV)
+        self.assertEqual(get_dataformat_by_name('a.gpkg'), FORMAT.GPKG)
+        self.assertEqual(get_dataformat_by_name('a.shp'), FORMAT.SHP)
+        self.assertEqual(
+            get_dataformat_by_name('a.geojsonl'),
+            FORMAT.GeoJSONSeq
+        )
+        self.assertEqual(
+            get_dataformat_by_name('a.ndjson'),
+            FORMAT.GeoJSONSeq
+        )
+        self.assertIsNone(get_dataformat_by_name('a.png'))
+        self.assertIsNone(get_dataformat_by_name(None))
+
+    def test_find_member(self):
+        """Test find_member method."""
+        with zipfile.ZipFile(self.zip_path) as archive:
+            self.assertEqual(find_member(archive), ('doc.kml', FORMAT.KML))
+
+        file_obj = BytesIO()
+        with zipfile.ZipFile(file_obj, 'w') as archive:
+            archive.writestr('image.png', '')
+        with zipfile.ZipFile(file_obj) as archive:
+            self.assertEqual(find_member(archive), (None, None))
+
+    def test_get_compressed_dataformat(self):
+        """Test get_compressed_dataformat method."""
+        with open(self.plain_path, 'rb') as file_obj:
+            self.assertIsNone(get_compressed_dataformat(file_obj, 'data.csv'))
+        with open(self.gzip_path, 'rb') as file_obj:
+            self.assertEqual(
+                get_compressed_dataformat(file_obj, 'data.csv.gz'),
+                FORMAT.CSV
+            )
+        with open(self.zip_path, 'rb') as file_obj:
+            self.assertEqual(
+                get_compressed_dataformat(file_obj, 'data.kmz'),
+                FORMAT.KML
+            )
+            self.assertEqual(file_obj.tell(), 0)
+        with open(self.unsupported_path, 'rb') as file_obj:
+            self.assertIsNone(
+                get_compressed_dataformat(file_obj, 'images.zip')
+            )
+            self.assertEqual(file_obj.tell(), 0)
+
+    def test_get_ogr_path(self):
+        """Test get_ogr_path method."""
+        self.assertEqual(get_ogr_path(self.plain_path), self.plain_path)
+        self.assertEqual(
+            get_ogr_path(self.gzip_path),
+            '/vsigzip/%s' % self.gzip_path
+        )
+        self.assertEqual(
+            get_ogr_path(self.zip_path),
+            '/vsizip/%s/doc.kml' % self.zip_path
+        )
+
+    def test_open_file(self):
+        """Test open_file method."""
+        for path in [self.plain_path, self.gzip_path]:
+            file_obj = open_file(path)
+            self.assertEqual(
+                file_obj.readline().strip(),
+                'Geometry,Name'
+            )
+            file_obj.close()
+
+        file_obj = open_file(self.zip_path)
+        self.assertEqual(file_obj.read(), '<kml></kml>')
+        file_obj.close()
+
+        self.assertRaises(ValueError, open_file, self.unsupported_path)
+
+    def test_open_file_as_binary(self):
+        """Test open_file method opening files as bytes."""
+        for path in [self.plain_path, self.gzip_path]:
+            file_obj = open_file(path, binary=True)
+            self.assertEqual(file_obj.readline(), b'Geometry,Name\n')
+            file_obj.close()
@@ -0,0 +1,127 @@
+"""All tests for CRS helpers."""
+
+from django.test import TestCase
+
+from osgeo import ogr
+
+from ..helpers.crs_helpers import (
+    WGS84,
+    get_spatial_reference,
+    get_geojson_srid,
+    get_layer_srid,
+    get_transformation,
+    transform_points,
+    transform_geometries
+)
+
+
+class GetSpatialReferenceTest(TestCase):
+    """Test get_spatial_reference method."""
+
+    def test_method(self):
+        """Test method."""
+        reference = get_spatial_reference(27700)
+        self.assertEqual(reference.GetAuthorityCode(None), '27700')
+        self.assertRaises(ValueError, get_spatial_reference, 999999)
+        self.assertRaises(ValueError, get_spatial_reference, 'abc')
+
+
+class GetGeoJSONSridTest(TestCase):
+    """Test get_geojson_srid method."""
+
+    def test_method(self):
+        """Test method."""
+        self.assertIsNone(get_geojson_srid({'type': 'FeatureCollection'}))
+        self.assertEqual(
+            get_geojson_srid({
+                'crs': {
+                    'type': 'name',
+                    'properties': {'name': 'urn:ogc:def:crs:EPSG::27700'}
+                }
+            }),
+            27700
+        )
+        self.assertEqual(
+            get_geojson_srid({
+                'crs': {
+                    'type': 'name',
+                    'properties': {'name': 'urn:ogc:def:crs:OGC:1.3:CRS84'}
+                }
+            }),
+            WGS84
+        )
+        self.assertEqual(
+            get_geojson_srid({
+                'crs': {'type': 'EPSG', 'properties': {'code': 3857}}
+            }),
+            3857
+        )
+        self.assertRaises(
+            ValueError,
+            get_geojson_srid,
+            {'crs': {'type': 'name', 'properties': {'name': 'Unknown'}}}
+        )
+
+
+class GetLayerSridTest(TestCase):
+    """Test get_layer_srid method."""
+
+    def test_method(self):
+        """Test method."""
+        source = ogr.GetDriverByName('Memory').CreateDataSource('test')
+
+        layer = source.CreateLayer('grid', get_spatial_reference(27700))
+        self.assertEqual(get_layer_srid(layer), 27700)
+
+        layer = source.CreateLayer('none')
+        self.assertIsNone(get_layer_srid(layer))
+
+
+class TransformGeometriesTest(TestCase):
+    """Test get_transformation and transform_geometries methods."""
+
+    def test_get_transformation(self):
+        """Test get_transformation method."""
+        self.assertIsNone(get_transformation(None))
+        self.assertIsNone(get_transformation(WGS84))
+        self.assertIsNotNone(get_transformation(27700))
+        self.assertRaises(ValueError, get_transformation, 999999)
+
+    def test_transform_points(self):
+        """Test transform_points method."""
+        points = transform_points(
+            [[530000, 180000], [530000, 180000, 10]],
+            get_transformation(27700)
+        )
+
+        self.assertEqual(len(points[0]), 2)
+        self.assertEqual(len(points[1]), 3)
+        self.assertAlmostEqual(points[0][0], -0.13, places=1)
+        self.assertAlmostEqual(points[0][1], 51.50, places=1)
+        self.assertEqual(transform_points([], get_transformation(27700)), [])
+
+    def test_transform_geometries(self):
+        """Test transform_geometries method."""
+        geometries = transform_geometries(
+            [
+                {'type': 'Point', 'coordinates': [530000, 180000]},
+                {
+                    'type': 'LineString',
+                    'coordinates': [[530000, 180000], [531000, 181000]]
+                }
+            ],
+            get_transformation(27700)
+        )
+
+        # Central London, longitude first
+        longitude, latitude = geometries[0]['coordinates'][:2]
+        self.assertAlmostEqual(longitude, -0.13, places=1)
+        self.assertAlmostEqual(latitude, 51.50, places=1)
+        self.assertEqual(geometries[1]['type'], 'LineString')
+
+        self.assertRaises(
+            ValueError,
+            transform_geometries,
+            [{'type': 'Unknown'}],
+            get_transformation(27700)
+        )
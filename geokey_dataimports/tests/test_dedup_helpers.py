@@ -0,0 +1,96 @@
+"""All tests for dedup helpers."""
+
+from django.test import TestCase
+
+from .model_factories import DataImportFactory
+from ..base import STATUS, PARSER_VERSION
+from ..models import DataImport
+from ..helpers.dedup_helpers import find_parsed, clone_parsed
+
+
+class DedupHelpersTest(TestCase):
+    """Test dedup helpers."""
+
+    def setUp(self):
+        """Set up test."""
+        self.source = DataImportFactory.create()
+
+    def tearDown(self):
+        """Tear down test."""
+        for dataimport in DataImport._base_manager.all():
+            if dataimport.file:
+                dataimport.file.delete()
+
+    def get_features(self, dataimport):
+        """Get geometries and properties of data features."""
+        return [
+            (datafeature.geometry.wkt, datafeature.properties)
+            for datafeature in dataimport.datafeatures.order_by('id')
+        ]
+
+    def test_parsed(self):
+        """Test data import parsed is reused for an identical file."""
+        self.assertEqual(len(self.source.checksum), 64)
+        self.assertEqual(self.source.parser_version, PARSER_VERSION)
+
+        dataimport = DataImportFactory.create()
+
+        self.assertEqual(dataimport.checksum, self.source.checksum)
+        self.assertEqual(dataimport.parser_version, PARSER_VERSION)
+        self.assertEqual(dataimport.feature_count, 3)
+        self.assertEqual(
+            self.get_features(dataimport),
+            self.get_features(self.source)
+        )
+        self.assertEqual(
+            list(dataimport.datafields.order_by('id').values_list(
+                'name',
+                'types'
+            )),
+            list(self.source.datafields.order_by('id').values_list(
+                'name',
+                'types'
+            ))
+        )
+
+    def test_find_parsed(self):
+        """Test find_parsed method."""
+        dataimport = DataImportFactory.create()
+        self.assertEqual(find_parsed(dataimport), self.source)
+
+        # Coordinate reference system set by the uploader changes geometries
+        dataimport.srid = 27700
+        self.assertIsNone(find_parsed(dataimport))
+        dataimport.srid = None
+
+        # Data features of deleted data imports are about to be purged
+        DataImport._base_manager.filter(pk=self.source.id).update(
+            status=STATUS.deleted
+        )
+        self.assertIsNone(find_parsed(dataimport))
+        DataImport._base_manager.filter(pk=self.source.id).update(
+            status=STATUS.active
+        )
+        self.assertEqual(find_parsed(dataimport), self.source)
+
+        # Data fields converted rename properties of data features
+        self.source.datafields.update(key='converted')
+        self.assertIsNone(find_parsed(dataimport))
+
+        DataImport.objects.filter(pk=dataimport.id).update(parser_version=0)
+        self.assertEqual(find_parsed(self.source), None)
+
+        dataimport.checksum = None
+        self.assertIsNone(find_parsed(dataimport))
+
+    def test_clone_parsed(self):
+        """Test clone_parsed method."""
+        dataimport = DataImportFactory.create()
+        dataimport.datafeatures.update(imported=True)
+
+        self.assertEqual(clone_parsed(dataimport, self.source), 3)
+        self.assertEqual(self.source.datafeatures.count(), 6)
+        self.assertEqual(
+            self.source.datafeatures.filter(imported=False).count(),
+            6
+        )
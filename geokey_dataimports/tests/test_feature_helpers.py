@@ -0,0 +1,256 @@
+"""All tests for feature helpers."""
+
+import json
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from .model_factories import DataImportFactory
+from ..models import DataImport
+from ..helpers.feature_helpers import (
+    DEFAULT_LIMIT,
+    MAX_LIMIT,
+    CACHE_MAX_SIZE,
+    parse_bbox,
+    snap_bbox,
+    parse_limit,
+    parse_zoom,
+    parse_where,
+    filter_by_where,
+    get_where_key,
+    get_tolerance,
+    iter_feature_collection,
+    get_clusters,
+    get_cache_key,
+    iter_cached
+)
+
+
+class ParseBboxTest(TestCase):
+    """Test parse_bbox method."""
+
+    def test_method(self):
+        """Test method."""
+        bbox = parse_bbox('-1.5,50,0.5,52')
+
+        self.assertEqual(bbox.extent, (-1.5, 50, 0.5, 52))
+        self.assertEqual(bbox.srid, 4326)
+
+    def test_snap_bbox(self):
+        """Test snap_bbox method."""
+        bbox = snap_bbox(parse_bbox('-1.5,50,0.5,52'), 3)
+
+        self.assertEqual(bbox.extent, (-45, 45, 45, 90))
+        self.assertEqual(bbox.srid, 4326)
+        self.assertEqual(
+            snap_bbox(parse_bbox('-180,-90,180,90'), 0).extent,
+            (-180, -90, 180, 90)
+        )
+
+    def test_method_with_empty_input(self):
+        """Test with empty input."""
+        self.assertIsNone(parse_bbox(None))
+        self.assertIsNone(parse_bbox(''))
+
+    def test_method_with_wrong_input(self):
+        """Test with wrong input."""
+        self.assertRaises(ValueError, parse_bbox, '1,2,3')
+        self.assertRaises(ValueError, parse_bbox, '1,2,a,4')
+        self.assertRaises(ValueError, parse_bbox, '3,2,1,4')
+
+
+class ParseLimitTest(TestCase):
+    """Test parse_limit method."""
+
+    def test_method(self):
+        """Test method."""
+        self.assertEqual(parse_limit(None), DEFAULT_LIMIT)
+        self.assertEqual(parse_limit('10'), 10)
+        self.assertEqual(parse_limit(str(MAX_LIMIT + 1)), MAX_LIMIT)
+
+    def test_method_with_wrong_input(self):
+        """Test with wrong input."""
+        self.assertRaises(ValueError, parse_limit, '0')
+        self.assertRaises(ValueError, parse_limit, 'ten')
+
+
+class ParseZoomTest(TestCase):
+    """Test parse_zoom method."""
+
+    def test_method(self):
+        """Test method."""
+        self.assertIsNone(parse_zoom())
+        self.assertEqual(parse_zoom('5'), 5)
+        self.assertEqual(parse_zoom('99'), 22)
+        self.assertEqual(parse_zoom(tolerance=str(get_tolerance(7))), 7)
+        self.assertEqual(
+            parse_zoom(tolerance=str(get_tolerance(7) * 1.2)),
+            7
+        )
+
+    def test_method_with_wrong_input(self):
+        """Test with wrong input."""
+        self.assertRaises(ValueError, parse_zoom, 'a')
+        self.assertRaises(ValueError, parse_zoom, None, '0')
+
+
+class ParseWhereTest(TestCase):
+    """Test parse_where method."""
+
+    def test_method(self):
+        """Test method."""
+        self.assertEqual(
+            parse_where('{"status": "active", "count": {"gte": 10}}'),
+            {'status': {'eq': 'active'}, 'count': {'gte': 10}}
+        )
+        self.assertEqual(
+            parse_where({'status': {'exists': False}}),
+            {'status': {'exists': False}}
+        )
+
+    def test_method_with_empty_input(self):
+        """Test with empty input."""
+        self.assertIsNone(parse_where(None))
+        self.assertIsNone(parse_where(''))
+
+    def test_method_with_wrong_input(self):
+        """Test with wrong input."""
+        self.assertRaises(ValueError, parse_where, '{')
+        self.assertRaises(ValueError, parse_where, '[]')
+        self.assertRaises(ValueError, parse_where, '{"a": {}}')
+        self.assertRaises(ValueError, parse_where, '{"a": {"like": "b"}}')
+        self.assertRaises(ValueError, parse_where, '{"a": {"exists": 1}}')
+        self.assertRaises(ValueError, parse_where, '{"a": {"gt": null}}')
+        self.assertRaises(ValueError, parse_where, '{"a": {"lt": [1]}}')
+
+
+class DataFeaturesTest(TestCase):
+    """Test serialising and clustering data features."""
+
+    def setUp(self):
+        """Set up test."""
+        self.dataimport = DataImportFactory.create()
+
+    def tearDown(self):
+        """Tear down test."""
+        for dataimport in DataImport.objects.all():
+            if dataimport.file:
+                dataimport.file.delete()
+
+    def test_iter_feature_collection(self):
+        """Test iter_feature_collection method."""
+        datafeatures = self.dataimport.datafeatures.order_by('id')
+        collection = json.loads(
+            ''.join(iter_feature_collection(datafeatures, 2))
+        )
+
+        self.assertEqual(len(collection['features']), 2)
+        self.assertEqual(
+            collection['next'],
+            collection['features'][-1]['id']
+        )
+        self.assertEqual(
+            collection['features'][0]['geometry']['type'],
+            'Point'
+        )
+
+    def test_iter_feature_collection_when_simplifying(self):
+        """Test iter_feature_collection method when simplifying."""
+        datafeatures = self.dataimport.datafeatures.order_by('id')
+        collection = json.loads(
+            ''.join(iter_feature_collection(datafeatures, 10, zoom=0))
+        )
+
+        self.assertEqual(len(collection['features']), 3)
+        self.assertIsNone(collection['next'])
+        types = [
+            feature['geometry']['type']
+            for feature in collection['features']
+        ]
+        self.assertEqual(types, ['Point', 'LineString', 'Polygon'])
+
+    def test_get_clusters(self):
+        """Test get_clusters method."""
+        clusters = get_clusters(self.dataimport, 0)
+
+        self.assertEqual(sum(count for count, x, y in clusters), 3)
+
+        clusters = get_clusters(self.dataimport, 15)
+
+        self.assertEqual(len(clusters), 3)
+        self.assertIn((1, 30, 10), clusters)
+
+    def test_get_clusters_with_where(self):
+        """Test get_clusters method with a filter of properties."""
+        clusters = get_clusters(
+            self.dataimport,
+            15,
+            parse_where('{"Name": "Meat"}')
+        )
+
+        self.assertEqual(clusters, [(1, 30, 10)])
+
+    def test_filter_by_where(self):
+        """Test filter_by_where method."""
+        datafeatures = self.dataimport.datafeatures.all()
+
+        def names(where):
+            return sorted(
+                datafeature.properties['Name']
+                for datafeature in filter_by_where(
+                    datafeatures,
+                    parse_where(where)
+                )
+            )
+
+        self.assertEqual(names('{"Name": "Fish"}'), ['Fish'])
+        self.assertEqual(names('{"Name": {"eq": "Fish"}}'), ['Fish'])
+        self.assertEqual(names('{"ID": {"gte": 2}}'), ['Fish', 'Vegetables'])
+        self.assertEqual(names('{"ID": {"gt": 1, "lt": 3}}'), ['Fish'])
+        self.assertEqual(names('{"Name": {"lt": "N"}}'), ['Fish', 'Meat'])
+        self.assertEqual(names('{"Name": {"exists": true}}'), [
+            'Fish',
+            'Meat',
+            'Vegetables'
+        ])
+        self.assertEqual(names('{"Unknown": {"exists": true}}'), [])
+        self.assertEqual(
+            names('{"Unknown": {"exists": false}, "ID": {"lte": 1}}'),
+            ['Meat']
+        )
+
+    def test_get_where_key(self):
+        """Test get_where_key method."""
+        self.assertIsNone(get_where_key(None))
+        self.assertEqual(
+            get_where_key({'b': {'eq': 1}, 'a': {'eq': 2}}),
+            get_where_key({'a': {'eq': 2}, 'b': {'eq': 1}})
+        )
+
+    def test_get_cache_key(self):
+        """Test get_cache_key method."""
+        key = get_cache_key(self.dataimport, 'simplified', 5)
+
+        self.assertNotEqual(
+            get_cache_key(self.dataimport, 'simplified', 6),
+            key
+        )
+
+        self.dataimport.save()
+        self.assertNotEqual(
+            get_cache_key(self.dataimport, 'simplified', 5),
+            key
+        )
+
+    def test_iter_cached(self):
+        """Test iter_cached method."""
+        key = get_cache_key(self.dataimport, 'simplified', 5)
+        cache.delete(key)
+
+        self.assertEqual(list(iter_cached(key, ['{', '}'])), ['{', '}'])
+        self.assertEqual(cache.get(key), '{}')
+
+        cache.delete(key)
+        parts = ['a' * CACHE_MAX_SIZE, 'a']
+        self.assertEqual(list(iter_cached(key, parts)), parts)
+        self.assertIsNone(cache.get(key))
@@ -0,0 +1,130 @@
+"""All tests for geometry helpers."""
+
+import json
+
+from django.contrib.gis.geos import GEOSGeometry
+from django.test import TestCase
+
+from ..helpers.geometry_helpers import (
+    find_coordinate_fields,
+    parse_coordinate,
+    get_point,
+    iter_positions,
+    is_wgs84,
+    point_to_ewkb,
+    get_geometry_value
+)
+
+
+class FindCoordinateFieldsTest(TestCase):
+    """Test find_coordinate_fields method."""
+
+    def test_method(self):
+        """Test method."""
+        self.assertEqual(
+            find_coordinate_fields(['Name', 'Latitude', 'Longitude']),
+            ('Latitude', 'Longitude')
+        )
+        self.assertEqual(
+            find_coordinate_fields(['lng', 'LAT ', 'X', 'Y']),
+            ('LAT ', 'lng')
+        )
+        self.assertEqual(
+            find_coordinate_fields(['Easting', 'Northing']),
+            ('Northing', 'Easting')
+        )
+        self.assertEqual(
+            find_coordinate_fields(['Lat', 'X']),
+            (None, None)
+        )
+        self.assertEqual(find_coordinate_fields([]), (None, None))
+
+
+class GetPointTest(TestCase):
+    """Test parse_coordinate and get_point methods."""
+
+    def test_parse_coordinate(self):
+        """Test parse_coordinate method."""
+        self.assertEqual(parse_coordinate(' 51.5 '), 51.5)
+        self.assertEqual(parse_coordinate(-1), -1.0)
+        self.assertIsNone(parse_coordinate(''))
+        self.assertIsNone(parse_coordinate('N51'))
+        self.assertIsNone(parse_coordinate('nan'))
+        self.assertIsNone(parse_coordinate(None))
+        self.assertIsNone(parse_coordinate(True))
+
+    def test_get_point(self):
+        """Test get_point method."""
+        self.assertEqual(
+            get_point({'lat': '10', 'lon': '30.5'}, 'lat', 'lon'),
+            {'type': 'Point', 'coordinates': [30.5, 10.0]}
+        )
+        self.assertIsNone(get_point({'lat': '10'}, 'lat', 'lon'))
+
+
+class IsWGS84Test(TestCase):
+    """Test iter_positions and is_wgs84 methods."""
+
+    def test_iter_positions(self):
+        """Test iter_positions method."""
+        self.assertEqual(
+            list(iter_positions({'type': 'Point', 'coordinates': [30, 10]})),
+            [[30, 10]]
+        )
+        self.assertEqual(
+            sorted(iter_positions({
+                'type': 'GeometryCollection',
+                'geometries': [
+                    {'type': 'Point', 'coordinates': [1, 2]},
+                    {
+                        'type': 'Polygon',
+                        'coordinates': [[[3, 4], [5, 6], [3, 4]]]
+                    }
+                ]
+            })),
+            [[1, 2], [3, 4], [3, 4], [5, 6]]
+        )
+
+    def test_is_wgs84(self):
+        """Test is_wgs84 method."""
+        self.assertTrue(
+            is_wgs84({'type': 'Point', 'coordinates': [-180, 90]})
+        )
+        self.assertTrue(is_wgs84({
+            'type': 'LineString',
+            'coordinates': [[30, 10], [-0.1, 51.5]]
+        }))
+        self.assertFalse(
+            is_wgs84({'type': 'Point', 'coordinates': [530000, 180000]})
+        )
+        self.assertFalse(is_wgs84({
+            'type': 'LineString',
+            'coordinates': [[30, 10], [30, 91]]
+        }))
+
+
+class GetGeometryValueTest(TestCase):
+    """Test point_to_ewkb and get_geometry_value methods."""
+
+    def test_point_to_ewkb(self):
+        """Test point_to_ewkb method."""
+        geometry = GEOSGeometry(point_to_ewkb([30.5, 10]))
+        self.assertEqual(geometry.srid, 4326)
+        self.assertEqual(geometry.coords, (30.5, 10.0))
+
+        geometry = GEOSGeometry(point_to_ewkb([30.5, 10, 5]))
+        self.assertEqual(geometry.coords, (30.5, 10.0, 5.0))
+
+    def test_get_geometry_value(self):
+        """Test get_geometry_value method."""
+        self.assertEqual(
+            get_geometry_value({'type': 'Point', 'coordinates': [30, 10]}),
+            point_to_ewkb([30, 10])
+        )
+
+        line = {'type': 'LineString', 'coordinates': [[30, 10], [1, 2]]}
+        self.assertEqual(get_geometry_value(line), json.dumps(line))
+        self.assertEqual(
+            get_geometry_value({'type': 'Point', 'coordinates': []}),
+            json.dumps({'type': 'Point', 'coordinates': []})
+        )
@@ -0,0 +1,230 @@
+"""All tests for import helpers."""
+
+import os
+import shutil
+import zipfile
+import tempfile
+
+from osgeo import ogr
+
+from django.core.files import File
+from django.test import TestCase
+
+from geokey.users.tests.model_factories import UserFactory
+from geokey.projects.tests.model_factories import ProjectFactory
+from geokey.categories.models import LookupValue
+from geokey.categories.tests.model_factories import (
+    CategoryFactory,
+    TextFieldFactory,
+    LookupFieldFactory
+)
+from geokey.contributions.models import Observation
+
+from .model_factories import DataImportFactory, DataFeatureFactory
+from ..base import FORMAT
+from ..models import DataImport
+from ..helpers.crs_helpers import get_spatial_reference
+from ..helpers.import_helpers import (
+    create_lookup_values,
+    import_datafeatures,
+    get_id_ranges,
+    import_id_range
+)
+
+
+class ImportHelpersTest(TestCase):
+    """Set up a data import with fields assigned."""
+
+    def setUp(self):
+        """Set up test."""
+        self.admin = UserFactory.create()
+        self.project = ProjectFactory.create(add_admins=[self.admin])
+        self.category = CategoryFactory.create(project=self.project)
+        self.dataimport = DataImportFactory.create(
+            keys=['Name'],
+            project=self.project,
+            category=self.category
+        )
+        TextFieldFactory.create(key='Name', category=self.category)
+
+    def tearDown(self):
+        """Tear down test."""
+        for dataimport in DataImport.objects.all():
+            if dataimport.file:
+                dataimport.file.delete()
+
+
+class CreateLookupValuesTest(ImportHelpersTest):
+    """Test create_lookup_values method."""
+
+    def test_method(self):
+        """Test method."""
+        field = LookupFieldFactory.create(
+            key='Kind',
+            category=self.category
+        )
+        self.dataimport.keys = ['Name', 'Kind']
+        self.dataimport.save()
+        for kind in ['Meat', 'Fish', 'Meat']:
+            DataFeatureFactory.create(
+                properties={'Kind': kind},
+                dataimport=self.dataimport
+            )
+        DataFeatureFactory.create(
+            imported=True,
+            properties={'Kind': 'Vegetables'},
+            dataimport=self.dataimport
+        )
+
+        self.assertEqual(create_lookup_values(self.dataimport), 2)
+        self.assertEqual(
+            sorted(
+                LookupValue.objects.filter(field=field).values_list(
+                    'name',
+                    flat=True
+                )
+            ),
+            ['Fish', 'Meat']
+        )
+        self.assertEqual(create_lookup_values(self.dataimport), 0)
+
+
+class ImportDataFeaturesTest(ImportHelpersTest):
+    """Test import_datafeatures method."""
+
+    def test_method(self):
+        """Test method."""
+        datafeatures = self.dataimport.datafeatures.all()
+        imported = import_datafeatures(
+            self.dataimport,
+            datafeatures,
+            self.admin
+        )
+
+        self.assertEqual(imported, 3)
+        self.assertEqual(Observation.objects.count(), 3)
+        self.assertEqual(
+            self.dataimport.datafeatures.filter(imported=False).count(),
+            0
+        )
+        self.assertEqual(self.dataimport.imported_count, 3)
+        self.assertEqual(
+            DataImport.objects.get(pk=self.dataimport.id).imported_count,
+            3
+        )
+
+    def test_method_with_dates(self):
+        """Test method with dates of a Shapefile converted to ISO 8601."""
+        directory = tempfile.mkdtemp()
+        source = ogr.GetDriverByName('ESRI Shapefile').CreateDataSource(
+            os.path.join(directory, 'data.shp')
+        )
+        layer = source.CreateLayer(
+            'data',
+            get_spatial_reference(4326),
+            ogr.wkbPoint
+        )
+        layer.CreateField(ogr.FieldDefn('day', ogr.OFTDate))
+        feature = ogr.Feature(layer.GetLayerDefn())
+        feature.SetField('day', '2017/01/02')
+        feature.SetGeometry(ogr.CreateGeometryFromWkt('POINT (30 10)'))
+        layer.CreateFeature(feature)
+        source = None  # Flushes the file
+
+        path = os.path.join(directory, 'data.zip')
+        with zipfile.ZipFile(path, 'w') as archive:
+            for extension in ('shp', 'shx', 'dbf', 'prj'):
+                archive.write(
+                    os.path.join(directory, 'data.%s' % extension),
+                    'data.%s' % extension
+                )
+
+        with open(path, 'rb') as file_obj:
+            dataimport = DataImportFactory.create(
+                dataformat=FORMAT.SHP,
+                file=File(file_obj, name='data.zip'),
+                project=self.project,
+                category=self.category
+            )
+        shutil.rmtree(directory)
+
+        datafield = dataimport.datafields.get(name='day')
+        field = datafield.convert_to_field('Day', 'DateField')
+        dataimport.keys = [field.key]
+        dataimport.save()
+
+        imported = import_datafeatures(
+            dataimport,
+            dataimport.datafeatures.all(),
+            self.admin
+        )
+
+        self.assertEqual(imported, 1)
+        self.assertEqual(
+            Observation.objects.get().properties[field.key],
+            '2017-01-02'
+        )
+
+
+class GetIdRangesTest(ImportHelpersTest):
+    """Test get_id_ranges method."""
+
+    def test_method(self):
+        """Test method."""
+        for _ in range(7):
+            DataFeatureFactory.create(dataimport=self.dataimport)
+        DataFeatureFactory.create(imported=True, dataimport=self.dataimport)
+        ids = list(
+            self.dataimport.datafeatures.filter(
+                imported=False
+            ).order_by('id').values_list('id', flat=True)
+        )
+
+        ranges = get_id_ranges(self.dataimport, 4)
+
+        self.assertEqual(len(ranges), 4)
+        self.assertEqual(ranges[0][0], ids[0])
+        self.assertEqual(ranges[-1][1], ids[-1])
+        covered = [
+            id for id in ids
+            if any(first <= id <= last for first, last in ranges)
+        ]
+        self.assertEqual(covered, ids)
+
+    def test_method_with_more_workers_than_features(self):
+        """Test method with more workers than data features."""
+        self.assertEqual(len(get_id_ranges(self.dataimport, 10)), 3)
+
+
+class ImportIdRangeTest(ImportHelpersTest):
+    """Test import_id_range method."""
+
+    def test_method(self):
+        """Test method."""
+        ids = list(
+            self.dataimport.datafeatures.order_by('id').values_list(
+                'id',
+                flat=True
+            )
+        )
+
+        imported = import_id_range(
+            (self.dataimport.id, self.admin.id, ids[0], ids[1], 1)
+        )
+
+        self.assertEqual(imported, 2)
+        self.assertEqual(Observation.objects.count(), 2)
+        self.assertFalse(
+            self.dataimport.datafeatures.get(pk=ids[2]).imported
+        )
+
+        imported = import_id_range(
+            (self.dataimport.id, self.admin.id, ids[0], ids[2], 1)
+        )
+
+        self.assertEqual(imported, 1)
+        self.assertEqual(Observation.objects.count(), 3)
+        self.assertEqual(
+            DataImport.objects.get(pk=self.dataimport.id).imported_count,
+            3
+        )
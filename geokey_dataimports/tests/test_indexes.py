@@ -0,0 +1,111 @@
+"""All tests for database indexes."""
+
+from django.db import connection
+from django.test import TestCase
+
+from geokey.projects.tests.model_factories import ProjectFactory
+
+from .model_factories import DataImportFactory
+from ..models import DataImport, DataFeature
+from ..helpers.feature_helpers import parse_where, filter_by_where
+
+
+def explain(queryset):
+    """Get the query plan of a queryset."""
+    sql, params = queryset.query.sql_with_params()
+
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN %s' % sql, params)
+        return '\n'.join(row[0] for row in cursor.fetchall())
+
+
+class IndexesTest(TestCase):
+    """Test indexes are used by the queries they are made for."""
+
+    def setUp(self):
+        """Set up test."""
+        self.dataimport = DataImportFactory.create()
+
+    def tearDown(self):
+        """Tear down test."""
+        for dataimport in DataImport.objects.all():
+            if dataimport.file:
+                dataimport.file.delete()
+
+    def test_datafeatures_not_imported(self):
+        """Test data features not imported yet, at a million rows."""
+        table = DataFeature._meta.db_table
+
+        with connection.cursor() as cursor:
+            # Every 1000th data feature is not imported yet
+            cursor.execute(
+                'INSERT INTO %s'
+                '  (created, modified, imported, geometry, properties,'
+                '  dataimport_id)'
+                'SELECT now(), now(), n %% 1000 <> 0,'
+                '  ST_MakePoint(n %% 360 - 180, n %% 180 - 90)::geography,'
+                '  \'{}\', %%s'
+                'FROM generate_series(1, 1000000) AS n' % table,
+                [self.dataimport.id]
+            )
+            cursor.execute('ANALYZE %s' % table)
+
+        plan = explain(
+            self.dataimport.datafeatures.filter(
+                imported=False
+            ).order_by('id').values_list('id', flat=True)[:500]
+        )
+
+        self.assertIn('geokey_dataimports_datafeature_not_imported', plan)
+
+    def test_active_dataimports(self):
+        """Test data imports not deleted, per project, among deleted ones."""
+        project = ProjectFactory.create()
+        table = DataImport._meta.db_table
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'INSERT INTO %s'
+                '  (created, modified, status, status_changed, name,'
+                '  dataformat, file, project_id, creator_id,'
+                '  feature_count, imported_count)'
+                'SELECT now(), now(), \'deleted\', now(), \'Deleted\','
+                '  \'CSV\', \'\', %%s, %%s, 0, 0'
+                'FROM generate_series(1, 100000)' % table,
+                [project.id, project.creator_id]
+            )
+            cursor.execute('ANALYZE %s' % table)
+
+        plan = explain(
+            DataImport.objects.filter(project=self.dataimport.project)
+        )
+
+        self.assertIn('geokey_dataimports_dataimport_active', plan)
+
+    def test_datafeatures_properties(self):
+        """Test data features filtered by properties, at a million rows."""
+        table = DataFeature._meta.db_table
+
+        with connection.cursor() as cursor:
+            # Every 1000th data feature is active
+            cursor.execute(
+                'INSERT INTO %s'
+                '  (created, modified, imported, geometry, properties,'
+                '  dataimport_id)'
+                'SELECT now(), now(), false,'
+                '  ST_MakePoint(n %% 360 - 180, n %% 180 - 90)::geography,'
+                '  json_build_object(\'status\', CASE WHEN n %% 1000 = 0'
+                '    THEN \'active\' ELSE \'inactive\' END)::jsonb, %%s'
+                'FROM generate_series(1, 1000000) AS n' % table,
+                [self.dataimport.id]
+            )
+            cursor.execute('ANALYZE %s' % table)
+
+        plan = explain(
+            filter_by_where(
+                DataFeature.objects.all(),
+                parse_where('{"status": "active"}')
+            )
+        )
+
+        self.assertIn('geokey_dataimports_datafeature_properties', plan)
@@ -1,7 +1,13 @@
 """All tests for models."""
 
 import os
+import shutil
+import tempfile
 
+from osgeo import ogr
+
+from django.core.files import File
+from django.core.files.base import ContentFile
 from django.test import TestCase
 
 from nose.tools import raises
@@ -13,6 +19,9 @@ from geokey.categories.tests.model_factories import CategoryFactory
 from geokey.contributions.models import Observation
 
 from .model_factories import DataImportFactory
+from .. import models
+from ..base import STATUS
+from ..exceptions import FileParseError
 from ..models import DataImport, post_save_project, post_save_category
 
 
@@ -36,6 +45,121 @@ class DataImportTest(TestCase):
         dataimport.delete()
         DataImport.objects.get(pk=dataimport.id)
 
+    def test_delete_keeps_counts(self):
+        """Test counts updated meanwhile are kept when deleting."""
+        dataimport = DataImportFactory.create()
+        self.file = dataimport.file.path
+        DataImport.objects.filter(pk=dataimport.id).update(imported_count=2)
+        dataimport.delete()
+
+        dataimport = DataImport._base_manager.get(pk=dataimport.id)
+        self.assertEqual(dataimport.status, STATUS.deleted)
+        self.assertEqual(dataimport.imported_count, 2)
+
+    def test_counts(self):
+        """Test data features counted when data import gets created."""
+        dataimport = DataImportFactory.create()
+        self.file = dataimport.file.path
+
+        self.assertEqual(dataimport.feature_count, 3)
+        self.assertEqual(dataimport.imported_count, 0)
+
+        dataimport = DataImport.objects.get(pk=dataimport.id)
+        self.assertEqual(dataimport.feature_count, 3)
+        self.assertEqual(dataimport.imported_count, 0)
+
+    def test_batches(self):
+        """Test data features stored in batches when parsing a file."""
+        batch_size = models.BATCH_SIZE
+        models.BATCH_SIZE = 2
+
+        try:
+            dataimport = DataImportFactory.create()
+        finally:
+            models.BATCH_SIZE = batch_size
+        self.file = dataimport.file.path
+
+        self.assertEqual(dataimport.feature_count, 3)
+        self.assertEqual(dataimport.datafeatures.count(), 3)
+        self.assertEqual(
+            sorted(dataimport.datafields.values_list('name', flat=True)),
+            ['ID', 'Name', 'Short Description']
+        )
+
+    def test_declared_types(self):
+        """Test types of fields declared by a schema are kept."""
+        path = os.path.join(tempfile.mkdtemp(), 'data.gpkg')
+        source = ogr.GetDriverByName('GPKG').CreateDataSource(path)
+        layer = source.CreateLayer('data', geom_type=ogr.wkbPoint)
+        layer.CreateField(ogr.FieldDefn('code', ogr.OFTString))
+        layer.CreateField(ogr.FieldDefn('count', ogr.OFTInteger))
+        feature = ogr.Feature(layer.GetLayerDefn())
+        feature.SetField('code', '0042')
+        feature.SetField('count', 42)
+        feature.SetGeometry(ogr.CreateGeometryFromWkt('POINT (30 10)'))
+        layer.CreateFeature(feature)
+        source = None  # Flushes the file
+
+        with open(path, 'rb') as file_obj:
+            dataimport = DataImportFactory.create(
+                dataformat='GPKG',
+                file=File(file_obj, name='data.gpkg')
+            )
+        shutil.rmtree(os.path.dirname(path))
+        self.file = dataimport.file.path
+
+        self.assertEqual(dataimport.feature_count, 1)
+        # Text that looks like a number is still inferred as a number
+        self.assertIn(
+            'NumericField',
+            dataimport.datafields.get(name='code').types
+        )
+        self.assertEqual(
+            sorted(dataimport.datafields.get(name='count').types),
+            ['LookupField', 'NumericField', 'TextField']
+        )
+
+    def test_coordinates(self):
+        """Test points built from latitude and longitude fields."""
+        dataimport = DataImportFactory.create(file=ContentFile(
+            b'Name,Latitude,Longitude\nMeat,10.5,30\nFish,51.5,-0.1\n',
+            name='data.csv'
+        ))
+        self.file = dataimport.file.path
+
+        self.assertEqual(dataimport.feature_count, 2)
+        geometry = dataimport.datafeatures.order_by('id').first().geometry
+        self.assertEqual((geometry.x, geometry.y), (30.0, 10.5))
+        self.assertIn(
+            'NumericField',
+            dataimport.datafields.get(name='Latitude').types
+        )
+
+    def test_srid(self):
+        """Test geometries reprojected when coordinates are not WGS84."""
+        dataimport = DataImportFactory.create(srid=27700)
+        self.file = dataimport.file.path
+
+        geometry = dataimport.datafeatures.order_by('id').first().geometry
+        self.assertAlmostEqual(geometry.x, -7.56, places=1)
+        self.assertAlmostEqual(geometry.y, 49.77, places=1)
+
+    def test_projected_coordinates(self):
+        """Test projected coordinates not taken as WGS84."""
+        file_obj = ContentFile(
+            b'Name,Easting,Northing\nMeat,530000,180000\n',
+            name='data.csv'
+        )
+
+        with self.assertRaises(FileParseError) as context:
+            DataImportFactory.create(file=file_obj)
+
+        self.assertEqual(context.exception.errors[0]['line'], 1)
+        dataimport = DataImport._base_manager.latest('id')
+        self.assertEqual(dataimport.status, STATUS.deleted)
+        self.assertEqual(dataimport.datafeatures.count(), 0)
+        dataimport.file.delete()
+
 
 class PostSaveProjectTest(TestCase):
     """Test post save for project."""
@@ -65,6 +189,30 @@ class PostSaveProjectTest(TestCase):
 
         DataImport.objects.get(pk=dataimport.id)
 
+    def test_post_save_project_when_saving_deleted(self):
+        """
+        Test save project that is deleted already.
+
+        Data imports should only be removed when status changes, their data
+        features should be left for the purge.
+        """
+        project = ProjectFactory.create(status='active')
+        dataimport = DataImportFactory.create(project=project)
+        self.file = dataimport.file.path
+        project.status = 'deleted'
+        project.save()
+
+        dataimport = DataImport._base_manager.get(pk=dataimport.id)
+        self.assertEqual(dataimport.status, 'deleted')
+        self.assertEqual(dataimport.datafeatures.count(), 3)
+
+        project = Project._base_manager.get(pk=project.id)
+        project.save()
+        self.assertEqual(
+            DataImport._base_manager.get(pk=dataimport.id).status_changed,
+            dataimport.status_changed
+        )
+
 
 class PostSaveCategoryTest(TestCase):
     """Test post save for category."""
@@ -0,0 +1,100 @@
+"""All tests for partition helpers."""
+
+from django.core.files.base import ContentFile
+from django.db import connection
+from django.test import TestCase
+
+from .model_factories import DataImportFactory
+from ..base import STATUS
+from ..exceptions import FileParseError
+from ..models import DataImport, DataFeature
+from ..helpers.partition_helpers import (
+    MIN_PG_VERSION,
+    get_partition_name,
+    is_partitioned,
+    create_partition,
+    drop_partition,
+    partition_table
+)
+
+
+def count_rows(table):
+    """Count rows of a table."""
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT count(*) FROM %s' % table)
+        return cursor.fetchone()[0]
+
+
+class PartitionHelpersTest(TestCase):
+    """Test partition helpers."""
+
+    def setUp(self):
+        """Set up test."""
+        self.dataimport = DataImportFactory.create()
+
+    def tearDown(self):
+        """Tear down test."""
+        for dataimport in DataImport.objects.all():
+            if dataimport.file:
+                dataimport.file.delete()
+
+    def test_get_partition_name(self):
+        """Test get_partition_name method."""
+        self.assertEqual(
+            get_partition_name(42),
+            'geokey_dataimports_datafeature_42'
+        )
+
+    def test_when_not_partitioned(self):
+        """Test methods when data features are not partitioned."""
+        self.assertFalse(is_partitioned())
+        self.assertFalse(create_partition(self.dataimport.id))
+        self.assertIsNone(drop_partition(self.dataimport.id))
+        self.assertEqual(self.dataimport.datafeatures.count(), 3)
+
+    def test_partition_table_when_not_supported(self):
+        """Test partition_table method when PostgreSQL is older than 11."""
+        if connection.pg_version >= MIN_PG_VERSION:
+            self.skipTest('Partitioning is supported by PostgreSQL.')
+
+        self.assertRaises(RuntimeError, partition_table)
+        self.assertFalse(is_partitioned())
+
+    def test_partition_table(self):
+        """Test partition_table method."""
+        if connection.pg_version < MIN_PG_VERSION:
+            self.skipTest('Partitioning requires PostgreSQL 11 or greater.')
+
+        self.assertEqual(partition_table(), 1)
+        self.assertTrue(is_partitioned())
+        self.assertRaises(RuntimeError, partition_table)
+
+        partition = get_partition_name(self.dataimport.id)
+        self.assertEqual(self.dataimport.datafeatures.count(), 3)
+        self.assertEqual(count_rows(partition), 3)
+
+        dataimport = DataImportFactory.create()
+        self.assertEqual(dataimport.datafeatures.count(), 3)
+        self.assertEqual(count_rows(get_partition_name(dataimport.id)), 3)
+        self.assertEqual(DataFeature.objects.count(), 6)
+
+        self.assertEqual(drop_partition(self.dataimport.id), 3)
+        self.assertEqual(drop_partition(self.dataimport.id), 0)
+        self.assertEqual(self.dataimport.datafeatures.count(), 0)
+        self.assertEqual(DataFeature.objects.count(), 3)
+
+    def test_partition_when_file_parse_fails(self):
+        """Test partition is dropped when the file cannot be parsed."""
+        if connection.pg_version < MIN_PG_VERSION:
+            self.skipTest('Partitioning requires PostgreSQL 11 or greater.')
+
+        partition_table()
+        file_obj = ContentFile(b'Name,Size\nMeat,1\n', name='no_geometry.csv')
+
+        with self.assertRaises(FileParseError):
+            DataImportFactory.create(file=file_obj)
+
+        dataimport = DataImport._base_manager.latest('id')
+        self.assertEqual(dataimport.status, STATUS.deleted)
+        self.assertEqual(drop_partition(dataimport.id), 0)
+        dataimport.file.delete()
@@ -0,0 +1,76 @@
+"""All tests for purge helpers."""
+
+import os
+
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from .model_factories import DataImportFactory, DataUploadFactory
+from ..models import DataImport, DataUpload
+from ..helpers.purge_helpers import (
+    get_purgeable,
+    delete_in_batches,
+    purge_uploads
+)
+
+
+class PurgeHelpersTest(TestCase):
+    """Test purge helpers."""
+
+    def setUp(self):
+        """Set up test."""
+        self.dataimport = DataImportFactory.create()
+
+    def tearDown(self):
+        """Tear down test."""
+        for dataimport in DataImport._base_manager.all():
+            if dataimport.file:
+                dataimport.file.delete()
+
+    def test_get_purgeable(self):
+        """Test get_purgeable method."""
+        self.assertEqual(list(get_purgeable(DataImport, 0)), [])
+
+        self.dataimport.delete()
+        self.assertEqual(list(get_purgeable(DataImport, 1)), [])
+        self.assertEqual(
+            list(get_purgeable(DataImport, 0)),
+            [self.dataimport]
+        )
+
+        DataImport._base_manager.filter(pk=self.dataimport.id).update(
+            status_changed=timezone.now() - timedelta(days=2)
+        )
+        self.assertEqual(
+            list(get_purgeable(DataImport, 1)),
+            [self.dataimport]
+        )
+
+    def test_delete_in_batches(self):
+        """Test delete_in_batches method."""
+        self.assertEqual(
+            delete_in_batches(self.dataimport.datafeatures.all(), 2),
+            3
+        )
+        self.assertEqual(self.dataimport.datafeatures.count(), 0)
+        self.assertEqual(
+            delete_in_batches(self.dataimport.datafeatures.all(), 2),
+            0
+        )
+
+    def test_purge_uploads(self):
+        """Test purge_uploads method."""
+        upload = DataUploadFactory.create()
+        with open(upload.get_path(), 'wb') as file_obj:
+            file_obj.write(b'0123456789')
+
+        self.assertEqual(purge_uploads(DataUpload, 1), (0, 0))
+
+        DataUpload.objects.filter(pk=upload.id).update(
+            modified=timezone.now() - timedelta(days=2)
+        )
+        self.assertEqual(purge_uploads(DataUpload, 1), (1, 10))
+        self.assertEqual(DataUpload.objects.count(), 0)
+        self.assertFalse(os.path.isfile(upload.get_path()))
@@ -0,0 +1,495 @@
+"""All tests for reader helpers."""
+
+import os
+import json
+import shutil
+import zipfile
+import tempfile
+
+from datetime import date
+from unittest import skipIf
+
+from osgeo import ogr
+
+from django.test import TestCase
+
+from .model_factories import DataImportFactory
+from ..base import FORMAT
+from ..models import DataImport
+from ..helpers.reader_helpers import (
+    READERS,
+    register_reader,
+    get_reader,
+    BaseReader,
+    CSVReader,
+    GeoJSONReader,
+    GeoJSONSeqReader,
+    KMLReader,
+    GPKGReader,
+    SHPReader,
+    XLSXReader,
+    to_iso_date
+)
+from ..helpers.crs_helpers import get_spatial_reference
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+
+class RegistryTest(TestCase):
+    """Test registry of readers."""
+
+    def tearDown(self):
+        """Tear down test."""
+        READERS.pop('Test', None)
+
+        for dataimport in DataImport._base_manager.all():
+            if dataimport.file:
+                dataimport.file.delete()
+
+    def test_registered(self):
+        """Test readers of all formats are registered."""
+        self.assertEqual(READERS[FORMAT.CSV], CSVReader)
+        self.assertEqual(READERS[FORMAT.GeoJSON], GeoJSONReader)
+        self.assertEqual(READERS[FORMAT.GeoJSONSeq], GeoJSONSeqReader)
+        self.assertEqual(READERS[FORMAT.KML], KMLReader)
+        self.assertEqual(READERS[FORMAT.GPKG], GPKGReader)
+        self.assertEqual(READERS[FORMAT.SHP], SHPReader)
+        self.assertEqual(READERS[FORMAT.XLSX], XLSXReader)
+
+    def test_register_reader(self):
+        """Test register_reader method."""
+        @register_reader('Test')
+        class TestReader(BaseReader):
+            pass
+
+        self.assertEqual(READERS['Test'], TestReader)
+
+    def test_get_reader(self):
+        """Test get_reader method."""
+        dataimport = DataImportFactory.create()
+
+        reader = get_reader(dataimport)
+        self.assertIsInstance(reader, CSVReader)
+        self.assertEqual(reader.path, dataimport.file.path)
+
+        dataimport.dataformat = 'Test'
+        self.assertRaises(ValueError, get_reader, dataimport)
+
+
+class ReadersTest(TestCase):
+    """Test readers."""
+
+    def setUp(self):
+        """Set up test."""
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Tear down test."""
+        shutil.rmtree(self.directory)
+
+    def write(self, name, content):
+        """Write a file to read."""
+        path = os.path.join(self.directory, name)
+        with open(path, 'w') as file_obj:
+            file_obj.write(content)
+        return path
+
+    def test_csv_reader(self):
+        """Test reading CSV files."""
+        reader = CSVReader(self.write(
+            'data.csv',
+            'Geometry,Name,Empty\n"POINT (30 10)",Meat,\n"POINT (1 2)",,\n'
+        ))
+
+        self.assertEqual(
+            reader.get_fieldnames(),
+            ['Geometry', 'Name', 'Empty']
+        )
+
+        # Features are streamed again on each iteration
+        for _ in range(2):
+            self.assertEqual(list(reader.iter_features()), [
+                {
+                    'line': 1,
+                    'properties': {'Geometry': 'POINT (30 10)', 'Name': 'Meat'}
+                },
+                {'line': 2, 'properties': {'Geometry': 'POINT (1 2)'}}
+            ])
+        self.assertIsNone(reader.srid)
+
+    def test_csv_reader_with_coordinates(self):
+        """Test reading CSV files with latitude and longitude fields."""
+        reader = CSVReader(self.write(
+            'data.csv',
+            'Name,Lat,Lon\nMeat,10.5,30\nFish,,\n'
+        ))
+
+        self.assertEqual(list(reader.iter_features()), [
+            {
+                'line': 1,
+                'geometry': {'type': 'Point', 'coordinates': [30.0, 10.5]},
+                'properties': {'Name': 'Meat', 'Lat': '10.5', 'Lon': '30'}
+            },
+            {'line': 2, 'properties': {'Name': 'Fish'}}
+        ])
+
+    def test_geojson_reader(self):
+        """Test reading GeoJSON files."""
+        reader = GeoJSONReader(self.write('data.geojson', json.dumps({
+            'type': 'FeatureCollection',
+            'crs': {
+                'type': 'name',
+                'properties': {'name': 'urn:ogc:def:crs:EPSG::27700'}
+            },
+            'features': [
+                {
+                    'type': 'Feature',
+                    'geometry': {'type': 'Point', 'coordinates': [1, 2]},
+                    'properties': {'Name': 'Meat'}
+                },
+                {
+                    'type': 'Feature',
+                    'geometry': None,
+                    'properties': None
+                }
+            ]
+        })))
+
+        self.assertEqual(reader.get_fieldnames(), [])
+        self.assertEqual(list(reader.iter_features()), [
+            {
+                'line': 1,
+                'geometry': {'type': 'Point', 'coordinates': [1, 2]},
+                'properties': {'Name': 'Meat'}
+            },
+            {'line': 2, 'geometry': None, 'properties': {}}
+        ])
+        self.assertEqual(reader.srid, 27700)
+
+    def test_geojson_reader_with_wrong_crs(self):
+        """Test reading GeoJSON files with an unknown CRS."""
+        reader = GeoJSONReader(self.write('data.geojson', json.dumps({
+            'type': 'FeatureCollection',
+            'crs': {'type': 'name', 'properties': {'name': 'Unknown'}},
+            'features': []
+        })))
+
+        self.assertRaises(ValueError, list, reader.iter_features())
+
+    def test_geojson_reader_without_features(self):
+        """Test reading GeoJSON files that are not feature collections."""
+        reader = GeoJSONReader(self.write('data.geojson', json.dumps({
+            'type': 'Feature',
+            'geometry': {'type': 'Point', 'coordinates': [1, 2]},
+            'properties': {'Name': 'Meat'}
+        })))
+
+        self.assertRaises(ValueError, list, reader.iter_features())
+
+        reader = GeoJSONReader(self.write('data.geojson', json.dumps({
+            'type': 'Point',
+            'coordinates': [1, 2]
+        })))
+
+        self.assertRaises(ValueError, list, reader.iter_features())
+
+    def test_geojson_reader_parses_once(self):
+        """Test the document is parsed once for all passes."""
+        path = self.write('data.geojson', json.dumps({
+            'type': 'FeatureCollection',
+            'features': [{
+                'type': 'Feature',
+                'geometry': {'type': 'Point', 'coordinates': [1, 2]},
+                'properties': {'Name': 'Meat'}
+            }]
+        }))
+        reader = GeoJSONReader(path)
+
+        self.assertEqual(len(list(reader.iter_features())), 1)
+        os.remove(path)
+        self.assertEqual(len(list(reader.iter_features())), 1)
+
+    def test_geojson_seq_reader(self):
+        """Test reading newline-delimited GeoJSON files."""
+        reader = GeoJSONSeqReader(self.write(
+            'data.geojsonl',
+            '{"type": "Feature", "geometry": {"type": "Point", '
+            '"coordinates": [30, 10]}, "properties": {"name": "Meat"}}\n'
+            '\n'
+            '\x1e{"type": "Point", "coordinates": [1, 2]}\n'
+        ))
+
+        self.assertEqual(list(reader.iter_features()), [
+            {
+                'line': 1,
+                'offset': 0,
+                'geometry': {'type': 'Point', 'coordinates': [30, 10]},
+                'properties': {'name': 'Meat'}
+            },
+            {
+                'line': 3,
+                'offset': 109,
+                'geometry': {'type': 'Point', 'coordinates': [1, 2]},
+                'properties': {}
+            }
+        ])
+
+    def test_geojson_seq_reader_in_chunks(self):
+        """Test reading newline-delimited GeoJSON files in chunks."""
+        reader = GeoJSONSeqReader(self.write('data.geojsonl', ''.join(
+            '{"type": "Point", "coordinates": [%s, 0]}\n' % index
+            for index in range(10)
+        )))
+
+        features = list(reader.iter_features())
+
+        for count in (1, 3, 20):
+            chunks = reader.get_chunks(count)
+            self.assertEqual(chunks[0], (0, chunks[0][1], 0))
+            self.assertIsNone(chunks[-1][1])
+            self.assertEqual(
+                [
+                    (feature['line'], feature['offset'])
+                    for chunk in chunks
+                    for feature in reader.iter_features(*chunk)
+                ],
+                [(feature['line'], feature['offset']) for feature in features]
+            )
+
+        self.assertEqual(len(reader.get_chunks(3)), 3)
+
+    def test_geojson_seq_reader_in_chunks_with_wrong_line(self):
+        """Test reading a chunk with a wrong line, numbered from the start."""
+        reader = GeoJSONSeqReader(self.write(
+            'data.geojsonl',
+            '{"type": "Point", "coordinates": [1, 2]}\n' * 5 + '{"type": \n'
+        ))
+
+        start, end, line = reader.get_chunks(2)[-1]
+        self.assertEqual(line, 3)
+
+        with self.assertRaises(ValueError) as context:
+            list(reader.iter_features(start, end, line))
+        self.assertIn('Line 6 (at byte 205)', str(context.exception))
+
+    def test_geojson_seq_reader_with_wrong_line(self):
+        """Test reading newline-delimited GeoJSON with a wrong line."""
+        reader = GeoJSONSeqReader(self.write(
+            'data.geojsonl',
+            '{"type": "Point", "coordinates": [1, 2]}\n{"type": \n'
+        ))
+
+        with self.assertRaises(ValueError) as context:
+            list(reader.iter_features())
+        self.assertIn('Line 2 (at byte 41)', str(context.exception))
+
+    def test_kml_reader(self):
+        """Test reading KML files."""
+        reader = KMLReader(self.write(
+            'data.kml',
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<kml xmlns="http://www.opengis.net/kml/2.2"><Document>'
+            '<Placemark><name>Meat</name><description><![CDATA['
+            '<table><tr><td>Name</td><td>Meat</td></tr></table>'
+            ']]></description><Point><coordinates>30,10</coordinates>'
+            '</Point></Placemark>'
+            '</Document></kml>'
+        ))
+
+        features = list(reader.iter_features())
+
+        self.assertEqual(len(features), 1)
+        self.assertEqual(features[0]['properties'], {'Name': 'Meat'})
+        self.assertEqual(features[0]['geometry']['type'], 'Point')
+        self.assertEqual(reader.get_fieldnames(), [])
+
+
+class ToISODateTest(TestCase):
+    """Test converting dates exported by OGR to ISO 8601."""
+
+    def test_date(self):
+        """Test converting dates."""
+        self.assertEqual(to_iso_date('2017/01/02'), '2017-01-02')
+
+    def test_datetime(self):
+        """Test converting dates with time and offset."""
+        self.assertEqual(
+            to_iso_date('2017/01/02 10:20:30'),
+            '2017-01-02T10:20:30'
+        )
+        self.assertEqual(
+            to_iso_date('2017/01/02 10:20:30.500+01'),
+            '2017-01-02T10:20:30.500+01:00'
+        )
+        self.assertEqual(
+            to_iso_date('2017/01/02 10:20:30-0530'),
+            '2017-01-02T10:20:30-05:30'
+        )
+
+    def test_other_values(self):
+        """Test values that are not dates are left as they are."""
+        self.assertEqual(to_iso_date('2017-01-02'), '2017-01-02')
+        self.assertEqual(to_iso_date('Meat'), 'Meat')
+
+
+class OGRReadersTest(TestCase):
+    """Test readers of formats read through OGR layers."""
+
+    def setUp(self):
+        """Set up test."""
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Tear down test."""
+        shutil.rmtree(self.directory)
+
+    def create(self, driver_name, name):
+        """Create a file with a layer of two features."""
+        path = os.path.join(self.directory, name)
+        source = ogr.GetDriverByName(driver_name).CreateDataSource(path)
+        layer = source.CreateLayer(
+            'data',
+            get_spatial_reference(27700),
+            ogr.wkbPoint
+        )
+
+        for fieldname, fieldtype in (
+            ('name', ogr.OFTString),
+            ('count', ogr.OFTInteger),
+            ('size', ogr.OFTReal),
+            ('day', ogr.OFTDate)
+        ):
+            layer.CreateField(ogr.FieldDefn(fieldname, fieldtype))
+
+        for index in range(2):
+            feature = ogr.Feature(layer.GetLayerDefn())
+            feature.SetField('name', 'Feature %s' % index)
+            feature.SetField('count', index)
+            feature.SetField('size', index / 2.0)
+            feature.SetField('day', '2017/01/0%s' % (index + 1))
+            feature.SetGeometry(
+                ogr.CreateGeometryFromWkt('POINT (530000 180000)')
+            )
+            layer.CreateFeature(feature)
+
+        source = None  # Flushes the file
+        return path
+
+    def assert_read(self, reader):
+        """Assert features, fields and CRS are read."""
+        self.assertEqual(
+            reader.get_fieldnames(),
+            ['name', 'count', 'size', 'day']
+        )
+        self.assertEqual(reader.get_fieldtypes(), {
+            'count': ['TextField', 'LookupField', 'NumericField'],
+            'size': ['TextField', 'LookupField', 'NumericField'],
+            'day': ['TextField', 'LookupField', 'DateField', 'DateTimeField']
+        })
+
+        features = list(reader.iter_features())
+
+        self.assertEqual(len(features), 2)
+        self.assertEqual([feature['line'] for feature in features], [1, 2])
+        self.assertEqual(features[1]['properties']['name'], 'Feature 1')
+        self.assertEqual(features[1]['properties']['count'], 1)
+        self.assertEqual(features[1]['properties']['day'], '2017-01-02')
+        self.assertEqual(features[0]['geometry']['type'], 'Point')
+        self.assertEqual(reader.srid, 27700)
+
+    def test_gpkg_reader(self):
+        """Test reading GeoPackage files."""
+        self.assert_read(
+            GPKGReader(self.create('GPKG', 'data.gpkg'))
+        )
+
+    def test_shp_reader(self):
+        """Test reading zipped Shapefiles."""
+        self.create('ESRI Shapefile', 'data.shp')
+
+        path = os.path.join(self.directory, 'data.zip')
+        with zipfile.ZipFile(path, 'w') as archive:
+            for extension in ('shp', 'shx', 'dbf', 'prj'):
+                archive.write(
+                    os.path.join(self.directory, 'data.%s' % extension),
+                    'data.%s' % extension
+                )
+
+        self.assert_read(SHPReader(path))
+
+
+@skipIf(openpyxl is None, 'openpyxl is not installed')
+class XLSXReaderTest(TestCase):
+    """Test reader of Excel workbooks."""
+
+    def setUp(self):
+        """Set up test."""
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'data.xlsx')
+
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.title = 'Empty'
+        sheet = workbook.create_sheet('Data')
+        sheet.append(['Geometry', 'Name', 'Count', 'Day', 'Active'])
+        sheet.append(['POINT (30 10)', 'Meat', 5, date(2017, 1, 1), True])
+        sheet.append([None, None, None, None, None])
+        sheet.append(['POINT (31 11)', '<b>Fish</b>', 1.5, None, False])
+        workbook.save(self.path)
+
+    def tearDown(self):
+        """Tear down test."""
+        shutil.rmtree(self.directory)
+
+    def test_reader(self):
+        """Test reading a sheet."""
+        reader = XLSXReader(self.path, sheet='Data')
+
+        self.assertEqual(
+            reader.get_fieldnames(),
+            ['Geometry', 'Name', 'Count', 'Day', 'Active']
+        )
+
+        features = list(reader.iter_features())
+
+        self.assertEqual(len(features), 2)
+        self.assertEqual([feature['line'] for feature in features], [1, 3])
+        self.assertEqual(features[0]['properties'], {
+            'Geometry': 'POINT (30 10)',
+            'Name': 'Meat',
+            'Count': 5,
+            'Day': '2017-01-01T00:00:00',
+            'Active': 'true'
+        })
+        self.assertEqual(features[0]['types'], {
+            'Count': ['NumericField'],
+            'Day': ['DateField', 'DateTimeField']
+        })
+        self.assertEqual(features[1]['properties']['Count'], 1.5)
+        self.assertNotIn('geometry', features[0])
+
+    def test_reader_with_first_sheet(self):
+        """Test reading the first sheet when none is set."""
+        reader = XLSXReader(self.path)
+
+        self.assertEqual(reader.get_fieldnames(), [])
+        self.assertEqual(list(reader.iter_features()), [])
+
+    def test_reader_with_wrong_sheet(self):
+        """Test reading a sheet that does not exist."""
+        reader = XLSXReader(self.path, sheet='Other')
+
+        with self.assertRaises(ValueError):
+            reader.get_fieldnames()
+
+    def test_reader_with_wrong_file(self):
+        """Test reading a file that is not a workbook."""
+        path = os.path.join(self.directory, 'data.csv')
+        with open(path, 'w') as file_obj:
+            file_obj.write('Geometry,Name\n')
+
+        with self.assertRaises(ValueError):
+            list(XLSXReader(path).iter_features())
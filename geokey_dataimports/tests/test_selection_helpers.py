@@ -0,0 +1,213 @@
+"""All tests for selection helpers."""
+
+import json
+
+from django.test import TestCase
+
+from .model_factories import DataImportFactory
+from ..models import DataImport
+from ..helpers.selection_helpers import (
+    encode_ranges,
+    to_ranges,
+    decode_ranges,
+    parse_selection,
+    filter_by_selection
+)
+
+
+class RangesTest(TestCase):
+    """Test encode_ranges, to_ranges and decode_ranges methods."""
+
+    def test_to_ranges(self):
+        """Test converting IDs to ranges."""
+        self.assertEqual(to_ranges([]), [])
+        self.assertEqual(
+            to_ranges([12, 1, 2, 3, 4, 5, 8, 10, 11, 3]),
+            [(1, 5), (8, 8), (10, 12)]
+        )
+
+    def test_encode_ranges(self):
+        """Test encoding IDs as ranges."""
+        self.assertEqual(encode_ranges([]), '')
+        self.assertEqual(
+            encode_ranges([12, 1, 2, 3, 4, 5, 8, 10, 11]),
+            '1-5,8,10-12'
+        )
+
+    def test_decode_ranges(self):
+        """Test decoding ranges."""
+        self.assertEqual(decode_ranges(''), [])
+        self.assertEqual(
+            decode_ranges('1-5,8,10-12'),
+            [(1, 5), (8, 8), (10, 12)]
+        )
+
+    def test_decode_ranges_with_wrong_input(self):
+        """Test decoding wrong ranges."""
+        self.assertRaises(ValueError, decode_ranges, 'a')
+        self.assertRaises(ValueError, decode_ranges, '1-a')
+        self.assertRaises(ValueError, decode_ranges, '5-1')
+
+    def test_million_ids(self):
+        """Test round trip of a million IDs (with every 1000th one missing)."""
+        ids = [id for id in range(1, 1001001) if id % 1000]
+        encoded = encode_ranges(ids)
+
+        self.assertLess(len(encoded), 20000)
+        ranges = decode_ranges(encoded)
+        self.assertEqual(len(ranges), 1001)
+        self.assertEqual(
+            [id for first, last in ranges for id in range(first, last + 1)],
+            ids
+        )
+
+
+class ParseSelectionTest(TestCase):
+    """Test parse_selection method."""
+
+    def test_method(self):
+        """Test method."""
+        self.assertEqual(
+            parse_selection('{"type": "all"}'),
+            {'type': 'all', 'ids': [], 'exclude': []}
+        )
+        self.assertEqual(
+            parse_selection('{"type": "ids", "ids": [1, "2"]}'),
+            {'type': 'ids', 'ids': [(1, 2)], 'exclude': []}
+        )
+        self.assertEqual(
+            parse_selection('{"type": "all", "exclude": "1-3,5"}'),
+            {'type': 'all', 'ids': [], 'exclude': [(1, 3), (5, 5)]}
+        )
+        self.assertEqual(
+            parse_selection('{"type": "all", "where": {"Name": "Fish"}}'),
+            {
+                'type': 'all',
+                'ids': [],
+                'exclude': [],
+                'where': {'Name': {'eq': 'Fish'}}
+            }
+        )
+
+    def test_method_with_wrong_input(self):
+        """Test with wrong input."""
+        self.assertRaises(ValueError, parse_selection, 'all')
+        self.assertRaises(ValueError, parse_selection, '[1, 2]')
+        self.assertRaises(ValueError, parse_selection, '{"type": "some"}')
+        self.assertRaises(
+            ValueError,
+            parse_selection,
+            '{"type": "all", "exclude": ["a"]}'
+        )
+        self.assertRaises(
+            ValueError,
+            parse_selection,
+            '{"type": "all", "exclude": "3-1"}'
+        )
+        self.assertRaises(
+            ValueError,
+            parse_selection,
+            '{"type": "all", "exclude": 1}'
+        )
+        self.assertRaises(
+            ValueError,
+            parse_selection,
+            '{"type": "all", "where": {"Name": {"like": "F"}}}'
+        )
+
+
+class FilterBySelectionTest(TestCase):
+    """Test filter_by_selection method."""
+
+    def setUp(self):
+        """Set up test."""
+        self.dataimport = DataImportFactory.create()
+        self.datafeatures = self.dataimport.datafeatures.order_by('id')
+        self.ids = list(self.datafeatures.values_list('id', flat=True))
+
+    def tearDown(self):
+        """Tear down test."""
+        for dataimport in DataImport.objects.all():
+            if dataimport.file:
+                dataimport.file.delete()
+
+    def select(self, selection):
+        """Get IDs of data features selected."""
+        return list(
+            filter_by_selection(
+                self.datafeatures,
+                parse_selection(json.dumps(selection))
+            ).values_list('id', flat=True)
+        )
+
+    def test_all(self):
+        """Test selecting all data features."""
+        self.assertEqual(self.select({'type': 'all'}), self.ids)
+        self.assertEqual(
+            self.select({'type': 'all', 'exclude': [self.ids[0]]}),
+            self.ids[1:]
+        )
+
+    def test_ids(self):
+        """Test selecting data features by IDs."""
+        self.assertEqual(
+            self.select({'type': 'ids', 'ids': self.ids[:2]}),
+            self.ids[:2]
+        )
+
+    def test_ranges(self):
+        """Test selecting data features by ranges of IDs."""
+        ids = '%s-%s' % (self.ids[0], self.ids[1])
+        self.assertEqual(
+            self.select({'type': 'ids', 'ids': ids}),
+            self.ids[:2]
+        )
+        self.assertEqual(
+            self.select({'type': 'all', 'exclude': ids}),
+            self.ids[2:]
+        )
+
+    def test_bbox(self):
+        """Test selecting data features by a bounding box."""
+        self.assertEqual(
+            self.select({'type': 'bbox', 'bbox': [9, 19, 11, 21]}),
+            self.ids[1:]
+        )
+
+    def test_polygon(self):
+        """Test selecting data features by a polygon."""
+        self.assertEqual(
+            self.select({
+                'type': 'polygon',
+                'geometry': {
+                    'type': 'Polygon',
+                    'coordinates': [
+                        [[9, 19], [11, 19], [11, 21], [9, 21], [9, 19]]
+                    ]
+                }
+            }),
+            self.ids[2:]
+        )
+
+    def test_properties(self):
+        """Test selecting data features by properties."""
+        selection = {'type': 'properties', 'properties': {'Name': 'Fish'}}
+        self.assertEqual(self.select(selection), self.ids[1:2])
+
+    def test_where(self):
+        """Test selecting data features filtered by properties."""
+        selection = {
+            'type': 'all',
+            'where': {'ID': {'gte': 2}},
+            'exclude': [self.ids[2]]
+        }
+        self.assertEqual(self.select(selection), self.ids[1:2])
+
+    def test_wrong_selection(self):
+        """Test selecting data features by a wrong selection."""
+        self.assertRaises(
+            ValueError,
+            self.select,
+            {'type': 'polygon', 'geometry': {'type': 'Point'}}
+        )
+        self.assertRaises(ValueError, self.select, {'type': 'properties'})
@@ -0,0 +1,162 @@
+"""All tests for sniff helpers."""
+
+import gzip
+import zipfile
+
+from io import BytesIO
+
+from django.test import TestCase
+
+from ..base import FORMAT
+from ..helpers.sniff_helpers import (
+    SNIFF_SIZE,
+    read_head,
+    is_csv,
+    sniff_head,
+    sniff_dataformat
+)
+
+
+CSV = b'Geometry,Name\n"POINT (30 10)",Meat\n"LINESTRING (1 2, 3 4)",Fish\n'
+GEOJSON = b'{\n  "type": "FeatureCollection",\n  "features": []\n}\n'
+GEOJSON_SEQ = (
+    b'{"type": "Feature", "geometry": null, "properties": {}}\n'
+    b'{"type": "Feature", "geometry": null, "properties": {}}\n'
+)
+KML = b'<?xml version="1.0"?>\n<kml xmlns="http://www.opengis.net/kml/2.2">'
+
+
+def compress(content):
+    """Compress content as gzip."""
+    file_obj = BytesIO()
+    with gzip.GzipFile(fileobj=file_obj, mode='wb') as gzip_file:
+        gzip_file.write(content)
+    file_obj.seek(0)
+    return file_obj
+
+
+class ReadHeadTest(TestCase):
+    """Test read_head method."""
+
+    def test_method(self):
+        """Test method."""
+        file_obj = BytesIO(b'a' * (SNIFF_SIZE * 2))
+        self.assertEqual(len(read_head(file_obj)), SNIFF_SIZE)
+        self.assertEqual(file_obj.tell(), 0)
+
+        file_obj = compress(CSV)
+        self.assertEqual(read_head(file_obj, 'gzip'), CSV)
+        self.assertEqual(file_obj.tell(), 0)
+
+
+class SniffHeadTest(TestCase):
+    """Test is_csv and sniff_head methods."""
+
+    def test_is_csv(self):
+        """Test is_csv method."""
+        self.assertTrue(is_csv(CSV.decode('utf-8'), complete=True))
+        self.assertTrue(is_csv(u'Name,Note\na,"b\nc"\n', complete=True))
+        self.assertTrue(is_csv(u'Geometry\nPOINT (30 10)\n', complete=True))
+        self.assertFalse(is_csv(u'Geometry\n', complete=True))
+        self.assertFalse(is_csv(u'Name\nMeat\n', complete=True))
+        self.assertFalse(is_csv(u'Name,Size\na,1,2\n', complete=True))
+        self.assertFalse(is_csv(u'Name,Size\na\n', complete=True))
+        self.assertFalse(is_csv(u'Any text.\nMore text.\n', complete=True))
+        self.assertFalse(is_csv(u'\n\n', complete=True))
+
+        # Last line might be cut when the file is not read whole
+        self.assertTrue(is_csv(u'Name,Size\na,1\nb,2,"cut', complete=False))
+
+    def test_method(self):
+        """Test method."""
+        self.assertEqual(sniff_head(CSV, True), FORMAT.CSV)
+        self.assertEqual(sniff_head(GEOJSON, True), FORMAT.GeoJSON)
+        self.assertEqual(
+            sniff_head(b'\xef\xbb\xbf' + GEOJSON, True),
+            FORMAT.GeoJSON
+        )
+        self.assertEqual(sniff_head(GEOJSON_SEQ, True), FORMAT.GeoJSONSeq)
+        self.assertEqual(
+            sniff_head(b'\x1e{"type": "Point"}\n', True),
+            FORMAT.GeoJSONSeq
+        )
+        self.assertEqual(sniff_head(KML, True), FORMAT.KML)
+        self.assertEqual(
+            sniff_head(b'SQLite format 3\x00' + b'\x00' * 52 + b'GPKG'),
+            FORMAT.GPKG
+        )
+
+        self.assertIsNone(sniff_head(b'SQLite format 3\x00' + b'\x00' * 60))
+        self.assertIsNone(sniff_head(b'\x89PNG\r\n\x1a\n\x00\x00\x00\r'))
+        self.assertIsNone(sniff_head(b'<?xml version="1.0"?>\n<gpx>'))
+        self.assertIsNone(sniff_head(b''))
+        self.assertIsNone(sniff_head(b'Any text, not a file of data.\n'))
+        self.assertIsNone(sniff_head(b'{"name": "Not GeoJSON"}\n', True))
+        self.assertIsNone(sniff_head(b'{\n  "type": "Topology"\n}\n', True))
+
+
+class SniffDataformatTest(TestCase):
+    """Test sniff_dataformat method."""
+
+    def test_method(self):
+        """Test method."""
+        self.assertEqual(
+            sniff_dataformat(BytesIO(CSV), 'data.kml'),
+            FORMAT.CSV
+        )
+        self.assertEqual(sniff_dataformat(BytesIO(KML)), FORMAT.KML)
+
+        # A whole feature on the first line is newline-delimited GeoJSON
+        self.assertEqual(
+            sniff_dataformat(BytesIO(GEOJSON_SEQ), 'data.json'),
+            FORMAT.GeoJSONSeq
+        )
+        self.assertEqual(
+            sniff_dataformat(BytesIO(GEOJSON), 'data.geojson'),
+            FORMAT.GeoJSON
+        )
+
+        # Name tells when the first line is longer than what is read
+        feature = (
+            b'{"type": "Feature", "geometry": null, "properties": {"a": "' +
+            b'a' * SNIFF_SIZE + b'"}}\n'
+        )
+        self.assertEqual(
+            sniff_dataformat(BytesIO(feature), 'data.json'),
+            FORMAT.GeoJSON
+        )
+        self.assertEqual(
+            sniff_dataformat(BytesIO(feature), 'data.ndjson'),
+            FORMAT.GeoJSONSeq
+        )
+
+    def test_method_with_compressed_file(self):
+        """Test method with compressed file."""
+        self.assertEqual(
+            sniff_dataformat(compress(CSV), 'data.csv.gz'),
+            FORMAT.CSV
+        )
+        self.assertEqual(
+            sniff_dataformat(compress(GEOJSON_SEQ), 'data.gz'),
+            FORMAT.GeoJSONSeq
+        )
+
+        file_obj = BytesIO()
+        with zipfile.ZipFile(file_obj, 'w') as archive:
+            archive.writestr('doc.kml', KML)
+
+        self.assertEqual(sniff_dataformat(file_obj), FORMAT.KML)
+        self.assertEqual(file_obj.tell(), 0)
+
+        file_obj = BytesIO()
+        with zipfile.ZipFile(file_obj, 'w') as archive:
+            archive.writestr('xl/workbook.xml', '<workbook/>')
+
+        self.assertEqual(sniff_dataformat(file_obj), FORMAT.XLSX)
+
+        file_obj = BytesIO()
+        with zipfile.ZipFile(file_obj, 'w') as archive:
+            archive.writestr('data.shp', '')
+
+        self.assertEqual(sniff_dataformat(file_obj), FORMAT.SHP)
+        self.assertIsNone(sniff_dataformat(compress(b''), 'data.shp.gz'))
@@ -0,0 +1,173 @@
+"""All tests for tile helpers."""
+
+import os
+import shutil
+import tempfile
+
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from .model_factories import DataImportFactory
+from ..models import DataImport
+from ..helpers.tile_helpers import (
+    WEB_MERCATOR_HALF_SIZE,
+    get_tile_bounds,
+    get_tile_path,
+    build_tile,
+    get_tile,
+    clear_tiles,
+    clear_stale_tiles
+)
+
+
+def get_postgis_version():
+    """Get the version of PostGIS, as a tuple of numbers."""
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT PostGIS_Lib_Version()')
+        version = cursor.fetchone()[0]
+
+    return tuple(int(part) for part in version.split('.')[:2])
+
+
+class GetTileBoundsTest(TestCase):
+    """Test get_tile_bounds method."""
+
+    def test_method(self):
+        """Test method."""
+        self.assertEqual(
+            get_tile_bounds(0, 0, 0),
+            (
+                -WEB_MERCATOR_HALF_SIZE,
+                -WEB_MERCATOR_HALF_SIZE,
+                WEB_MERCATOR_HALF_SIZE,
+                WEB_MERCATOR_HALF_SIZE
+            )
+        )
+        self.assertEqual(
+            get_tile_bounds(1, 1, 0),
+            (0, 0, WEB_MERCATOR_HALF_SIZE, WEB_MERCATOR_HALF_SIZE)
+        )
+
+    def test_method_when_tile_does_not_exist(self):
+        """Test method when tile does not exist."""
+        self.assertRaises(ValueError, get_tile_bounds, 1, 2, 0)
+        self.assertRaises(ValueError, get_tile_bounds, 1, 0, 2)
+        self.assertRaises(ValueError, get_tile_bounds, 23, 0, 0)
+
+
+class TileCacheTest(TestCase):
+    """Test caching of tiles."""
+
+    def setUp(self):
+        """Set up test."""
+        self.tiles_root = tempfile.mkdtemp()
+        self.settings = override_settings(
+            DATAIMPORTS_TILES_ROOT=self.tiles_root
+        )
+        self.settings.enable()
+        self.dataimport = DataImportFactory.create()
+
+    def tearDown(self):
+        """Tear down test."""
+        self.settings.disable()
+        shutil.rmtree(self.tiles_root, ignore_errors=True)
+
+        for dataimport in DataImport.objects.all():
+            if dataimport.file:
+                dataimport.file.delete()
+
+    def test_get_tile_path(self):
+        """Test get_tile_path method."""
+        path = get_tile_path(self.dataimport, 3, 4, 5)
+
+        self.assertTrue(path.startswith(self.tiles_root))
+        self.assertTrue(path.endswith(os.path.join('3', '4', '5.mvt')))
+
+        self.dataimport.save()
+        self.assertNotEqual(get_tile_path(self.dataimport, 3, 4, 5), path)
+
+    def test_get_tile_when_cached(self):
+        """Test get_tile method when tile is cached."""
+        path = get_tile_path(self.dataimport, 3, 4, 5)
+        os.makedirs(os.path.dirname(path))
+        with open(path, 'wb') as file_obj:
+            file_obj.write(b'cached')
+
+        self.assertEqual(get_tile(self.dataimport, 3, 4, 5), b'cached')
+
+    def test_clear_tiles(self):
+        """Test clear_tiles method."""
+        path = get_tile_path(self.dataimport, 3, 4, 5)
+        os.makedirs(os.path.dirname(path))
+        open(path, 'wb').close()
+
+        clear_tiles(self.dataimport)
+
+        self.assertFalse(os.path.exists(path))
+
+    def test_clear_stale_tiles(self):
+        """Test clear_stale_tiles method."""
+        stale_path = get_tile_path(self.dataimport, 3, 4, 5)
+        os.makedirs(os.path.dirname(stale_path))
+        open(stale_path, 'wb').close()
+
+        self.dataimport.save()
+        path = get_tile_path(self.dataimport, 3, 4, 5)
+        os.makedirs(os.path.dirname(path))
+        open(path, 'wb').close()
+
+        clear_stale_tiles(self.dataimport)
+
+        self.assertFalse(os.path.exists(stale_path))
+        self.assertTrue(os.path.exists(path))
+
+
+class BuildTileTest(TestCase):
+    """Test building tiles with PostGIS."""
+
+    def setUp(self):
+        """Set up test."""
+        if get_postgis_version() < (2, 4):
+            self.skipTest('Vector tiles require PostGIS 2.4 or greater.')
+
+        self.tiles_root = tempfile.mkdtemp()
+        self.settings = override_settings(
+            DATAIMPORTS_TILES_ROOT=self.tiles_root
+        )
+        self.settings.enable()
+        self.dataimport = DataImportFactory.create()
+
+    def tearDown(self):
+        """Tear down test."""
+        if not hasattr(self, 'settings'):
+            return
+
+        self.settings.disable()
+        shutil.rmtree(self.tiles_root, ignore_errors=True)
+
+        for dataimport in DataImport.objects.all():
+            if dataimport.file:
+                dataimport.file.delete()
+
+    def test_build_tile(self):
+        """Test build_tile method."""
+        self.assertTrue(build_tile(self.dataimport, 0, 0, 0))
+        # Data features are all north-east of the tile
+        self.assertEqual(build_tile(self.dataimport, 1, 0, 1), b'')
+
+        self.dataimport.datafeatures.update(imported=True)
+        self.assertEqual(build_tile(self.dataimport, 0, 0, 0), b'')
+
+    def test_get_tile(self):
+        """Test get_tile method, clearing stale tiles."""
+        stale_path = get_tile_path(self.dataimport, 0, 0, 0)
+        tile = get_tile(self.dataimport, 0, 0, 0)
+
+        self.assertTrue(os.path.isfile(stale_path))
+
+        self.dataimport.save()
+        self.assertEqual(get_tile(self.dataimport, 0, 0, 0), tile)
+        self.assertFalse(os.path.exists(stale_path))
+        self.assertTrue(
+            os.path.isfile(get_tile_path(self.dataimport, 0, 0, 0))
+        )
@@ -0,0 +1,114 @@
+"""All tests for upload helpers."""
+
+import os
+import base64
+import hashlib
+
+from io import BytesIO
+
+from django.core.files.storage import default_storage
+from django.test import TestCase
+
+from .model_factories import DataUploadFactory
+from ..exceptions import UploadChecksumError, UploadOffsetError
+from ..helpers.upload_helpers import (
+    parse_chunk_checksum,
+    append_chunk,
+    get_checksum,
+    store_upload
+)
+
+
+CONTENT = b'Geometry,Name\n"POINT (30 10)",Meat\n'
+
+
+class ParseChecksumTest(TestCase):
+    """Test parse_chunk_checksum method."""
+
+    def test_parse_chunk_checksum(self):
+        """Test parse_chunk_checksum method."""
+        digest = hashlib.sha256(CONTENT).digest()
+        encoded = base64.b64encode(digest).decode('ascii')
+
+        self.assertRaises(ValueError, parse_chunk_checksum, None)
+        self.assertEqual(parse_chunk_checksum('sha256 %s' % encoded), digest)
+        self.assertRaises(ValueError, parse_chunk_checksum, 'md5 %s' % encoded)
+        self.assertRaises(ValueError, parse_chunk_checksum, 'sha256 YWJj')
+
+
+class UploadTest(TestCase):
+    """Test append_chunk, get_checksum and store_upload methods."""
+
+    def setUp(self):
+        """Set up test."""
+        self.upload = DataUploadFactory.create(size=len(CONTENT))
+        self.name = None
+
+    def tearDown(self):
+        """Tear down test."""
+        if os.path.isfile(self.upload.get_path()):
+            os.remove(self.upload.get_path())
+        if self.name:
+            default_storage.delete(self.name)
+
+    def append(self, start, end, checksum=None):
+        """Append a part of the content as a chunk."""
+        return append_chunk(
+            self.upload,
+            BytesIO(CONTENT[start:end]),
+            start,
+            end - start,
+            checksum or hashlib.sha256(CONTENT[start:end]).digest()
+        )
+
+    def test_append_chunk(self):
+        """Test append_chunk method."""
+        self.assertEqual(self.append(0, 10), 10)
+        self.assertRaises(UploadOffsetError, self.append, 5, 10)
+        self.assertRaises(ValueError, self.append, 10, len(CONTENT) + 1)
+
+        self.assertEqual(
+            self.append(10, 20, hashlib.sha256(CONTENT[10:20]).digest()),
+            20
+        )
+        self.assertRaises(UploadChecksumError, self.append, 20, 30, b'0' * 32)
+        self.assertEqual(os.path.getsize(self.upload.get_path()), 20)
+
+        self.assertEqual(self.append(20, len(CONTENT)), len(CONTENT))
+        with open(self.upload.get_path(), 'rb') as file_obj:
+            self.assertEqual(file_obj.read(), CONTENT)
+
+    def test_append_chunk_when_incomplete(self):
+        """Test append_chunk method when chunk is not received in full."""
+        self.assertRaises(
+            ValueError,
+            append_chunk,
+            self.upload,
+            BytesIO(CONTENT[:5]),
+            0,
+            10,
+            hashlib.sha256(CONTENT[:10]).digest()
+        )
+        self.assertEqual(os.path.getsize(self.upload.get_path()), 0)
+        self.assertEqual(self.append(0, 10), 10)
+
+    def test_store_upload(self):
+        """Test store_upload method."""
+        self.append(0, 10)
+        self.assertRaises(ValueError, store_upload, self.upload)
+
+        self.upload.refresh_from_db()
+        self.append(10, len(CONTENT))
+        self.upload.refresh_from_db()
+        self.assertEqual(
+            get_checksum(self.upload.get_path()),
+            hashlib.sha256(CONTENT).hexdigest()
+        )
+
+        self.name, checksum = store_upload(self.upload)
+
+        self.assertEqual(checksum, hashlib.sha256(CONTENT).hexdigest())
+        self.assertTrue(self.name.startswith('dataimports/files/test_csv'))
+        self.assertFalse(os.path.isfile(self.upload.get_path()))
+        with default_storage.open(self.name, 'rb') as file_obj:
+            self.assertEqual(file_obj.read(), CONTENT)
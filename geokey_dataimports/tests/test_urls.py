@@ -11,10 +11,19 @@ from ..views import (
     DataImportCreateCategoryPage,
     DataImportAssignFieldsPage,
     DataImportAllDataFeaturesPage,
-    RemoveDataImportPage
+    RemoveDataImportPage,
+    DataImportDataFeaturesJSON,
+    DataImportDataFeaturesClusters,
+    DataImportDataFeaturesTile,
+    DataImportUploadsAPI,
+    DataImportUploadAPI,
+    DataImportUploadCompleteAPI
 )
 
 
+UPLOAD_ID = '0b3ea1a4-3fc1-4a5e-9f3c-6a1d2f6d9c10'
+
+
 class UrlsTest(TestCase):
     """Test all URLs."""
 
@@ -171,3 +180,151 @@ class UrlsTest(TestCase):
         )
         self.assertEqual(int(resolved_url.kwargs['project_id']), 1)
         self.assertEqual(int(resolved_url.kwargs['dataimport_id']), 5)
+
+    # ###########################
+    # TEST AJAX API
+    # ###########################
+
+    def test_data_import_datafeatures_geojson_reverse(self):
+        """Test reverser for data import data features (GeoJSON) API."""
+        reversed_url = reverse(
+            'geokey_dataimports:dataimport_datafeatures_geojson',
+            kwargs={'project_id': 1, 'dataimport_id': 5}
+        )
+        self.assertEqual(
+            reversed_url,
+            '/admin/projects/1/dataimports/5/datafeatures/geojson/'
+        )
+
+    def test_data_import_datafeatures_geojson_resolve(self):
+        """Test resolver for data import data features (GeoJSON) API."""
+        resolved_url = resolve(
+            '/admin/projects/1/dataimports/5/datafeatures/geojson/'
+        )
+        self.assertEqual(
+            resolved_url.func.__name__,
+            DataImportDataFeaturesJSON.__name__
+        )
+        self.assertEqual(int(resolved_url.kwargs['project_id']), 1)
+        self.assertEqual(int(resolved_url.kwargs['dataimport_id']), 5)
+
+    def test_data_import_datafeatures_clusters_reverse(self):
+        """Test reverser for data import data feature clusters API."""
+        reversed_url = reverse(
+            'geokey_dataimports:dataimport_datafeatures_clusters',
+            kwargs={'project_id': 1, 'dataimport_id': 5}
+        )
+        self.assertEqual(
+            reversed_url,
+            '/admin/projects/1/dataimports/5/datafeatures/clusters/'
+        )
+
+    def test_data_import_datafeatures_clusters_resolve(self):
+        """Test resolver for data import data feature clusters API."""
+        resolved_url = resolve(
+            '/admin/projects/1/dataimports/5/datafeatures/clusters/'
+        )
+        self.assertEqual(
+            resolved_url.func.__name__,
+            DataImportDataFeaturesClusters.__name__
+        )
+        self.assertEqual(int(resolved_url.kwargs['project_id']), 1)
+        self.assertEqual(int(resolved_url.kwargs['dataimport_id']), 5)
+
+    def test_data_import_datafeatures_tile_reverse(self):
+        """Test reverser for data import data features (MVT) API."""
+        reversed_url = reverse(
+            'geokey_dataimports:dataimport_datafeatures_tile',
+            kwargs={
+                'project_id': 1,
+                'dataimport_id': 5,
+                'z': 2,
+                'x': 1,
+                'y': 3
+            }
+        )
+        self.assertEqual(
+            reversed_url,
+            '/admin/projects/1/dataimports/5/tiles/2/1/3.mvt'
+        )
+
+    def test_data_import_datafeatures_tile_resolve(self):
+        """Test resolver for data import data features (MVT) API."""
+        resolved_url = resolve(
+            '/admin/projects/1/dataimports/5/tiles/2/1/3.mvt'
+        )
+        self.assertEqual(
+            resolved_url.func.__name__,
+            DataImportDataFeaturesTile.__name__
+        )
+        self.assertEqual(int(resolved_url.kwargs['project_id']), 1)
+        self.assertEqual(int(resolved_url.kwargs['dataimport_id']), 5)
+        self.assertEqual(int(resolved_url.kwargs['z']), 2)
+        self.assertEqual(int(resolved_url.kwargs['x']), 1)
+        self.assertEqual(int(resolved_url.kwargs['y']), 3)
+
+    def test_data_import_uploads_reverse(self):
+        """Test reverser for data import uploads API."""
+        reversed_url = reverse(
+            'geokey_dataimports:dataimport_uploads',
+            kwargs={'project_id': 1}
+        )
+        self.assertEqual(
+            reversed_url,
+            '/admin/projects/1/dataimports/uploads/'
+        )
+
+    def test_data_import_uploads_resolve(self):
+        """Test resolver for data import uploads API."""
+        resolved_url = resolve('/admin/projects/1/dataimports/uploads/')
+        self.assertEqual(
+            resolved_url.func.__name__,
+            DataImportUploadsAPI.__name__
+        )
+        self.assertEqual(int(resolved_url.kwargs['project_id']), 1)
+
+    def test_data_import_upload_reverse(self):
+        """Test reverser for data import upload API."""
+        reversed_url = reverse(
+            'geokey_dataimports:dataimport_upload',
+            kwargs={'project_id': 1, 'upload_id': UPLOAD_ID}
+        )
+        self.assertEqual(
+            reversed_url,
+            '/admin/projects/1/dataimports/uploads/%s/' % UPLOAD_ID
+        )
+
+    def test_data_import_upload_resolve(self):
+        """Test resolver for data import upload API."""
+        resolved_url = resolve(
+            '/admin/projects/1/dataimports/uploads/%s/' % UPLOAD_ID
+        )
+        self.assertEqual(
+            resolved_url.func.__name__,
+            DataImportUploadAPI.__name__
+        )
+        self.assertEqual(int(resolved_url.kwargs['project_id']), 1)
+        self.assertEqual(resolved_url.kwargs['upload_id'], UPLOAD_ID)
+
+    def test_data_import_upload_complete_reverse(self):
+        """Test reverser for data import upload completion API."""
+        reversed_url = reverse(
+            'geokey_dataimports:dataimport_upload_complete',
+            kwargs={'project_id': 1, 'upload_id': UPLOAD_ID}
+        )
+        self.assertEqual(
+            reversed_url,
+            '/admin/projects/1/dataimports/uploads/%s/complete/' % UPLOAD_ID
+        )
+
+    def test_data_import_upload_complete_resolve(self):
+        """Test resolver for data import upload completion API."""
+        resolved_url = resolve(
+            '/admin/projects/1/dataimports/uploads/%s/complete/' % UPLOAD_ID
+        )
+        self.assertEqual(
+            resolved_url.func.__name__,
+            DataImportUploadCompleteAPI.__name__
+        )
+        self.assertEqual(int(resolved_url.kwargs['project_id']), 1)
+        self.assertEqual(resolved_url.kwargs['upload_id'], UPLOAD_ID)
@@ -2,12 +2,18 @@
 
 import os
 import json
+import base64
+import hashlib
 
+from django.core.cache import cache
 from django.core.files import File
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.core.urlresolvers import reverse
 from django.http import HttpRequest
 from django.template.loader import render_to_string
+from django.db import connection
 from django.test import TestCase, RequestFactory
+from django.test.utils import CaptureQueriesContext
 from django.contrib.messages import get_messages
 from django.contrib.messages.storage.fallback import FallbackStorage
 from django.contrib.auth.models import AnonymousUser
@@ -24,9 +30,11 @@ from geokey.categories.tests.model_factories import (
 from geokey.contributions.models import Observation
 
 from .helpers import file_helpers
-from .model_factories import DataImportFactory
+from .model_factories import DataImportFactory, DataFeatureFactory
+from ..base import FORMAT
 from ..helpers.context_helpers import does_not_exist_msg
-from ..models import DataImport, DataField, DataFeature
+from ..helpers.feature_helpers import get_extent
+from ..models import DataImport, DataField, DataFeature, DataUpload
 from ..forms import CategoryForm, DataImportForm
 from ..views import (
     IndexPage,
@@ -36,7 +44,14 @@ from ..views import (
     DataImportCreateCategoryPage,
     DataImportAssignFieldsPage,
     DataImportAllDataFeaturesPage,
-    RemoveDataImportPage
+    RemoveDataImportPage,
+    DataImportDataFeaturesJSON,
+    DataImportDataFeaturesClusters,
+    DataImportDataFeaturesTile,
+    DataImportUploadsAPI,
+    DataImportUploadAPI,
+    DataImportUploadCompleteAPI,
+    UNSUPPORTED_FILE_MSG
 )
 
 
@@ -206,6 +221,42 @@ class IndexPageTest(TestCase):
             rendered
         )
 
+    def test_get_with_user_paginated(self):
+        """
+        Test GET with with user, when projects do not fit on one page.
+
+        It should render the page requested, with data imports counted for
+        projects of that page.
+        """
+        self.request.user = self.user
+        view = IndexPage.as_view(paginate_by=2)
+
+        response = view(self.request)
+        self.assertEqual(
+            response.context_data['projects'],
+            [self.project_1, self.project_2]
+        )
+        self.assertEqual(
+            [
+                project.dataimports_count
+                for project in response.context_data['projects']
+            ],
+            [0, 1]
+        )
+
+        self.request.GET['page'] = '2'
+        response = view(self.request)
+        self.assertEqual(response.context_data['projects'], [self.project_3])
+        self.assertEqual(
+            response.context_data['projects'][0].dataimports_count,
+            0
+        )
+        self.assertIn('Page 2 of 2', response.render().content.decode('utf-8'))
+
+        self.request.GET['page'] = '3'
+        response = view(self.request)
+        self.assertEqual(response.context_data['page_obj'].number, 2)
+
 
 class AllDataImportsPageTest(TestCase):
     """Test all data imports page."""
@@ -229,6 +280,12 @@ class AllDataImportsPageTest(TestCase):
         messages = FallbackStorage(self.request)
         setattr(self.request, '_messages', messages)
 
+    def tearDown(self):
+        """Tear down test."""
+        for dataimport in DataImport.objects.all():
+            if dataimport.file:
+                dataimport.file.delete()
+
     def test_get_with_anonymous(self):
         """
         Test GET with with anonymous.
@@ -313,7 +370,8 @@ class AllDataImportsPageTest(TestCase):
                 'PLATFORM_NAME': get_current_site(self.request).name,
                 'user': self.request.user,
                 'messages': get_messages(self.request),
-                'project': self.project
+                'project': self.project,
+                'dataimports': self.project.dataimports.all()
             }
         )
 
@@ -323,6 +381,31 @@ class AllDataImportsPageTest(TestCase):
             rendered
         )
 
+    def test_get_with_admin_in_constant_queries(self):
+        """
+        Test GET with with admin, when project has data imports.
+
+        It should list data imports in the same number of queries, no matter
+        how many data imports there are.
+        """
+        self.request.user = self.admin
+        DataImportFactory.create(project=self.project)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.view(self.request, project_id=self.project.id).render()
+        num_queries = len(queries)
+
+        DataImportFactory.create(project=self.project)
+        DataImportFactory.create(project=self.project)
+
+        with self.assertNumQueries(num_queries):
+            response = self.view(
+                self.request,
+                project_id=self.project.id
+            ).render()
+
+        self.assertEqual(response.status_code, 200)
+
     def test_get_when_no_project(self):
         """
         Test GET with with admin, when project does not exist.
@@ -715,6 +798,34 @@ class AddDataImportPageTest(TestCase):
         self.assertEqual(DataField.objects.count(), 0)
         self.assertEqual(DataFeature.objects.count(), 0)
 
+    def test_post_when_unsupported_file(self):
+        """
+        Test POST with with admin, when file is not supported.
+
+        It should inform user that the file is not supported, without
+        parsing it, whatever content type the browser sets.
+        """
+        self.data['file'] = SimpleUploadedFile(
+            'data.kml',
+            b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR',
+            content_type='application/octet-stream'
+        )
+        request = self.factory.post(self.url, self.data)
+        request.user = self.admin
+
+        setattr(request, 'session', 'session')
+        messages = FallbackStorage(request)
+        setattr(request, '_messages', messages)
+
+        response = self.view(request, project_id=self.project.id).render()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            UNSUPPORTED_FILE_MSG,
+            [str(message) for message in get_messages(request)]
+        )
+        self.assertEqual(DataImport.objects.count(), 0)
+
     def test_post_when_no_project(self):
         """
         Test POST with with admin, when project does not exist.
@@ -2468,17 +2579,9 @@ class DataImportAllDataFeaturesPageTest(TestCase):
         )
 
         ids = []
-        self.datafeatures = {
-            'type': 'FeatureCollection',
-            'features': []
-        }
         for datafeature in self.dataimport.datafeatures.all():
-            self.datafeatures['features'].append({
-                'type': 'Feature',
-                'id': datafeature.id,
-                'geometry': json.loads(datafeature.geometry.json)
-            })
             ids.append(datafeature.id)
+        self.extent = get_extent(self.dataimport)
 
         self.data = {
             'ids': json.dumps(ids)
@@ -2608,7 +2711,7 @@ class DataImportAllDataFeaturesPageTest(TestCase):
                 'messages': get_messages(self.request),
                 'project': self.project,
                 'dataimport': self.dataimport,
-                'datafeatures': self.datafeatures
+                'extent': self.extent
             }
         )
 
@@ -2855,6 +2958,69 @@ class DataImportAllDataFeaturesPageTest(TestCase):
         self.assertEqual(DataFeature.objects.filter(imported=True).count(), 0)
         self.assertEqual(Observation.objects.count(), 0)
 
+    def post_selection(self, selection):
+        """Make POST request to the view with a selection."""
+        request = self.factory.post(
+            self.url,
+            {'selection': json.dumps(selection)}
+        )
+        request.user = self.admin
+
+        setattr(request, 'session', 'session')
+        messages = FallbackStorage(request)
+        setattr(request, '_messages', messages)
+
+        return self.view(
+            request,
+            project_id=self.project.id,
+            dataimport_id=self.dataimport.id
+        )
+
+    def test_post_with_selection(self):
+        """
+        Test POST with with admin, when a selection is provided.
+
+        It should convert all selected data features to contributions.
+        """
+        excluded = self.dataimport.datafeatures.order_by('id').first()
+        response = self.post_selection({
+            'type': 'all',
+            'exclude': [excluded.id]
+        })
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(DataFeature.objects.filter(imported=True).count(), 2)
+        self.assertFalse(DataFeature.objects.get(pk=excluded.id).imported)
+        self.assertEqual(Observation.objects.count(), 2)
+
+    def test_post_with_properties_selection(self):
+        """
+        Test POST with with admin, when properties are selected.
+
+        It should convert data features having the properties to
+        contributions.
+        """
+        response = self.post_selection({
+            'type': 'properties',
+            'properties': {'Name': 'Meat'}
+        })
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(DataFeature.objects.filter(imported=True).count(), 1)
+        self.assertEqual(Observation.objects.count(), 1)
+
+    def test_post_when_wrong_selection(self):
+        """
+        Test POST with with admin, when selection is not valid.
+
+        It should not convert data features to contributions.
+        """
+        response = self.post_selection({'type': 'everything'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(DataFeature.objects.filter(imported=True).count(), 0)
+        self.assertEqual(Observation.objects.count(), 0)
+
     def test_post_when_no_project(self):
         """
         Test POST with with admin, when project does not exist.
@@ -2965,7 +3131,7 @@ class DataImportAllDataFeaturesPageTest(TestCase):
                 'messages': get_messages(request),
                 'project': self.project,
                 'dataimport': self.dataimport,
-                'datafeatures': self.datafeatures
+                'extent': self.extent
             }
         )
 
@@ -3009,7 +3175,7 @@ class DataImportAllDataFeaturesPageTest(TestCase):
                 'messages': get_messages(request),
                 'project': self.project,
                 'dataimport': self.dataimport,
-                'datafeatures': self.datafeatures
+                'extent': self.extent
             }
         )
 
@@ -3052,7 +3218,7 @@ class DataImportAllDataFeaturesPageTest(TestCase):
                 'messages': get_messages(request),
                 'project': self.project,
                 'dataimport': self.dataimport,
-                'datafeatures': self.datafeatures
+                'extent': self.extent
             }
         )
 
@@ -3296,3 +3462,712 @@ class RemoveDataImportPageTest(TestCase):
             response['location']
         )
         self.assertEqual(DataImport.objects.count(), 1)
+
+
+# ###########################
+# TESTS FOR AJAX API
+# ###########################
+
+class DataImportDataFeaturesJSONTest(TestCase):
+    """Test data import data features (GeoJSON) API."""
+
+    def setUp(self):
+        """Set up test."""
+        self.factory = RequestFactory()
+        self.view = DataImportDataFeaturesJSON.as_view()
+
+        self.user = UserFactory.create()
+        self.admin = UserFactory.create()
+
+        self.project = ProjectFactory.create(add_admins=[self.admin])
+        self.dataimport = DataImportFactory.create(project=self.project)
+        DataFeatureFactory.create(imported=True, dataimport=self.dataimport)
+        self.ids = list(
+            self.dataimport.datafeatures.filter(
+                imported=False
+            ).order_by('id').values_list('id', flat=True)
+        )
+        self.url = reverse(
+            'geokey_dataimports:dataimport_datafeatures_geojson',
+            kwargs={
+                'project_id': self.project.id,
+                'dataimport_id': self.dataimport.id
+            }
+        )
+
+    def tearDown(self):
+        """Tear down test."""
+        for dataimport in DataImport.objects.all():
+            if dataimport.file:
+                dataimport.file.delete()
+
+    def get(self, user, params=None, dataimport_id=None):
+        """Make GET request to the view."""
+        request = self.factory.get(self.url, params or {})
+        request.user = user
+
+        return self.view(
+            request,
+            project_id=self.project.id,
+            dataimport_id=dataimport_id or self.dataimport.id
+        )
+
+    def get_content(self, response):
+        """Get decoded content of a response."""
+        if response.streaming:
+            content = b''.join(response.streaming_content)
+        else:
+            content = response.content
+
+        return json.loads(content.decode('utf-8'))
+
+    def test_get_with_anonymous(self):
+        """
+        Test GET with with anonymous.
+
+        It should redirect to login page.
+        """
+        response = self.get(AnonymousUser())
+
+        self.assertEqual(response.status_code, 302)
+        self.assertIn('/admin/account/login/', response['location'])
+
+    def test_get_with_user(self):
+        """
+        Test GET with with user.
+
+        It should not return data features, when user is not an
+        administrator.
+        """
+        response = self.get(self.user)
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_get_when_no_dataimport(self):
+        """
+        Test GET with with admin, when data import does not exist.
+
+        It should not return data features.
+        """
+        response = self.get(
+            self.admin,
+            dataimport_id=self.dataimport.id + 123
+        )
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_get_with_admin(self):
+        """
+        Test GET with with admin.
+
+        It should return all data features that are not imported yet.
+        """
+        response = self.get(self.admin)
+        content = self.get_content(response)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(content['type'], 'FeatureCollection')
+        self.assertEqual(
+            [feature['id'] for feature in content['features']],
+            self.ids
+        )
+        self.assertIsNone(content['next'])
+
+    def test_get_with_cursor(self):
+        """
+        Test GET with with admin, when paginating.
+
+        It should return data features page by page.
+        """
+        response = self.get(self.admin, {'limit': 2})
+        content = self.get_content(response)
+
+        self.assertEqual(
+            [feature['id'] for feature in content['features']],
+            self.ids[:2]
+        )
+        self.assertEqual(content['next'], self.ids[1])
+
+        response = self.get(self.admin, {'limit': 2, 'after': content['next']})
+        content = self.get_content(response)
+
+        self.assertEqual(
+            [feature['id'] for feature in content['features']],
+            self.ids[2:]
+        )
+        self.assertIsNone(content['next'])
+
+    def test_get_with_bbox(self):
+        """
+        Test GET with with admin, when filtering by a bounding box.
+
+        It should only return data features overlapping the bounding box.
+        """
+        response = self.get(self.admin, {'bbox': '25,5,35,15'})
+        content = self.get_content(response)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            self.ids[0],
+            [feature['id'] for feature in content['features']]
+        )
+
+        response = self.get(self.admin, {'bbox': '100,-60,110,-50'})
+        content = self.get_content(response)
+
+        self.assertEqual(content['features'], [])
+
+    def test_get_with_where(self):
+        """
+        Test GET with with admin, when filtering by properties.
+
+        It should only return data features meeting the filter, or inform
+        user that the filter is not valid.
+        """
+        response = self.get(self.admin, {'where': '{"Name": "Meat"}'})
+        content = self.get_content(response)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [feature['id'] for feature in content['features']],
+            [self.ids[0]]
+        )
+
+        response = self.get(self.admin, {'where': '{"Name": {"like": 1}}'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_get_with_zoom(self):
+        """
+        Test GET with with admin, when simplifying geometries.
+
+        It should return all data features that are not imported yet, page
+        by page, and cache pages.
+        """
+        cache.clear()
+
+        response = self.get(self.admin, {'zoom': 3})
+        content = self.get_content(response)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(
+            [feature['id'] for feature in content['features']],
+            self.ids
+        )
+
+        response = self.get(self.admin, {'zoom': 3})
+        self.assertFalse(response.streaming)
+        self.assertEqual(self.get_content(response), content)
+
+        params = {'zoom': 3, 'after': self.ids[0], 'limit': 1}
+        response = self.get(self.admin, params)
+        content = self.get_content(response)
+
+        self.assertEqual(
+            [feature['id'] for feature in content['features']],
+            [self.ids[1]]
+        )
+        self.assertEqual(content['next'], self.ids[1])
+
+        # Bounding box is aligned to the tiles of the zoom level
+        params = {'zoom': 3, 'bbox': '31,11,32,12'}
+        response = self.get(self.admin, params)
+        content = self.get_content(response)
+
+        self.assertIn(
+            self.ids[0],
+            [feature['id'] for feature in content['features']]
+        )
+
+    def test_get_when_wrong_parameters(self):
+        """
+        Test GET with with admin, when parameters are not valid.
+
+        It should inform user about a bad request.
+        """
+        for params in [
+            {'bbox': '1,2'},
+            {'limit': 0},
+            {'after': 'x'},
+            {'tolerance': -1}
+        ]:
+            response = self.get(self.admin, params)
+            self.assertEqual(response.status_code, 400)
+
+
+class DataImportDataFeaturesClustersTest(TestCase):
+    """Test data import data feature clusters API."""
+
+    def setUp(self):
+        """Set up test."""
+        self.factory = RequestFactory()
+        self.view = DataImportDataFeaturesClusters.as_view()
+
+        self.user = UserFactory.create()
+        self.admin = UserFactory.create()
+
+        self.project = ProjectFactory.create(add_admins=[self.admin])
+        self.dataimport = DataImportFactory.create(project=self.project)
+        self.url = reverse(
+            'geokey_dataimports:dataimport_datafeatures_clusters',
+            kwargs={
+                'project_id': self.project.id,
+                'dataimport_id': self.dataimport.id
+            }
+        )
+
+    def tearDown(self):
+        """Tear down test."""
+        for dataimport in DataImport.objects.all():
+            if dataimport.file:
+                dataimport.file.delete()
+
+    def get(self, user, params=None):
+        """Make GET request to the view."""
+        request = self.factory.get(self.url, params or {})
+        request.user = user
+
+        return self.view(
+            request,
+            project_id=self.project.id,
+            dataimport_id=self.dataimport.id
+        )
+
+    def get_content(self, response):
+        """Get decoded content of a response."""
+        if response.streaming:
+            content = b''.join(response.streaming_content)
+        else:
+            content = response.content
+
+        return json.loads(content.decode('utf-8'))
+
+    def test_get_with_anonymous(self):
+        """
+        Test GET with with anonymous.
+
+        It should redirect to login page.
+        """
+        response = self.get(AnonymousUser(), {'zoom': 0})
+
+        self.assertEqual(response.status_code, 302)
+        self.assertIn('/admin/account/login/', response['location'])
+
+    def test_get_with_user(self):
+        """
+        Test GET with with user.
+
+        It should not return clusters, when user is not an administrator.
+        """
+        self.assertEqual(self.get(self.user, {'zoom': 0}).status_code, 404)
+
+    def test_get_with_admin(self):
+        """
+        Test GET with with admin.
+
+        It should return clusters of all data features.
+        """
+        response = self.get(self.admin, {'zoom': 0})
+        content = self.get_content(response)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            sum(
+                feature['properties']['count']
+                for feature in content['features']
+            ),
+            3
+        )
+
+    def test_get_with_bbox(self):
+        """
+        Test GET with with admin, when filtering by a bounding box.
+
+        It should only return clusters within the bounding box.
+        """
+        response = self.get(self.admin, {'zoom': 0, 'bbox': '100,-60,110,-50'})
+        content = self.get_content(response)
+
+        self.assertEqual(content['features'], [])
+
+    def test_get_when_zoomed_in(self):
+        """
+        Test GET with with admin, when zoomed in.
+
+        It should return data features instead of clusters.
+        """
+        response = self.get(self.admin, {'zoom': 20})
+        content = self.get_content(response)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(content['features']), 3)
+        self.assertIn('id', content['features'][0])
+
+    def test_get_when_no_zoom(self):
+        """
+        Test GET with with admin, when zoom level is not provided.
+
+        It should inform user about a bad request.
+        """
+        self.assertEqual(self.get(self.admin).status_code, 400)
+
+
+class DataImportDataFeaturesTileTest(TestCase):
+    """Test data import data features (MVT) API."""
+
+    def setUp(self):
+        """Set up test."""
+        self.factory = RequestFactory()
+        self.view = DataImportDataFeaturesTile.as_view()
+
+        self.user = UserFactory.create()
+        self.admin = UserFactory.create()
+
+        self.project = ProjectFactory.create(add_admins=[self.admin])
+        self.dataimport = DataImportFactory.create(project=self.project)
+
+    def tearDown(self):
+        """Tear down test."""
+        for dataimport in DataImport.objects.all():
+            if dataimport.file:
+                dataimport.file.delete()
+
+    def get(self, user, z=0, x=0, y=0):
+        """Make GET request to the view."""
+        url = reverse(
+            'geokey_dataimports:dataimport_datafeatures_tile',
+            kwargs={
+                'project_id': self.project.id,
+                'dataimport_id': self.dataimport.id,
+                'z': z,
+                'x': x,
+                'y': y
+            }
+        )
+        request = self.factory.get(url)
+        request.user = user
+
+        return self.view(
+            request,
+            project_id=self.project.id,
+            dataimport_id=self.dataimport.id,
+            z=z,
+            x=x,
+            y=y
+        )
+
+    def test_get_with_anonymous(self):
+        """
+        Test GET with with anonymous.
+
+        It should redirect to login page.
+        """
+        response = self.get(AnonymousUser())
+
+        self.assertEqual(response.status_code, 302)
+        self.assertIn('/admin/account/login/', response['location'])
+
+    def test_get_with_user(self):
+        """
+        Test GET with with user.
+
+        It should not return a tile, when user is not an administrator.
+        """
+        self.assertEqual(self.get(self.user).status_code, 404)
+
+    def test_get_when_tile_does_not_exist(self):
+        """
+        Test GET with with admin, when tile does not exist.
+
+        It should inform user that tile does not exist.
+        """
+        self.assertEqual(self.get(self.admin, z=1, x=2).status_code, 404)
+
+
+class DataImportUploadAPITest(TestCase):
+    """Test data import uploads, upload and upload completion API."""
+
+    def setUp(self):
+        """Set up test."""
+        self.factory = RequestFactory()
+
+        self.user = UserFactory.create()
+        self.admin = UserFactory.create()
+
+        self.project = ProjectFactory.create(add_admins=[self.admin])
+        self.category = CategoryFactory.create(project=self.project)
+
+        with open(file_helpers.get_csv_file().name, 'rb') as file_obj:
+            self.content = file_obj.read()
+        self.data = {
+            'name': 'Test data import',
+            'description': '',
+            'category_create': 'false',
+            'category': self.category.id,
+            'filename': 'test_csv.csv',
+            'content_type': 'text/csv',
+            'size': len(self.content)
+        }
+
+    def tearDown(self):
+        """Tear down test."""
+        for upload in DataUpload.objects.all():
+            upload.delete()
+        for dataimport in DataImport._base_manager.all():
+            if dataimport.file:
+                dataimport.file.delete()
+
+    def start(self, user, data):
+        """Make POST request to start an upload."""
+        request = self.factory.post(
+            reverse(
+                'geokey_dataimports:dataimport_uploads',
+                kwargs={'project_id': self.project.id}
+            ),
+            data
+        )
+        request.user = user
+
+        return DataImportUploadsAPI.as_view()(
+            request,
+            project_id=self.project.id
+        )
+
+    def send(self, user, upload_id, offset, chunk, checksum=None):
+        """Make PATCH request to send a chunk (with its checksum)."""
+        if checksum is None:
+            checksum = 'sha256 %s' % base64.b64encode(
+                hashlib.sha256(chunk).digest()
+            ).decode('ascii')
+
+        headers = {'HTTP_UPLOAD_OFFSET': str(offset)}
+        if checksum:
+            headers['HTTP_UPLOAD_CHECKSUM'] = checksum
+
+        request = self.factory.patch(
+            '/',
+            chunk,
+            content_type='application/offset+octet-stream',
+            **headers
+        )
+        request.user = user
+
+        return DataImportUploadAPI.as_view()(
+            request,
+            project_id=self.project.id,
+            upload_id=upload_id
+        )
+
+    def complete(self, user, upload_id):
+        """Make POST request to complete an upload."""
+        request = self.factory.post('/')
+        request.user = user
+        setattr(request, 'session', 'session')
+        setattr(request, '_messages', FallbackStorage(request))
+
+        return DataImportUploadCompleteAPI.as_view()(
+            request,
+            project_id=self.project.id,
+            upload_id=upload_id
+        )
+
+    def test_start_with_anonymous(self):
+        """
+        Test POST with with anonymous.
+
+        It should redirect to login page.
+        """
+        response = self.start(AnonymousUser(), self.data)
+
+        self.assertEqual(response.status_code, 302)
+        self.assertIn('/admin/account/login/', response['location'])
+
+    def test_start_with_user(self):
+        """
+        Test POST with with user.
+
+        It should not start an upload, when user is not an administrator.
+        """
+        self.assertEqual(self.start(self.user, self.data).status_code, 404)
+        self.assertEqual(DataUpload.objects.count(), 0)
+
+    def test_start_with_wrong_input(self):
+        """
+        Test POST with with admin, when parameters are not valid.
+
+        It should inform user that the request is not valid.
+        """
+        for key, value in (
+            ('name', ''),
+            ('size', 'a'),
+            ('srid', '999999'),
+            ('category', 'a')
+        ):
+            data = dict(self.data)
+            data[key] = value
+            self.assertEqual(self.start(self.admin, data).status_code, 400)
+
+        self.assertEqual(DataUpload.objects.count(), 0)
+
+    def test_start_without_content_type(self):
+        """
+        Test POST with with admin, when browser sets no content type.
+
+        It should start an upload, leaving the data format to the content of
+        the file once uploaded in full.
+        """
+        content = json.dumps({
+            'type': 'FeatureCollection',
+            'features': [{
+                'type': 'Feature',
+                'geometry': {'type': 'Point', 'coordinates': [30, 10]},
+                'properties': {'name': 'Test'}
+            }]
+        }).encode('utf-8')
+
+        for filename, content_type in (
+            ('data.kml', ''),
+            ('data.kml', 'application/vnd.google-earth.kml+xml'),
+            ('data.geojson', 'application/geo+json')
+        ):
+            data = dict(self.data)
+            data['filename'] = filename
+            data['content_type'] = content_type
+            self.assertEqual(self.start(self.admin, data).status_code, 201)
+
+        data = dict(self.data)
+        data['filename'] = 'data.geojson'
+        data['content_type'] = ''
+        data['size'] = len(content)
+        upload = json.loads(
+            self.start(self.admin, data).content.decode('utf-8')
+        )
+        self.send(self.admin, upload['id'], 0, content)
+
+        response = self.complete(self.admin, upload['id'])
+        self.assertEqual(response.status_code, 201)
+        result = json.loads(response.content.decode('utf-8'))
+        self.assertEqual(
+            DataImport.objects.get(pk=result['id']).dataformat,
+            FORMAT.GeoJSON
+        )
+
+    def test_get_when_wrong_token(self):
+        """
+        Test GET with with admin, when upload token is not valid.
+
+        It should inform user that the upload does not exist.
+        """
+        request = self.factory.get('/')
+        request.user = self.admin
+
+        response = DataImportUploadAPI.as_view()(
+            request,
+            project_id=self.project.id,
+            upload_id='abc'
+        )
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_upload_when_checksum_does_not_match(self):
+        """
+        Test PATCH with with admin, when chunk does not match its checksum.
+
+        It should delete the upload, so it starts again.
+        """
+        upload = json.loads(
+            self.start(self.admin, self.data).content.decode('utf-8')
+        )
+        self.send(self.admin, upload['id'], 0, self.content[:10])
+        path = DataUpload.objects.get(token=upload['id']).get_path()
+
+        response = self.send(
+            self.admin,
+            upload['id'],
+            10,
+            self.content[10:],
+            'sha256 %s' % base64.b64encode(
+                hashlib.sha256(b'Other').digest()
+            ).decode('ascii')
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(
+            'errors',
+            json.loads(response.content.decode('utf-8'))
+        )
+        self.assertEqual(DataUpload.objects.count(), 0)
+        self.assertFalse(os.path.isfile(path))
+
+    def test_upload(self):
+        """
+        Test uploading a file in chunks with admin.
+
+        It should resume from the offset stored, verify chunks and the file,
+        then create the data import.
+        """
+        response = self.start(self.admin, self.data)
+        self.assertEqual(response.status_code, 201)
+        upload = json.loads(response.content.decode('utf-8'))
+        self.assertEqual(upload['offset'], 0)
+        self.assertEqual(response['Location'], upload['url'])
+
+        response = self.send(self.admin, upload['id'], 0, self.content[:10])
+        self.assertEqual(response['Upload-Offset'], '10')
+
+        response = self.send(self.admin, upload['id'], 0, self.content[:10])
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response['Upload-Offset'], '10')
+
+        # Checksum of a chunk must be set
+        response = self.send(
+            self.admin,
+            upload['id'],
+            10,
+            self.content[10:],
+            ''
+        )
+        self.assertEqual(response.status_code, 400)
+
+        response = self.complete(self.admin, upload['id'])
+        self.assertEqual(response.status_code, 400)
+
+        response = self.send(
+            self.user,
+            upload['id'],
+            10,
+            self.content[10:]
+        )
+        self.assertEqual(response.status_code, 404)
+
+        response = self.send(self.admin, upload['id'], 10, self.content[10:])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response['Upload-Offset'],
+            str(len(self.content))
+        )
+
+        response = self.complete(self.admin, upload['id'])
+        self.assertEqual(response.status_code, 201)
+        result = json.loads(response.content.decode('utf-8'))
+
+        dataimport = DataImport.objects.get(pk=result['id'])
+        self.assertEqual(dataimport.name, self.data['name'])
+        self.assertEqual(dataimport.category, self.category)
+        self.assertEqual(dataimport.creator, self.admin)
+        self.assertEqual(dataimport.feature_count, 3)
+        self.assertEqual(
+            result['checksum'],
+            hashlib.sha256(self.content).hexdigest()
+        )
+        self.assertEqual(
+            result['redirect'],
+            reverse(
+                'geokey_dataimports:dataimport_assign_fields',
+                kwargs={
+                    'project_id': self.project.id,
+                    'dataimport_id': dataimport.id
+                }
+            )
+        )
+        self.assertEqual(DataUpload.objects.count(), 0)
@@ -10,7 +10,13 @@ from .views import (
     DataImportCreateCategoryPage,
     DataImportAssignFieldsPage,
     DataImportAllDataFeaturesPage,
-    RemoveDataImportPage
+    RemoveDataImportPage,
+    DataImportDataFeaturesJSON,
+    DataImportDataFeaturesClusters,
+    DataImportDataFeaturesTile,
+    DataImportUploadsAPI,
+    DataImportUploadAPI,
+    DataImportUploadCompleteAPI
 )
 
 
@@ -58,5 +64,43 @@ urlpatterns = [
         r'^admin/projects/(?P<project_id>[0-9]+)/'
         r'dataimports/(?P<dataimport_id>[0-9]+)/remove/$',
         RemoveDataImportPage.as_view(),
-        name='dataimport_remove')
+        name='dataimport_remove'),
+
+    # ###########################
+    # AJAX API
+    # ###########################
+
+    url(
+        r'^admin/projects/(?P<project_id>[0-9]+)/'
+        r'dataimports/(?P<dataimport_id>[0-9]+)/'
+        r'datafeatures/geojson/$',
+        DataImportDataFeaturesJSON.as_view(),
+        name='dataimport_datafeatures_geojson'),
+    url(
+        r'^admin/projects/(?P<project_id>[0-9]+)/'
+        r'dataimports/(?P<dataimport_id>[0-9]+)/'
+        r'datafeatures/clusters/$',
+        DataImportDataFeaturesClusters.as_view(),
+        name='dataimport_datafeatures_clusters'),
+    url(
+        r'^admin/projects/(?P<project_id>[0-9]+)/'
+        r'dataimports/(?P<dataimport_id>[0-9]+)/'
+        r'tiles/(?P<z>[0-9]+)/(?P<x>[0-9]+)/(?P<y>[0-9]+)\.mvt$',
+        DataImportDataFeaturesTile.as_view(),
+        name='dataimport_datafeatures_tile'),
+    url(
+        r'^admin/projects/(?P<project_id>[0-9]+)/'
+        r'dataimports/uploads/$',
+        DataImportUploadsAPI.as_view(),
+        name='dataimport_uploads'),
+    url(
+        r'^admin/projects/(?P<project_id>[0-9]+)/'
+        r'dataimports/uploads/(?P<upload_id>[0-9a-f-]+)/$',
+        DataImportUploadAPI.as_view(),
+        name='dataimport_upload'),
+    url(
+        r'^admin/projects/(?P<project_id>[0-9]+)/'
+        r'dataimports/uploads/(?P<upload_id>[0-9a-f-]+)/complete/$',
+        DataImportUploadCompleteAPI.as_view(),
+        name='dataimport_upload_complete')
 ]
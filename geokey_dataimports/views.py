@@ -5,11 +5,21 @@
 
 import json
 
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
+from django.core.files.storage import default_storage
+from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 from django.core.urlresolvers import reverse
-from django.views.generic import CreateView, FormView, TemplateView
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.views.generic import (
+    View,
+    CreateView,
+    FormView,
+    TemplateView
+)
+from django.views.generic.base import ContextMixin
 from django.shortcuts import redirect
-from django.db.models import IntegerField, Q, Count, Case, When
+from django.db.models import Count
 from django.contrib import messages
 
 from braces.views import LoginRequiredMixin
@@ -17,14 +27,45 @@ from braces.views import LoginRequiredMixin
 from geokey.projects.models import Project
 from geokey.projects.views import ProjectContext
 from geokey.categories.base import DEFAULT_STATUS
-from geokey.categories.models import Category, LookupValue
-from geokey.contributions.serializers import ContributionSerializer
-from geokey.socialinteractions.models import SocialInteractionPost
+from geokey.categories.models import Category
 
+from .base import UNSUPPORTED_FILE_MSG
 from .helpers.context_helpers import does_not_exist_msg
-from .base import FORMAT
-from .exceptions import FileParseError
-from .models import DataImport
+from .helpers.crs_helpers import get_spatial_reference
+from .helpers.feature_helpers import (
+    CLUSTER_MAX_ZOOM,
+    parse_bbox,
+    parse_limit,
+    parse_zoom,
+    parse_where,
+    get_where_key,
+    filter_datafeatures,
+    snap_bbox,
+    iter_feature_collection,
+    get_extent,
+    get_clusters,
+    get_cache_key,
+    iter_cached,
+    get_cached
+)
+from .helpers.import_helpers import (
+    post_interactions_disabled,
+    import_datafeatures
+)
+from .helpers.selection_helpers import parse_selection, filter_by_selection
+from .helpers.tile_helpers import get_tile, clear_tiles
+from .helpers.sniff_helpers import sniff_dataformat
+from .helpers.upload_helpers import (
+    parse_chunk_checksum,
+    append_chunk,
+    store_upload
+)
+from .exceptions import (
+    FileParseError,
+    UploadChecksumError,
+    UploadOffsetError
+)
+from .models import DataImport, DataUpload
 from .forms import CategoryForm, DataImportForm
 
 
@@ -36,47 +77,61 @@ class IndexPage(LoginRequiredMixin, TemplateView):
     """Main index page."""
 
     template_name = 'di_index.html'
+    paginate_by = 25
 
     def get_context_data(self, *args, **kwargs):
         """
         GET method for the template.
 
         Return the context to render the view. Overwrite the method by adding
-        all projects (where user is an administrator) and available filters to
-        the context. It optionally filters projects by the filter provided on
-        the URL.
+        a page of projects (where user is an administrator) and available
+        filters to the context. It optionally filters projects by the filter
+        provided on the URL.
+
+        Data imports are counted for projects of the page only, in a single
+        query grouped by project.
 
         Returns
         -------
         dict
             Context.
         """
-        projects = Project.objects.annotate(
-            dataimports_count=Count(Case(
-                When(
-                    ~Q(dataimports__status='deleted') &
-                    Q(dataimports__isnull=False),
-                    then=1
-                ),
-                output_field=IntegerField(),
-            ))
-        ).filter(admins=self.request.user)
+        projects = Project.objects.filter(admins=self.request.user)
+        with_dataimports = DataImport.objects.values('project_id')
 
         filters = {}
         filter_for_projects = self.request.GET.get('filter')
 
         filter_to_add = 'without-data-imports-only'
         if filter_for_projects == filter_to_add:
-            projects = projects.filter(dataimports_count=0)
+            projects = projects.exclude(id__in=with_dataimports)
         filters[filter_to_add] = 'Without data imports'
 
         filter_to_add = 'with-data-imports-only'
         if filter_for_projects == filter_to_add:
-            projects = projects.filter(dataimports_count__gt=0)
+            projects = projects.filter(id__in=with_dataimports)
         filters[filter_to_add] = 'With data imports'
 
+        paginator = Paginator(projects.order_by('id'), self.paginate_by)
+        try:
+            page = paginator.page(self.request.GET.get('page', 1))
+        except PageNotAnInteger:
+            page = paginator.page(1)
+        except EmptyPage:
+            page = paginator.page(paginator.num_pages)
+
+        projects = list(page.object_list)
+        counts = dict(
+            DataImport.objects.filter(
+                project_id__in=[project.id for project in projects]
+            ).values_list('project_id').annotate(total=Count('id')).order_by()
+        )
+        for project in projects:
+            project.dataimports_count = counts.get(project.id, 0)
+
         return super(IndexPage, self).get_context_data(
-            projects=projects.distinct(),
+            projects=projects,
+            page_obj=page,
             filters=filters,
             *args,
             **kwargs
@@ -88,6 +143,33 @@ class AllDataImportsPage(LoginRequiredMixin, ProjectContext, TemplateView):
 
     template_name = 'di_all_dataimports.html'
 
+    def get_context_data(self, *args, **kwargs):
+        """
+        GET method for the template.
+
+        Return the context to render the view. Overwrite the method by adding
+        all data imports of the project (with their creators and categories)
+        to the context, so they are listed in a constant number of queries.
+
+        Returns
+        -------
+        dict
+            Context.
+        """
+        context = super(AllDataImportsPage, self).get_context_data(
+            *args,
+            **kwargs
+        )
+
+        project = context.get('project')
+        if project:
+            context['dataimports'] = project.dataimports.select_related(
+                'creator',
+                'category'
+            )
+
+        return context
+
 
 class AddDataImportPage(LoginRequiredMixin, ProjectContext, CreateView):
     """Add new data import page."""
@@ -142,20 +224,13 @@ class AddDataImportPage(LoginRequiredMixin, ProjectContext, CreateView):
                 form.instance.project = project
                 form.instance.creator = self.request.user
 
-                content_type = self.request.FILES.get('file').content_type
-                if content_type == 'application/json':
-                    form.instance.dataformat = FORMAT.GeoJSON
-                elif content_type == 'application/octet-stream':
-                    form.instance.dataformat = FORMAT.KML
-                elif content_type in ['text/csv', 'application/vnd.ms-excel']:
-                    form.instance.dataformat = FORMAT.CSV
-                else:
-                    messages.error(
-                        self.request,
-                        'The file type does not seem to be compatible with '
-                        'this extension just yet. Only GeoJSON, KML and CSV '
-                        'with WKT formatted geometries formats are supported.'
-                    )
+                file_obj = self.request.FILES.get('file')
+                form.instance.dataformat = sniff_dataformat(
+                    file_obj,
+                    file_obj.name
+                )
+                if not form.instance.dataformat:
+                    messages.error(self.request, UNSUPPORTED_FILE_MSG)
 
                 if form.instance.dataformat:
                     try:
@@ -342,14 +417,19 @@ class SingleDataImportPage(DataImportContext, FormView):
                     'The project is locked. Data imports cannot be updated.'
                 )
             else:
-                form.save()
+                form.save(commit=False)
+                form.instance.save(
+                    update_fields=['name', 'description', 'modified']
+                )
 
                 if not form.instance.category:
                     try:
                         form.instance.category = project.categories.get(
                             pk=self.request.POST.get('category')
                         )
-                        form.save()
+                        form.instance.save(
+                            update_fields=['category', 'modified']
+                        )
 
                         messages.success(
                             self.request,
@@ -473,7 +553,7 @@ class DataImportCreateCategoryPage(DataImportContext, CreateView):
                     creator=self.request.user,
                     default_status=DEFAULT_STATUS.active
                 )
-                dataimport.save()
+                dataimport.save(update_fields=['category', 'modified'])
 
                 ids = data.getlist('ids')
                 keys = []
@@ -487,7 +567,7 @@ class DataImportCreateCategoryPage(DataImportContext, CreateView):
                         keys.append(field.key)
 
                 dataimport.keys = keys
-                dataimport.save()
+                dataimport.save(update_fields=['keys', 'modified'])
 
                 messages.success(
                     self.request,
@@ -586,7 +666,7 @@ class DataImportAssignFieldsPage(DataImportContext, TemplateView):
                         keys.append(field.key)
 
                 dataimport.keys = keys
-                dataimport.save()
+                dataimport.save(update_fields=['keys', 'modified'])
 
                 messages.success(
                     self.request,
@@ -612,7 +692,8 @@ class DataImportAllDataFeaturesPage(DataImportContext, TemplateView):
         GET method for the template.
 
         Return the context to render the view. Overwrite the method by adding
-        all data features (not imported yet) to the context.
+        the extent of all data features (not imported yet) to the context.
+        Data features themselves are loaded by the map for its viewport.
 
         Returns
         -------
@@ -626,18 +707,10 @@ class DataImportAllDataFeaturesPage(DataImportContext, TemplateView):
         dataimport = context.get('dataimport')
 
         if dataimport:
-            datafeatures = []
-            for datafeature in dataimport.datafeatures.filter(imported=False):
-                datafeatures.append({
-                    'type': 'Feature',
-                    'id': datafeature.id,
-                    'geometry': json.loads(datafeature.geometry.json)
-                })
-
-            context['datafeatures'] = {
-                'type': 'FeatureCollection',
-                'features': datafeatures
-            }
+            context['extent'] = get_cached(
+                get_cache_key(dataimport, 'extent'),
+                lambda: get_extent(dataimport)
+            )
 
         return context
 
@@ -645,6 +718,10 @@ class DataImportAllDataFeaturesPage(DataImportContext, TemplateView):
         """
         POST method for converting data features to contributions.
 
+        Data features to convert are set by a selection (see
+        `geokey_dataimports.helpers.selection_helpers.parse_selection`) or,
+        alternatively, a list of IDs.
+
         Parameters
         ----------
         request : django.http.HttpRequest
@@ -684,73 +761,37 @@ class DataImportAllDataFeaturesPage(DataImportContext, TemplateView):
                     'The data import has no fields assigned.'
                 )
             else:
-
-                # temporarily disable post interactions
-                post_interactions_backup = {}
-                post_interactions = SocialInteractionPost.objects.filter(project_id=project_id)
-                for post_interaction in post_interactions:
-                    post_interactions_backup[post_interaction] = post_interaction.status
-                    post_interaction.status = 'inactive'
-                    post_interaction.save()
-
+                datafeatures = dataimport.datafeatures.filter(imported=False)
+                selection = data.get('selection')
                 ids = data.get('ids')
 
-                if ids:
-                    ids = json.loads(ids)
-                else:
-                    ids = []
-
-                lookupfields = dataimport.get_lookup_fields()
-                datafeatures = dataimport.datafeatures.filter(
-                    id__in=ids,
-                    imported=False
-                )
+                try:
+                    if not selection:
+                        selection = json.dumps({
+                            'type': 'ids',
+                            'ids': json.loads(ids) if ids else []
+                        })
 
-                imported = 0
-                for datafeature in datafeatures:
-                    properties = datafeature.properties
-
-                    for key, value in dict(properties).items():
-                        if key not in dataimport.keys:
-                            del properties[key]
-                        elif key in lookupfields:
-                            value, created = LookupValue.objects.get_or_create(
-                                name=value,
-                                field=lookupfields[key]
-                            )
-                            properties[key] = value.id
-
-                    feature = {
-                        "location": {
-                            "geometry": datafeature.geometry
-                        },
-                        "meta": {
-                            "category": dataimport.category.id,
-                        },
-                        "properties": properties
-                    }
+                    datafeatures = filter_by_selection(
+                        datafeatures,
+                        parse_selection(selection)
+                    )
+                except ValueError as error:
+                    messages.error(
+                        request,
+                        'The selection is not valid: %s' % error
+                    )
+                    return self.render_to_response(context)
 
-                    serializer = ContributionSerializer(
-                        data=feature,
-                        context={
-                            'user': self.request.user,
-                            'project': dataimport.project
-                        }
+                with post_interactions_disabled(project_id):
+                    imported = import_datafeatures(
+                        dataimport,
+                        datafeatures,
+                        self.request.user
                     )
 
-                    try:
-                        serializer.is_valid(raise_exception=True)
-                        serializer.save()
-                        datafeature.imported = True
-                        datafeature.save()
-                        imported += 1
-                    except ValidationError:
-                        pass
-
-                # restore post interactions
-                for post_interaction, status_backup in post_interactions_backup.items():
-                    post_interaction.status = status_backup
-                    post_interaction.save()
+                if imported:
+                    clear_tiles(dataimport)
 
                 messages.success(
                     request,
@@ -817,3 +858,715 @@ class RemoveDataImportPage(DataImportContext, TemplateView):
                 )
 
         return self.render_to_response(context)
+
+
+# ###########################
+# AJAX API
+# ###########################
+
+class DataImportDataFeaturesJSON(DataImportContext, ContextMixin, View):
+    """Data import data features (GeoJSON) API."""
+
+    def get(self, request, project_id, dataimport_id):
+        """
+        GET method for data features (not imported yet).
+
+        Data features can be filtered by a bounding box (`bbox` as
+        `west,south,east,north`) and by their properties (`where`, see
+        `geokey_dataimports.helpers.feature_helpers.parse_where`), and are
+        paginated by a cursor: the response holds the ID to pass as `after`
+        to get the next page, or `null` when it is the last page. Page size
+        is set by `limit`.
+
+        Geometries are simplified for a map when `zoom` (or `tolerance` in
+        degrees) is provided, the bounding box is then aligned to the tiles
+        of the zoom level and pages are cached.
+
+        Parameters
+        ----------
+        request : django.http.HttpRequest
+            Object representing the request.
+        project_id : int
+            Identifies the project in the database.
+        dataimport_id : int
+            Identifies the data import in the database.
+
+        Returns
+        -------
+        django.http.StreamingHttpResponse
+            Feature collection of data features.
+        django.http.HttpResponse
+            Feature collection of simplified data features, when cached.
+        django.http.JsonResponse
+            Error when project or data import does not exist, or parameters
+            are not valid.
+        """
+        context = self.get_context_data(project_id, dataimport_id)
+        dataimport = context.get('dataimport')
+
+        if not dataimport:
+            return JsonResponse(
+                {
+                    'error': context.get('error'),
+                    'error_description': context.get('error_description')
+                },
+                status=404
+            )
+
+        try:
+            bbox = parse_bbox(request.GET.get('bbox'))
+            limit = parse_limit(request.GET.get('limit'))
+            after = request.GET.get('after')
+            after = int(after) if after else None
+            zoom = parse_zoom(
+                request.GET.get('zoom'),
+                request.GET.get('tolerance')
+            )
+            where = parse_where(request.GET.get('where'))
+        except ValueError as error:
+            return JsonResponse(
+                {
+                    'error': 'Bad request.',
+                    'error_description': str(error)
+                },
+                status=400
+            )
+
+        if zoom is None:
+            datafeatures = filter_datafeatures(
+                dataimport.datafeatures.filter(imported=False),
+                bbox=bbox,
+                after=after,
+                where=where
+            )
+            return StreamingHttpResponse(
+                iter_feature_collection(datafeatures, limit),
+                content_type='application/json'
+            )
+
+        # Pages of simplified geometries are cached per zoom level, for the
+        # bounding box aligned to the tiles of the zoom level
+        if bbox is not None:
+            bbox = snap_bbox(bbox, zoom)
+
+        key = get_cache_key(
+            dataimport,
+            'simplified',
+            zoom,
+            bbox.extent if bbox is not None else None,
+            after,
+            limit,
+            get_where_key(where)
+        )
+        content = cache.get(key)
+        if content is not None:
+            return HttpResponse(content, content_type='application/json')
+
+        datafeatures = filter_datafeatures(
+            dataimport.datafeatures.filter(imported=False),
+            bbox=bbox,
+            after=after,
+            where=where
+        )
+        return StreamingHttpResponse(
+            iter_cached(
+                key,
+                iter_feature_collection(datafeatures, limit, zoom)
+            ),
+            content_type='application/json'
+        )
+
+
+class DataImportDataFeaturesClusters(DataImportContext, ContextMixin, View):
+    """Data import data feature clusters (GeoJSON) API."""
+
+    def get(self, request, project_id, dataimport_id):
+        """
+        GET method for clusters of data features (not imported yet).
+
+        Data features are clustered for the zoom level (`zoom`), each cluster
+        is a point with the number of data features as `count`. Clusters are
+        cached per zoom level and can be filtered by a bounding box (`bbox`
+        as `west,south,east,north`) and by properties of data features
+        (`where`, as for the data features API). Data features themselves
+        are returned from the zoom level where clustering stops, paginated
+        the same way as by the data features (GeoJSON) API.
+
+        Parameters
+        ----------
+        request : django.http.HttpRequest
+            Object representing the request.
+        project_id : int
+            Identifies the project in the database.
+        dataimport_id : int
+            Identifies the data import in the database.
+
+        Returns
+        -------
+        django.http.JsonResponse
+            Feature collection of clusters, or an error when project or data
+            import does not exist, or parameters are not valid.
+        django.http.StreamingHttpResponse
+            Feature collection of data features.
+        """
+        context = self.get_context_data(project_id, dataimport_id)
+        dataimport = context.get('dataimport')
+
+        if not dataimport:
+            return JsonResponse(
+                {
+                    'error': context.get('error'),
+                    'error_description': context.get('error_description')
+                },
+                status=404
+            )
+
+        try:
+            zoom = parse_zoom(request.GET.get('zoom'))
+            bbox = parse_bbox(request.GET.get('bbox'))
+            limit = parse_limit(request.GET.get('limit'))
+            after = request.GET.get('after')
+            after = int(after) if after else None
+            where = parse_where(request.GET.get('where'))
+
+            if zoom is None:
+                raise ValueError('Zoom level is required.')
+        except ValueError as error:
+            return JsonResponse(
+                {
+                    'error': 'Bad request.',
+                    'error_description': str(error)
+                },
+                status=400
+            )
+
+        if zoom > CLUSTER_MAX_ZOOM:
+            datafeatures = filter_datafeatures(
+                dataimport.datafeatures.filter(imported=False),
+                bbox=bbox,
+                after=after,
+                where=where
+            )
+            return StreamingHttpResponse(
+                iter_feature_collection(datafeatures, limit),
+                content_type='application/json'
+            )
+
+        clusters = get_cached(
+            get_cache_key(dataimport, 'clusters', zoom, get_where_key(where)),
+            lambda: get_clusters(dataimport, zoom, where)
+        )
+
+        if bbox:
+            west, south, east, north = bbox.extent
+            clusters = [
+                (count, x, y) for count, x, y in clusters
+                if west <= x <= east and south <= y <= north
+            ]
+
+        return JsonResponse({
+            'type': 'FeatureCollection',
+            'features': [
+                {
+                    'type': 'Feature',
+                    'geometry': {
+                        'type': 'Point',
+                        'coordinates': [x, y]
+                    },
+                    'properties': {
+                        'count': count
+                    }
+                } for count, x, y in clusters
+            ]
+        })
+
+
+class DataImportDataFeaturesTile(DataImportContext, ContextMixin, View):
+    """Data import data features (Mapbox Vector Tile) API."""
+
+    def get(self, request, project_id, dataimport_id, z, x, y):
+        """
+        GET method for a tile of data features (not imported yet).
+
+        Tiles are built by PostGIS and cached on disk.
+
+        Parameters
+        ----------
+        request : django.http.HttpRequest
+            Object representing the request.
+        project_id : int
+            Identifies the project in the database.
+        dataimport_id : int
+            Identifies the data import in the database.
+        z : int
+            Zoom level.
+        x : int
+            Tile column.
+        y : int
+            Tile row.
+
+        Returns
+        -------
+        django.http.HttpResponse
+            The tile, or an error when project, data import or tile does not
+            exist.
+        """
+        context = self.get_context_data(project_id, dataimport_id)
+        dataimport = context.get('dataimport')
+
+        if not dataimport:
+            return JsonResponse(
+                {
+                    'error': context.get('error'),
+                    'error_description': context.get('error_description')
+                },
+                status=404
+            )
+
+        try:
+            tile = get_tile(dataimport, int(z), int(x), int(y))
+        except ValueError as error:
+            return JsonResponse(
+                {
+                    'error': 'Not found.',
+                    'error_description': str(error)
+                },
+                status=404
+            )
+
+        return HttpResponse(
+            tile,
+            content_type='application/vnd.mapbox-vector-tile'
+        )
+
+
+class DataUploadContext(LoginRequiredMixin, ProjectContext):
+    """Get data upload mixin."""
+
+    def get_context_data(self, project_id, upload_id, *args, **kwargs):
+        """
+        Return the context of the view.
+
+        Overwrite the method by adding an upload (started by the user) to the
+        context.
+
+        Parameters
+        ----------
+        project_id : int
+            Identifies the project in the database.
+        upload_id : str
+            Identifies the upload (by its token) in the database.
+
+        Returns
+        -------
+        dict
+            Context.
+        """
+        context = super(DataUploadContext, self).get_context_data(
+            project_id,
+            *args,
+            **kwargs
+        )
+
+        try:
+            context['upload'] = DataUpload.objects.get(
+                token=upload_id,
+                project=context.get('project'),
+                creator=self.request.user
+            )
+
+            return context
+        except (DataUpload.DoesNotExist, ValidationError, ValueError):
+            return {
+                'error': 'Not found.',
+                'error_description': does_not_exist_msg('Upload')
+            }
+
+
+def get_upload_response(upload, status=200):
+    """
+    Get the response describing an upload.
+
+    Parameters
+    ----------
+    upload : geokey_dataimports.models.DataUpload
+        The upload.
+    status : int
+        Status code of the response.
+
+    Returns
+    -------
+    django.http.JsonResponse
+        The upload, with its offset also set as `Upload-Offset` header.
+    """
+    url = reverse(
+        'geokey_dataimports:dataimport_upload',
+        kwargs={'project_id': upload.project_id, 'upload_id': upload.token}
+    )
+
+    response = JsonResponse(
+        {
+            'id': str(upload.token),
+            'url': url,
+            'offset': upload.offset,
+            'size': upload.size
+        },
+        status=status
+    )
+    response['Upload-Offset'] = str(upload.offset)
+    response['Upload-Length'] = str(upload.size)
+    response['Cache-Control'] = 'no-store'
+
+    if status == 201:
+        response['Location'] = url
+
+    return response
+
+
+class DataImportUploadsAPI(LoginRequiredMixin, ProjectContext, ContextMixin,
+                           View):
+    """Data import uploads API."""
+
+    def post(self, request, project_id):
+        """
+        POST method for starting a new upload.
+
+        The file (`filename` and `size` in bytes) is described together
+        with the data import (`name`, `description`, `category_create` and
+        `category`), the same way as on the add new data import page. Its
+        data format is recognised by its content once uploaded in full.
+
+        Parameters
+        ----------
+        request : django.http.HttpRequest
+            Object representing the request.
+        project_id : int
+            Identifies the project in the database.
+
+        Returns
+        -------
+        django.http.JsonResponse
+            The upload created, or an error when project does not exist, is
+            locked, or parameters are not valid.
+        """
+        context = self.get_context_data(project_id)
+        project = context.get('project')
+
+        if not project:
+            return JsonResponse(
+                {
+                    'error': context.get('error'),
+                    'error_description': context.get('error_description')
+                },
+                status=404
+            )
+
+        if project.islocked:
+            return JsonResponse(
+                {
+                    'error': 'Permission denied.',
+                    'error_description': 'The project is locked. New data '
+                                         'imports cannot be added.'
+                },
+                status=403
+            )
+
+        data = request.POST
+        category = None
+
+        try:
+            name = data.get('name', '').strip()
+            if not name or len(name) > 100:
+                raise ValueError('Name must be set (100 characters at most).')
+
+            filename = data.get('filename', '').strip()
+            if not filename:
+                raise ValueError('File name must be set.')
+
+            size = int(data.get('size', 0))
+            if size < 1:
+                raise ValueError('File size must be a positive number.')
+
+            srid = data.get('srid') or None
+            if srid:
+                srid = int(srid)
+                get_spatial_reference(srid)
+
+            sheet = data.get('sheet') or None
+            if sheet and len(sheet) > 100:
+                raise ValueError('Sheet name must be 100 characters at most.')
+
+            if data.get('category_create') == 'false':
+                try:
+                    category = project.categories.get(pk=data.get('category'))
+                except (Category.DoesNotExist, ValueError):
+                    raise ValueError('The category does not exist.')
+        except ValueError as error:
+            return JsonResponse(
+                {
+                    'error': 'Bad request.',
+                    'error_description': str(error)
+                },
+                status=400
+            )
+
+        upload = DataUpload.objects.create(
+            name=name,
+            description=data.get('description') or None,
+            filename=filename,
+            size=size,
+            srid=srid,
+            sheet=sheet,
+            project=project,
+            category=category,
+            creator=request.user
+        )
+
+        return get_upload_response(upload, status=201)
+
+
+class DataImportUploadAPI(DataUploadContext, ContextMixin, View):
+    """Data import upload API."""
+
+    def get_error_response(self, context):
+        """Return the error when upload does not exist."""
+        return JsonResponse(
+            {
+                'error': context.get('error'),
+                'error_description': context.get('error_description')
+            },
+            status=404
+        )
+
+    def get(self, request, project_id, upload_id):
+        """
+        GET method for an upload.
+
+        The offset the upload continues from is also set as `Upload-Offset`
+        header (the same as for `HEAD`).
+
+        Parameters
+        ----------
+        request : django.http.HttpRequest
+            Object representing the request.
+        project_id : int
+            Identifies the project in the database.
+        upload_id : str
+            Identifies the upload in the database.
+
+        Returns
+        -------
+        django.http.JsonResponse
+            The upload, or an error when it does not exist.
+        """
+        context = self.get_context_data(project_id, upload_id)
+        upload = context.get('upload')
+
+        if not upload:
+            return self.get_error_response(context)
+
+        return get_upload_response(upload)
+
+    def patch(self, request, project_id, upload_id):
+        """
+        PATCH method for appending a chunk to an upload.
+
+        The request body is the chunk, starting at the offset set as
+        `Upload-Offset` header. Chunk is verified by its checksum, set as
+        `Upload-Checksum` header (`sha256 <base64 digest>`). The upload is
+        deleted when the chunk does not match, so it starts again.
+
+        Parameters
+        ----------
+        request : django.http.HttpRequest
+            Object representing the request.
+        project_id : int
+            Identifies the project in the database.
+        upload_id : str
+            Identifies the upload in the database.
+
+        Returns
+        -------
+        django.http.JsonResponse
+            The upload, or an error when it does not exist, offset does not
+            match (status 409) or chunk is not valid.
+        """
+        context = self.get_context_data(project_id, upload_id)
+        upload = context.get('upload')
+
+        if not upload:
+            return self.get_error_response(context)
+
+        try:
+            offset = int(request.META.get('HTTP_UPLOAD_OFFSET', ''))
+            length = int(request.META.get('CONTENT_LENGTH') or 0)
+            checksum = parse_chunk_checksum(
+                request.META.get('HTTP_UPLOAD_CHECKSUM')
+            )
+            upload.offset = append_chunk(
+                upload,
+                request,
+                offset,
+                length,
+                checksum
+            )
+        except UploadOffsetError as error:
+            upload.offset = error.offset
+            return get_upload_response(upload, status=409)
+        except UploadChecksumError as error:
+            upload.delete()
+            return JsonResponse(
+                {
+                    'error': 'Bad request.',
+                    'error_description': str(error),
+                    'errors': [{'messages': [str(error)]}]
+                },
+                status=400
+            )
+        except ValueError as error:
+            return JsonResponse(
+                {
+                    'error': 'Bad request.',
+                    'error_description': str(error)
+                },
+                status=400
+            )
+
+        return get_upload_response(upload)
+
+    def delete(self, request, project_id, upload_id):
+        """
+        DELETE method for cancelling an upload.
+
+        Parameters
+        ----------
+        request : django.http.HttpRequest
+            Object representing the request.
+        project_id : int
+            Identifies the project in the database.
+        upload_id : str
+            Identifies the upload in the database.
+
+        Returns
+        -------
+        django.http.HttpResponse
+            Empty response, or an error when upload does not exist.
+        """
+        context = self.get_context_data(project_id, upload_id)
+        upload = context.get('upload')
+
+        if not upload:
+            return self.get_error_response(context)
+
+        upload.delete()
+        return HttpResponse(status=204)
+
+
+class DataImportUploadCompleteAPI(DataUploadContext, ContextMixin, View):
+    """Data import upload completion API."""
+
+    def post(self, request, project_id, upload_id):
+        """
+        POST method for completing an upload.
+
+        The file is verified (uploaded in full and of a supported format)
+        and moved to the data import files, then the data import is created.
+
+        Parameters
+        ----------
+        request : django.http.HttpRequest
+            Object representing the request.
+        project_id : int
+            Identifies the project in the database.
+        upload_id : str
+            Identifies the upload in the database.
+
+        Returns
+        -------
+        django.http.JsonResponse
+            The data import created (with URL of the next step as
+            `redirect`), or an error when upload does not exist, is not
+            complete or valid, or the file cannot be parsed.
+        """
+        context = self.get_context_data(project_id, upload_id)
+        upload = context.get('upload')
+
+        if not upload:
+            return JsonResponse(
+                {
+                    'error': context.get('error'),
+                    'error_description': context.get('error_description')
+                },
+                status=404
+            )
+
+        try:
+            name, checksum = store_upload(upload)
+        except ValueError as error:
+            return JsonResponse(
+                {
+                    'error': 'Bad request.',
+                    'error_description': str(error)
+                },
+                status=400
+            )
+
+        # Content of the file decides, once uploaded in full
+        with default_storage.open(name, 'rb') as file_obj:
+            dataformat = sniff_dataformat(file_obj, upload.filename)
+
+        if not dataformat:
+            default_storage.delete(name)
+            upload.delete()
+            return JsonResponse(
+                {
+                    'error': 'Bad request.',
+                    'error_description': UNSUPPORTED_FILE_MSG
+                },
+                status=400
+            )
+
+        dataimport = DataImport(
+            name=upload.name,
+            description=upload.description,
+            dataformat=dataformat,
+            file=name,
+            checksum=checksum,
+            srid=upload.srid,
+            sheet=upload.sheet,
+            project=upload.project,
+            category=upload.category,
+            creator=upload.creator
+        )
+        upload.delete()
+
+        try:
+            dataimport.save()
+        except FileParseError as error:
+            return JsonResponse(
+                {
+                    'error': 'Bad request.',
+                    'error_description': error.message,
+                    'errors': error.errors
+                },
+                status=400
+            )
+
+        messages.success(request, 'The data import has been added.')
+
+        return JsonResponse(
+            {
+                'id': dataimport.id,
+                'checksum': checksum,
+                'redirect': reverse(
+                    'geokey_dataimports:dataimport_assign_fields'
+                    if dataimport.category else
+                    'geokey_dataimports:dataimport_create_category',
+                    kwargs={
+                        'project_id': project_id,
+                        'dataimport_id': dataimport.id
+                    }
+                )
+            },
+            status=201
+        )